@@ -0,0 +1,144 @@
+<?php
+// Generated by tools/pipeline/blog_to_json.py. Do not edit.
+return [
+    [
+        'id' => 'best-location-for-building-a-house',
+        'title' => 'Best Location for Building a House',
+        'slug' => 'best-location-for-building-a-house',
+        'date' => null,
+        'tags' => [],
+        'thumbnail' => 'images/blogImages/best-location-for-building-a-house/Featured.jpg',
+        'href' => 'blog-post.html?id=best-location-for-building-a-house',
+        'detailJson' => 'data/blog/best-location-for-building-a-house.json',
+        'legacyHtml' => 'Blog/best-location-for-building-a-house.html',
+        'wordCount' => 856,
+        'readingMinutes' => 4,
+        'excerpt' => 'Finding the right location for building a house in Toronto or Greater Toronto Area (GTA), or somewhere else in Ontario, can be a crucial step in making your dream home a reality…',
+    ],
+    [
+        'id' => 'building-a-house',
+        'title' => 'Building a House',
+        'slug' => 'building-a-house',
+        'date' => null,
+        'tags' => [],
+        'thumbnail' => 'images/blogImages/building-a-house/Featured.jpg',
+        'href' => 'blog-post.html?id=building-a-house',
+        'detailJson' => 'data/blog/building-a-house.json',
+        'legacyHtml' => 'Blog/building-a-house.html',
+        'wordCount' => 623,
+        'readingMinutes' => 3,
+        'excerpt' => 'Building a house in Toronto, Greater Toronto Area, or somewhere else in Ontario can be a dream come true for many people. It is a big investment that requires careful planning…',
+    ],
+    [
+        'id' => 'building-permit-in-toronto',
+        'title' => 'Building Permit in Toronto',
+        'slug' => 'building-permit-in-toronto',
+        'date' => null,
+        'tags' => [],
+        'thumbnail' => 'images/blogImages/building-permit-in-toronto/Featured.jpg',
+        'href' => 'blog-post.html?id=building-permit-in-toronto',
+        'detailJson' => 'data/blog/building-permit-in-toronto.json',
+        'legacyHtml' => 'Blog/building-permit-in-toronto.html',
+        'wordCount' => 1571,
+        'readingMinutes' => 7,
+        'excerpt' => 'Toronto, the vibrant and bustling city in Ontario, has a flourishing real estate market, which means building a home in this city can be an exciting and lucrative investment…',
+    ],
+    [
+        'id' => 'choose-a-realtor-in-toronto',
+        'title' => 'Choose a Reator in Toronto',
+        'slug' => 'choose-a-reator-in-toronto',
+        'date' => null,
+        'tags' => [],
+        'thumbnail' => 'images/blogImages/choose-a-realtor-in-toronto/Featured.jpg',
+        'href' => 'blog-post.html?id=choose-a-realtor-in-toronto',
+        'detailJson' => 'data/blog/choose-a-realtor-in-toronto.json',
+        'legacyHtml' => 'Blog/choose-a-realtor-in-toronto.html',
+        'wordCount' => 715,
+        'readingMinutes' => 4,
+        'excerpt' => 'Choosing a real estate agent in Toronto is an important decision that can have a significant impact on the success of your real estate transaction. With so many options to choose…',
+    ],
+    [
+        'id' => 'choose-an-architecture-firm-in-toronto',
+        'title' => 'Choose an Architecture Firm in Toronto',
+        'slug' => 'choose-an-architecture-firm-in-toronto',
+        'date' => null,
+        'tags' => [],
+        'thumbnail' => 'images/blogImages/choose-an-architecture-firm-in-toronto/Featured.jpg',
+        'href' => 'blog-post.html?id=choose-an-architecture-firm-in-toronto',
+        'detailJson' => 'data/blog/choose-an-architecture-firm-in-toronto.json',
+        'legacyHtml' => 'Blog/choose-an-architecture-firm-in-toronto.html',
+        'wordCount' => 2285,
+        'readingMinutes' => 10,
+        'excerpt' => 'Choosing the right architect is a crucial step in any construction project. Whether you\'re building a new home or renovating an existing space, the architecture firm you choose…',
+    ],
+    [
+        'id' => 'committee-of-adjustment-toronto',
+        'title' => 'Committee of Adjustment in Toronto',
+        'slug' => 'committee-of-adjustment-in-toronto',
+        'date' => null,
+        'tags' => [],
+        'thumbnail' => 'images/blogImages/committee-of-adjustment-toronto/Featured.jpg',
+        'href' => 'blog-post.html?id=committee-of-adjustment-toronto',
+        'detailJson' => 'data/blog/committee-of-adjustment-toronto.json',
+        'legacyHtml' => 'Blog/committee-of-adjustment-toronto.html',
+        'wordCount' => 1407,
+        'readingMinutes' => 7,
+        'excerpt' => 'If you\'re a property owner or developer in the city of Toronto, chances are you\'ve heard of the Committee of Adjustment. This committee is responsible for making decisions on…',
+    ],
+    [
+        'id' => 'expanding-housing-options-in-neighbourhoods',
+        'title' => 'Expanding Housing Options in Neighbourhoods (EHON)',
+        'slug' => 'expanding-housing-options-in-neighbourhoods-ehon',
+        'date' => null,
+        'tags' => [],
+        'thumbnail' => 'images/blogImages/expanding-housing-options-in-neighbourhoods/Featured.jpg',
+        'href' => 'blog-post.html?id=expanding-housing-options-in-neighbourhoods',
+        'detailJson' => 'data/blog/expanding-housing-options-in-neighbourhoods.json',
+        'legacyHtml' => 'Blog/expanding-housing-options-in-neighbourhoods.html',
+        'wordCount' => 876,
+        'readingMinutes' => 4,
+        'excerpt' => 'Expanding Housing Options in Neighbourhoods (EHON) is a City of Toronto initiative aimed at addressing the housing needs of our growing city by increasing the availability of…',
+    ],
+    [
+        'id' => 'laneway-and-garden-suites-in-toronto',
+        'title' => 'Laneway and Garden Suites in Toronto',
+        'slug' => 'laneway-and-garden-suites-in-toronto',
+        'date' => null,
+        'tags' => [],
+        'thumbnail' => 'images/blogImages/laneway-and-garden-suites-in-toronto/Featured.jpg',
+        'href' => 'blog-post.html?id=laneway-and-garden-suites-in-toronto',
+        'detailJson' => 'data/blog/laneway-and-garden-suites-in-toronto.json',
+        'legacyHtml' => 'Blog/laneway-and-garden-suites-in-toronto.html',
+        'wordCount' => 3949,
+        'readingMinutes' => 18,
+        'excerpt' => 'Toronto\'s housing market has been experiencing a major shift over the past few years, with skyrocketing prices and a shortage of affordable housing. One solution that has gained…',
+    ],
+    [
+        'id' => 'selecting-a-construciton-company',
+        'title' => 'Selecting a Construction Company',
+        'slug' => 'selecting-a-construction-company',
+        'date' => null,
+        'tags' => [],
+        'thumbnail' => 'images/blogImages/selecting-a-construciton-company/Featured.jpg',
+        'href' => 'blog-post.html?id=selecting-a-construciton-company',
+        'detailJson' => 'data/blog/selecting-a-construciton-company.json',
+        'legacyHtml' => 'Blog/selecting-a-construciton-company.html',
+        'wordCount' => 1122,
+        'readingMinutes' => 5,
+        'excerpt' => 'Building a new home is a major investment that requires careful planning, research, and decision-making. One of the most important decisions you\'ll make is selecting the right…',
+    ],
+    [
+        'id' => 'should-i-hire-an-architect-or-designer',
+        'title' => 'Should I Hire an Architect or Designer',
+        'slug' => 'should-i-hire-an-architect-or-designer',
+        'date' => null,
+        'tags' => [],
+        'thumbnail' => 'images/blogImages/should-i-hire-an-architect-or-designer/Featured.jpg',
+        'href' => 'blog-post.html?id=should-i-hire-an-architect-or-designer',
+        'detailJson' => 'data/blog/should-i-hire-an-architect-or-designer.json',
+        'legacyHtml' => 'Blog/should-i-hire-an-architect-or-designer.html',
+        'wordCount' => 923,
+        'readingMinutes' => 5,
+        'excerpt' => 'The architecture and design industries are constantly evolving, with new technologies and design trends emerging all the time. For those who are looking to undertake a building…',
+    ],
+];
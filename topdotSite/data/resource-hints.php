@@ -0,0 +1,592 @@
+<?php
+// Generated by tools/pipeline/build_resource_hints.py. Do not edit.
+return [
+    'project' => [
+        'common' => [
+            [
+                'rel' => 'preconnect',
+                'href' => 'https://www.googletagmanager.com',
+            ],
+            [
+                'rel' => 'preconnect',
+                'href' => 'https://cdnjs.cloudflare.com',
+            ],
+            [
+                'rel' => 'preconnect',
+                'href' => 'https://fonts.googleapis.com',
+            ],
+            [
+                'rel' => 'preconnect',
+                'href' => 'https://fonts.gstatic.com',
+                'crossorigin' => 'anonymous',
+            ],
+            [
+                'rel' => 'preload',
+                'href' => 'https://fonts.googleapis.com/css2?family=Montserrat:wght@200;300;400;500;600;700&family=Source+Sans+Pro:wght@200;300;400;600&display=swap',
+                'as' => 'style',
+            ],
+        ],
+        'byId' => [
+            'cr01' => [
+                [
+                    'rel' => 'preload',
+                    'href' => 'data/projects/cr01.json',
+                    'as' => 'fetch',
+                    'crossorigin' => 'anonymous',
+                ],
+                [
+                    'rel' => 'preload',
+                    'href' => 'images/projectsImages/customReisdential/cr01/Featured.jpg',
+                    'as' => 'image',
+                    'fetchpriority' => 'high',
+                ],
+            ],
+            'cr06' => [
+                [
+                    'rel' => 'preload',
+                    'href' => 'data/projects/cr06.json',
+                    'as' => 'fetch',
+                    'crossorigin' => 'anonymous',
+                ],
+                [
+                    'rel' => 'preload',
+                    'href' => 'images/projectsImages/customReisdential/cr06/Featured.jpg',
+                    'as' => 'image',
+                    'fetchpriority' => 'high',
+                ],
+            ],
+            'muc08' => [
+                [
+                    'rel' => 'preload',
+                    'href' => 'data/projects/muc08.json',
+                    'as' => 'fetch',
+                    'crossorigin' => 'anonymous',
+                ],
+                [
+                    'rel' => 'preload',
+                    'href' => 'images/projectsImages/MultiUnit-Commercial-MixedUse/muc08/Featured.jpg',
+                    'as' => 'image',
+                    'fetchpriority' => 'high',
+                ],
+            ],
+            'muc03' => [
+                [
+                    'rel' => 'preload',
+                    'href' => 'data/projects/muc03.json',
+                    'as' => 'fetch',
+                    'crossorigin' => 'anonymous',
+                ],
+                [
+                    'rel' => 'preload',
+                    'href' => 'images/projectsImages/MultiUnit-Commercial-MixedUse/muc03/Featured.jpg',
+                    'as' => 'image',
+                    'fetchpriority' => 'high',
+                ],
+            ],
+            'cr08' => [
+                [
+                    'rel' => 'preload',
+                    'href' => 'data/projects/cr08.json',
+                    'as' => 'fetch',
+                    'crossorigin' => 'anonymous',
+                ],
+                [
+                    'rel' => 'preload',
+                    'href' => 'images/projectsImages/customReisdential/cr08/Featured.jpg',
+                    'as' => 'image',
+                    'fetchpriority' => 'high',
+                ],
+            ],
+            'cr05' => [
+                [
+                    'rel' => 'preload',
+                    'href' => 'data/projects/cr05.json',
+                    'as' => 'fetch',
+                    'crossorigin' => 'anonymous',
+                ],
+                [
+                    'rel' => 'preload',
+                    'href' => 'images/projectsImages/customReisdential/cr05/Featured.jpg',
+                    'as' => 'image',
+                    'fetchpriority' => 'high',
+                ],
+            ],
+            'muc04' => [
+                [
+                    'rel' => 'preload',
+                    'href' => 'data/projects/muc04.json',
+                    'as' => 'fetch',
+                    'crossorigin' => 'anonymous',
+                ],
+                [
+                    'rel' => 'preload',
+                    'href' => 'images/projectsImages/MultiUnit-Commercial-MixedUse/muc04/Featured.jpg',
+                    'as' => 'image',
+                    'fetchpriority' => 'high',
+                ],
+            ],
+            'cr07' => [
+                [
+                    'rel' => 'preload',
+                    'href' => 'data/projects/cr07.json',
+                    'as' => 'fetch',
+                    'crossorigin' => 'anonymous',
+                ],
+                [
+                    'rel' => 'preload',
+                    'href' => 'images/projectsImages/customReisdential/cr07/Featured.jpg',
+                    'as' => 'image',
+                    'fetchpriority' => 'high',
+                ],
+            ],
+            'muc10' => [
+                [
+                    'rel' => 'preload',
+                    'href' => 'data/projects/muc10.json',
+                    'as' => 'fetch',
+                    'crossorigin' => 'anonymous',
+                ],
+                [
+                    'rel' => 'preload',
+                    'href' => 'images/projectsImages/MultiUnit-Commercial-MixedUse/muc10/Featured.jpg',
+                    'as' => 'image',
+                    'fetchpriority' => 'high',
+                ],
+            ],
+            'cr10' => [
+                [
+                    'rel' => 'preload',
+                    'href' => 'data/projects/cr10.json',
+                    'as' => 'fetch',
+                    'crossorigin' => 'anonymous',
+                ],
+                [
+                    'rel' => 'preload',
+                    'href' => 'images/projectsImages/customReisdential/cr10/Featured.jpg',
+                    'as' => 'image',
+                    'fetchpriority' => 'high',
+                ],
+            ],
+            'ai02' => [
+                [
+                    'rel' => 'preload',
+                    'href' => 'data/projects/ai02.json',
+                    'as' => 'fetch',
+                    'crossorigin' => 'anonymous',
+                ],
+                [
+                    'rel' => 'preload',
+                    'href' => 'images/projectsImages/artInstallation/ai02/Featured.jpg',
+                    'as' => 'image',
+                    'fetchpriority' => 'high',
+                ],
+            ],
+            'cr03' => [
+                [
+                    'rel' => 'preload',
+                    'href' => 'data/projects/cr03.json',
+                    'as' => 'fetch',
+                    'crossorigin' => 'anonymous',
+                ],
+                [
+                    'rel' => 'preload',
+                    'href' => 'images/projectsImages/customReisdential/cr03/Featured.jpg',
+                    'as' => 'image',
+                    'fetchpriority' => 'high',
+                ],
+            ],
+            'cr04' => [
+                [
+                    'rel' => 'preload',
+                    'href' => 'data/projects/cr04.json',
+                    'as' => 'fetch',
+                    'crossorigin' => 'anonymous',
+                ],
+                [
+                    'rel' => 'preload',
+                    'href' => 'images/projectsImages/customReisdential/cr04/Featured.jpg',
+                    'as' => 'image',
+                    'fetchpriority' => 'high',
+                ],
+            ],
+            'cr09' => [
+                [
+                    'rel' => 'preload',
+                    'href' => 'data/projects/cr09.json',
+                    'as' => 'fetch',
+                    'crossorigin' => 'anonymous',
+                ],
+                [
+                    'rel' => 'preload',
+                    'href' => 'images/projectsImages/customReisdential/cr09/Featured.jpg',
+                    'as' => 'image',
+                    'fetchpriority' => 'high',
+                ],
+            ],
+            'ai07' => [
+                [
+                    'rel' => 'preload',
+                    'href' => 'data/projects/ai07.json',
+                    'as' => 'fetch',
+                    'crossorigin' => 'anonymous',
+                ],
+                [
+                    'rel' => 'preload',
+                    'href' => 'images/projectsImages/artInstallation/ai07/Featured.jpg',
+                    'as' => 'image',
+                    'fetchpriority' => 'high',
+                ],
+            ],
+            'cr02' => [
+                [
+                    'rel' => 'preload',
+                    'href' => 'data/projects/cr02.json',
+                    'as' => 'fetch',
+                    'crossorigin' => 'anonymous',
+                ],
+                [
+                    'rel' => 'preload',
+                    'href' => 'images/projectsImages/customReisdential/cr02/Featured.JPG',
+                    'as' => 'image',
+                    'fetchpriority' => 'high',
+                ],
+            ],
+            'ai01' => [
+                [
+                    'rel' => 'preload',
+                    'href' => 'data/projects/ai01.json',
+                    'as' => 'fetch',
+                    'crossorigin' => 'anonymous',
+                ],
+                [
+                    'rel' => 'preload',
+                    'href' => 'images/projectsImages/artInstallation/ai01/Featured.jpg',
+                    'as' => 'image',
+                    'fetchpriority' => 'high',
+                ],
+            ],
+            'muc09' => [
+                [
+                    'rel' => 'preload',
+                    'href' => 'data/projects/muc09.json',
+                    'as' => 'fetch',
+                    'crossorigin' => 'anonymous',
+                ],
+                [
+                    'rel' => 'preload',
+                    'href' => 'images/projectsImages/MultiUnit-Commercial-MixedUse/muc09/Featured.jpg',
+                    'as' => 'image',
+                    'fetchpriority' => 'high',
+                ],
+            ],
+            'ai08' => [
+                [
+                    'rel' => 'preload',
+                    'href' => 'data/projects/ai08.json',
+                    'as' => 'fetch',
+                    'crossorigin' => 'anonymous',
+                ],
+                [
+                    'rel' => 'preload',
+                    'href' => 'images/projectsImages/artInstallation/ai08/Featured.jpg',
+                    'as' => 'image',
+                    'fetchpriority' => 'high',
+                ],
+            ],
+            'muc05' => [
+                [
+                    'rel' => 'preload',
+                    'href' => 'data/projects/muc05.json',
+                    'as' => 'fetch',
+                    'crossorigin' => 'anonymous',
+                ],
+                [
+                    'rel' => 'preload',
+                    'href' => 'images/projectsImages/MultiUnit-Commercial-MixedUse/muc05/Featured.jpg',
+                    'as' => 'image',
+                    'fetchpriority' => 'high',
+                ],
+            ],
+            'muc01' => [
+                [
+                    'rel' => 'preload',
+                    'href' => 'data/projects/muc01.json',
+                    'as' => 'fetch',
+                    'crossorigin' => 'anonymous',
+                ],
+                [
+                    'rel' => 'preload',
+                    'href' => 'images/projectsImages/MultiUnit-Commercial-MixedUse/muc01/Featured.jpg',
+                    'as' => 'image',
+                    'fetchpriority' => 'high',
+                ],
+            ],
+            'muc02' => [
+                [
+                    'rel' => 'preload',
+                    'href' => 'data/projects/muc02.json',
+                    'as' => 'fetch',
+                    'crossorigin' => 'anonymous',
+                ],
+                [
+                    'rel' => 'preload',
+                    'href' => 'images/projectsImages/MultiUnit-Commercial-MixedUse/muc02/Featured.jpg',
+                    'as' => 'image',
+                    'fetchpriority' => 'high',
+                ],
+            ],
+            'muc07' => [
+                [
+                    'rel' => 'preload',
+                    'href' => 'data/projects/muc07.json',
+                    'as' => 'fetch',
+                    'crossorigin' => 'anonymous',
+                ],
+                [
+                    'rel' => 'preload',
+                    'href' => 'images/projectsImages/MultiUnit-Commercial-MixedUse/muc07/Featured.jpg',
+                    'as' => 'image',
+                    'fetchpriority' => 'high',
+                ],
+            ],
+            'muc06' => [
+                [
+                    'rel' => 'preload',
+                    'href' => 'data/projects/muc06.json',
+                    'as' => 'fetch',
+                    'crossorigin' => 'anonymous',
+                ],
+                [
+                    'rel' => 'preload',
+                    'href' => 'images/projectsImages/MultiUnit-Commercial-MixedUse/muc06/Featured.jpg',
+                    'as' => 'image',
+                    'fetchpriority' => 'high',
+                ],
+            ],
+            'ai03' => [
+                [
+                    'rel' => 'preload',
+                    'href' => 'data/projects/ai03.json',
+                    'as' => 'fetch',
+                    'crossorigin' => 'anonymous',
+                ],
+                [
+                    'rel' => 'preload',
+                    'href' => 'images/projectsImages/artInstallation/ai03/Featured.jpg',
+                    'as' => 'image',
+                    'fetchpriority' => 'high',
+                ],
+            ],
+            'ai05' => [
+                [
+                    'rel' => 'preload',
+                    'href' => 'data/projects/ai05.json',
+                    'as' => 'fetch',
+                    'crossorigin' => 'anonymous',
+                ],
+                [
+                    'rel' => 'preload',
+                    'href' => 'images/projectsImages/artInstallation/ai05/Featured.jpg',
+                    'as' => 'image',
+                    'fetchpriority' => 'high',
+                ],
+            ],
+            'ai06' => [
+                [
+                    'rel' => 'preload',
+                    'href' => 'data/projects/ai06.json',
+                    'as' => 'fetch',
+                    'crossorigin' => 'anonymous',
+                ],
+                [
+                    'rel' => 'preload',
+                    'href' => 'images/projectsImages/artInstallation/ai06/Featured.jpg',
+                    'as' => 'image',
+                    'fetchpriority' => 'high',
+                ],
+            ],
+            'ai04' => [
+                [
+                    'rel' => 'preload',
+                    'href' => 'data/projects/ai04.json',
+                    'as' => 'fetch',
+                    'crossorigin' => 'anonymous',
+                ],
+                [
+                    'rel' => 'preload',
+                    'href' => 'images/projectsImages/artInstallation/ai04/Featured.JPG',
+                    'as' => 'image',
+                    'fetchpriority' => 'high',
+                ],
+            ],
+        ],
+    ],
+    'blog-post' => [
+        'common' => [
+            [
+                'rel' => 'preconnect',
+                'href' => 'https://www.googletagmanager.com',
+            ],
+            [
+                'rel' => 'preconnect',
+                'href' => 'https://cdnjs.cloudflare.com',
+            ],
+            [
+                'rel' => 'preconnect',
+                'href' => 'https://fonts.googleapis.com',
+            ],
+            [
+                'rel' => 'preconnect',
+                'href' => 'https://fonts.gstatic.com',
+                'crossorigin' => 'anonymous',
+            ],
+            [
+                'rel' => 'preload',
+                'href' => 'https://fonts.googleapis.com/css2?family=Montserrat:wght@200;300;400;500;600;700&family=Source+Sans+Pro:wght@200;300;400;600&display=swap',
+                'as' => 'style',
+            ],
+        ],
+        'byId' => [
+            'best-location-for-building-a-house' => [
+                [
+                    'rel' => 'preload',
+                    'href' => 'data/blog/best-location-for-building-a-house.json',
+                    'as' => 'fetch',
+                    'crossorigin' => 'anonymous',
+                ],
+                [
+                    'rel' => 'preload',
+                    'href' => 'images/blogImages/best-location-for-building-a-house/Featured.jpg',
+                    'as' => 'image',
+                    'fetchpriority' => 'high',
+                ],
+            ],
+            'building-a-house' => [
+                [
+                    'rel' => 'preload',
+                    'href' => 'data/blog/building-a-house.json',
+                    'as' => 'fetch',
+                    'crossorigin' => 'anonymous',
+                ],
+                [
+                    'rel' => 'preload',
+                    'href' => 'images/blogImages/building-a-house/Featured.jpg',
+                    'as' => 'image',
+                    'fetchpriority' => 'high',
+                ],
+            ],
+            'building-permit-in-toronto' => [
+                [
+                    'rel' => 'preload',
+                    'href' => 'data/blog/building-permit-in-toronto.json',
+                    'as' => 'fetch',
+                    'crossorigin' => 'anonymous',
+                ],
+                [
+                    'rel' => 'preload',
+                    'href' => 'images/blogImages/building-permit-in-toronto/Featured.jpg',
+                    'as' => 'image',
+                    'fetchpriority' => 'high',
+                ],
+            ],
+            'choose-a-realtor-in-toronto' => [
+                [
+                    'rel' => 'preload',
+                    'href' => 'data/blog/choose-a-realtor-in-toronto.json',
+                    'as' => 'fetch',
+                    'crossorigin' => 'anonymous',
+                ],
+                [
+                    'rel' => 'preload',
+                    'href' => 'images/blogImages/choose-a-realtor-in-toronto/Featured.jpg',
+                    'as' => 'image',
+                    'fetchpriority' => 'high',
+                ],
+            ],
+            'choose-an-architecture-firm-in-toronto' => [
+                [
+                    'rel' => 'preload',
+                    'href' => 'data/blog/choose-an-architecture-firm-in-toronto.json',
+                    'as' => 'fetch',
+                    'crossorigin' => 'anonymous',
+                ],
+                [
+                    'rel' => 'preload',
+                    'href' => 'images/blogImages/choose-an-architecture-firm-in-toronto/Featured.jpg',
+                    'as' => 'image',
+                    'fetchpriority' => 'high',
+                ],
+            ],
+            'committee-of-adjustment-toronto' => [
+                [
+                    'rel' => 'preload',
+                    'href' => 'data/blog/committee-of-adjustment-toronto.json',
+                    'as' => 'fetch',
+                    'crossorigin' => 'anonymous',
+                ],
+                [
+                    'rel' => 'preload',
+                    'href' => 'images/blogImages/committee-of-adjustment-toronto/Featured.jpg',
+                    'as' => 'image',
+                    'fetchpriority' => 'high',
+                ],
+            ],
+            'expanding-housing-options-in-neighbourhoods' => [
+                [
+                    'rel' => 'preload',
+                    'href' => 'data/blog/expanding-housing-options-in-neighbourhoods.json',
+                    'as' => 'fetch',
+                    'crossorigin' => 'anonymous',
+                ],
+                [
+                    'rel' => 'preload',
+                    'href' => 'images/blogImages/expanding-housing-options-in-neighbourhoods/Featured.jpg',
+                    'as' => 'image',
+                    'fetchpriority' => 'high',
+                ],
+            ],
+            'laneway-and-garden-suites-in-toronto' => [
+                [
+                    'rel' => 'preload',
+                    'href' => 'data/blog/laneway-and-garden-suites-in-toronto.json',
+                    'as' => 'fetch',
+                    'crossorigin' => 'anonymous',
+                ],
+                [
+                    'rel' => 'preload',
+                    'href' => 'images/blogImages/laneway-and-garden-suites-in-toronto/Featured.jpg',
+                    'as' => 'image',
+                    'fetchpriority' => 'high',
+                ],
+            ],
+            'selecting-a-construciton-company' => [
+                [
+                    'rel' => 'preload',
+                    'href' => 'data/blog/selecting-a-construciton-company.json',
+                    'as' => 'fetch',
+                    'crossorigin' => 'anonymous',
+                ],
+                [
+                    'rel' => 'preload',
+                    'href' => 'images/blogImages/selecting-a-construciton-company/Featured.jpg',
+                    'as' => 'image',
+                    'fetchpriority' => 'high',
+                ],
+            ],
+            'should-i-hire-an-architect-or-designer' => [
+                [
+                    'rel' => 'preload',
+                    'href' => 'data/blog/should-i-hire-an-architect-or-designer.json',
+                    'as' => 'fetch',
+                    'crossorigin' => 'anonymous',
+                ],
+                [
+                    'rel' => 'preload',
+                    'href' => 'images/blogImages/should-i-hire-an-architect-or-designer/Featured.jpg',
+                    'as' => 'image',
+                    'fetchpriority' => 'high',
+                ],
+            ],
+        ],
+    ],
+];
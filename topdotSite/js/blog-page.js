@@ -28,6 +28,12 @@
     const text = document.createElement("div");
     text.className = "overlay-text";
     text.textContent = p.title || "";
+    if (p.readingMinutes) {
+      const meta = document.createElement("span");
+      meta.className = "overlay-text__meta";
+      meta.textContent = `${p.readingMinutes} min read`;
+      text.appendChild(meta);
+    }
 
     wrap.appendChild(img);
     wrap.appendChild(text);
@@ -39,6 +45,8 @@
   const main = async () => {
     const grid = document.getElementById(GRID_ID);
     if (!grid) return;
+    // Cards rendered server-side by partials/blog-grid.php; nothing to fetch.
+    if (grid.querySelector("a")) return;
 
     try {
       const posts = await fetchBlogIndex();
@@ -15,8 +15,16 @@
     return id && id.trim() ? id.trim() : "";
   };
 
+  // partials/resource-hints.php preloads the post JSON; a no-store fetch would skip that
+  // response, so use the normal cache mode when the preload is present (it is fresh).
+  const isPreloaded = (url) =>
+    Array.from(document.querySelectorAll('link[rel="preload"][as="fetch"]')).some(
+      (l) => l.href === new URL(url, document.baseURI).href
+    );
+
   const fetchPost = async (id) => {
-    const res = await fetch(`data/blog/${encodeURIComponent(id)}.json`, { cache: "no-store" });
+    const url = `data/blog/${encodeURIComponent(id)}.json`;
+    const res = await fetch(url, { cache: isPreloaded(url) ? "default" : "no-store" });
     if (!res.ok) throw new Error(String(res.status));
     return await res.json();
   };
@@ -79,8 +87,23 @@
     });
   };
 
+  // width/height/srcset/sizes come from tools/pipeline/build_blog_media.py.
+  const applyMediaFields = (img, m) => {
+    if (!m) return;
+    if (m.width && m.height) {
+      img.width = m.width;
+      img.height = m.height;
+      img.style.height = "auto";
+    }
+    if (m.srcset) {
+      img.srcset = m.srcset;
+      img.sizes = m.sizes || "";
+    }
+  };
+
   const appendImage = (parent, b) => {
     const img = document.createElement("img");
+    applyMediaFields(img, b);
     img.src = b.src || "";
     img.alt = b.alt || "";
     img.loading = "lazy";
@@ -89,7 +112,7 @@
     parent.appendChild(img);
   };
 
-  const appendIframe = (parent, b) => {
+  const createIframe = (b) => {
     const iframe = document.createElement("iframe");
     iframe.src = b.src || "";
     iframe.width = "100%";
@@ -99,7 +122,45 @@
     iframe.allowFullscreen = true;
     if (b.title) iframe.title = b.title;
     iframe.style.border = "0";
-    parent.appendChild(iframe);
+    return iframe;
+  };
+
+  // Embeds with a generated poster render as a click-to-load facade, so the third-party
+  // page (and its scripts) only loads when the reader asks for it.
+  const appendIframe = (parent, b) => {
+    if (!b.poster) {
+      parent.appendChild(createIframe(b));
+      return;
+    }
+
+    const facade = document.createElement("button");
+    facade.type = "button";
+    facade.className = "embed-facade";
+    facade.style.height = b.height || "500px";
+    facade.setAttribute("aria-label", `Load ${b.title || b.provider || "embedded content"}`);
+
+    const poster = document.createElement("img");
+    poster.className = "embed-facade__poster";
+    poster.src = b.poster;
+    poster.alt = "";
+    poster.loading = "lazy";
+    poster.decoding = "async";
+
+    const label = document.createElement("span");
+    label.className = "embed-facade__label";
+    label.textContent = `Click to load ${b.provider || "embedded content"}`;
+
+    facade.append(poster, label);
+    facade.addEventListener(
+      "click",
+      () => {
+        const iframe = createIframe(b);
+        iframe.loading = "eager";
+        facade.replaceWith(iframe);
+      },
+      { once: true }
+    );
+    parent.appendChild(facade);
   };
 
   const appendBlocks = (parent, blocks) => {
@@ -136,6 +197,7 @@
       setText(els.breadcrumb, title);
 
       if (els.featuredImg && post && post.featuredImage) {
+        applyMediaFields(els.featuredImg, post.featuredImageMeta);
         els.featuredImg.src = String(post.featuredImage);
         els.featuredImg.alt = title;
       }
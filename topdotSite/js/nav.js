@@ -188,3 +188,14 @@ document.addEventListener("DOMContentLoaded", function onDomReady() {
   }
 });
 
+
+/**
+ * Register the generated service worker (sw.js at the site root, next to js/).
+ * See tools/pipeline/build_service_worker.py.
+ */
+const swUrl = document.currentScript ? new URL("../sw.js", document.currentScript.src) : null;
+if (swUrl && "serviceWorker" in navigator) {
+  window.addEventListener("load", function registerServiceWorker() {
+    navigator.serviceWorker.register(swUrl.href).catch(function () {});
+  });
+}
@@ -95,20 +95,140 @@
     el.hidden = !!hidden;
   };
 
+  // partials/resource-hints.php preloads the detail JSON; a no-store fetch would skip that
+  // response, so use the normal cache mode when the preload is present (it is fresh).
+  const isPreloaded = (url) =>
+    Array.from(document.querySelectorAll('link[rel="preload"][as="fetch"]')).some(
+      (l) => l.href === new URL(url, document.baseURI).href
+    );
+
   const fetchProject = async (id) => {
-    const res = await fetch(`data/projects/${encodeURIComponent(id)}.json`, {
-      cache: "no-store",
+    const url = `data/projects/${encodeURIComponent(id)}.json`;
+    const res = await fetch(url, {
+      cache: isPreloaded(url) ? "default" : "no-store",
     });
     if (!res.ok) throw new Error(String(res.status));
     return await res.json();
   };
 
+  // Deep-zoom layer for images with a tile pyramid (detail.galleryMeta[url].tiles).
+  // Each click steps one pyramid level closer to full resolution (each level doubles the
+  // previous one); the level's tiles are laid out in a scrollable plane and only the tiles in
+  // view are loaded. A click at full resolution zooms back out to the preview.
+  const deepZoom = (() => {
+    let layer = null;
+    let observer = null;
+
+    const close = () => {
+      if (observer) observer.disconnect();
+      observer = null;
+      if (layer) layer.remove();
+      layer = null;
+    };
+
+    const open = (tiles, focusX, focusY, shownWidth) => {
+      close();
+      const dialog = els.lightboxImg && els.lightboxImg.parentElement;
+      if (!dialog || !tiles || !tiles.dzi) return;
+
+      const base = String(tiles.dzi).replace(/\.dzi$/i, "");
+      const size = Number(tiles.tileSize) || 256;
+      const overlap = Number(tiles.overlap) || 0;
+      const maxLevel = Number(tiles.maxLevel);
+      const fullW = Number(tiles.width) || 0;
+      const fullH = Number(tiles.height) || 0;
+      const fmt = tiles.format || "jpg";
+      // Level dimensions, as build_tile_pyramid() computes them.
+      const dims = (level) => {
+        const scale = Math.pow(2, level - maxLevel);
+        return [Math.max(1, Math.ceil(fullW * scale)), Math.max(1, Math.ceil(fullH * scale))];
+      };
+
+      layer = document.createElement("div");
+      layer.className = "lightbox__zoom";
+      dialog.appendChild(layer);
+
+      let level = maxLevel;
+      const show = (fx, fy) => {
+        if (observer) observer.disconnect();
+        const [w, h] = dims(level);
+        const plane = document.createElement("div");
+        plane.className = "lightbox__zoom-plane";
+        plane.style.width = `${w}px`;
+        plane.style.height = `${h}px`;
+
+        const tileImgs = [];
+        for (let col = 0; col < Math.ceil(w / size); col++) {
+          for (let row = 0; row < Math.ceil(h / size); row++) {
+            const img = document.createElement("img");
+            img.className = "lightbox__tile";
+            img.alt = "";
+            img.decoding = "async";
+            img.dataset.src = `${base}_files/${level}/${col}_${row}.${fmt}`;
+            img.style.left = `${col * size - (col > 0 ? overlap : 0)}px`;
+            img.style.top = `${row * size - (row > 0 ? overlap : 0)}px`;
+            plane.appendChild(img);
+            tileImgs.push(img);
+          }
+        }
+        layer.replaceChildren(plane);
+        layer.classList.toggle("is-full", level >= maxLevel);
+        layer.setAttribute(
+          "aria-label",
+          level >= maxLevel ? "Zoomed image (click to zoom out)" : "Zoomed image (click to zoom in further)"
+        );
+
+        // Centre the clicked point, then start streaming the tiles that are visible.
+        layer.scrollLeft = Math.max(0, fx * w - layer.clientWidth / 2);
+        layer.scrollTop = Math.max(0, fy * h - layer.clientHeight / 2);
+
+        observer = new IntersectionObserver(
+          (entries) => {
+            entries.forEach((e) => {
+              if (!e.isIntersecting) return;
+              e.target.src = e.target.dataset.src;
+              observer.unobserve(e.target);
+            });
+          },
+          { root: layer, rootMargin: `${size}px` }
+        );
+        tileImgs.forEach((img) => observer.observe(img));
+      };
+
+      // First step: the smallest level at least twice the size the preview is shown at.
+      const target = 2 * (Number(shownWidth) || 0) * (window.devicePixelRatio || 1);
+      while (level > 0 && dims(level - 1)[0] >= target) level--;
+      show(focusX, focusY);
+
+      layer.addEventListener(
+        "click",
+        (e) => {
+          if (level >= maxLevel) {
+            close();
+            return;
+          }
+          const rect = layer.getBoundingClientRect();
+          const [w, h] = dims(level);
+          const fx = (layer.scrollLeft + e.clientX - rect.left) / w;
+          const fy = (layer.scrollTop + e.clientY - rect.top) / h;
+          level++;
+          show(Math.min(1, fx), Math.min(1, fy));
+        },
+        { passive: true }
+      );
+    };
+
+    return { open, close, isOpen: () => !!layer };
+  })();
+
   const lightbox = (() => {
     let urls = [];
+    let meta = {};
     let idx = 0;
     let prevFocus = null;
     let isOpen = false;
     let failCount = 0;
+    let video = null;
 
     const syncNav = () => {
       if (!els.lightboxPrev || !els.lightboxNext) return;
@@ -121,13 +241,75 @@
 
     const render = () => {
       if (!els.lightboxImg) return;
+      deepZoom.close();
+      removeVideo();
       const url = urls[idx] || "";
-      els.lightboxImg.src = url;
+      const anim = animationFor(url);
+      const tiles = anim ? null : tilesFor(url);
+      els.lightboxImg.classList.toggle("is-zoomable", !!tiles);
+      // Animated images play as a video loop where supported, otherwise as animated WebP.
+      if (anim && showVideo(anim)) return;
+      // Tiled images open on their small preview; the full resolution streams in on zoom.
+      els.lightboxImg.src = anim ? String(anim.webp) : tiles && tiles.preview ? String(tiles.preview) : url;
+    };
+
+    const tilesFor = (url) => {
+      const m = meta && meta[url];
+      return m && m.tiles && m.tiles.dzi ? m.tiles : null;
+    };
+
+    const animationFor = (url) => {
+      const m = meta && meta[url];
+      return m && m.animation && m.animation.webp ? m.animation : null;
+    };
+
+    const removeVideo = () => {
+      if (video) video.remove();
+      video = null;
+      if (els.lightboxImg) els.lightboxImg.hidden = false;
+    };
+
+    const showVideo = (anim) => {
+      if (!anim.video) return false;
+      const el = document.createElement("video");
+      if (!el.canPlayType(anim.videoType || "video/mp4")) return false;
+      el.className = "lightbox__img";
+      el.muted = true;
+      el.defaultMuted = true;
+      el.loop = true;
+      el.autoplay = true;
+      el.playsInline = true;
+      el.poster = String(anim.poster || "");
+      el.src = String(anim.video);
+      el.addEventListener(
+        "error",
+        () => {
+          // Fall back to the animated WebP.
+          if (video !== el) return;
+          removeVideo();
+          els.lightboxImg.src = String(anim.webp);
+        },
+        { passive: true }
+      );
+      els.lightboxImg.hidden = true;
+      els.lightboxImg.insertAdjacentElement("afterend", el);
+      video = el;
+      return true;
+    };
+
+    const zoomAt = (e) => {
+      const tiles = tilesFor(urls[idx] || "");
+      if (!tiles || !els.lightboxImg) return;
+      const rect = els.lightboxImg.getBoundingClientRect();
+      const fx = rect.width ? (e.clientX - rect.left) / rect.width : 0.5;
+      const fy = rect.height ? (e.clientY - rect.top) / rect.height : 0.5;
+      deepZoom.open(tiles, fx, fy, rect.width);
     };
 
-    const openAt = (nextUrls, nextIdx) => {
+    const openAt = (nextUrls, nextIdx, nextMeta) => {
       if (!els.lightbox || !els.lightboxImg) return;
       urls = Array.isArray(nextUrls) ? nextUrls : [];
+      meta = nextMeta && typeof nextMeta === "object" ? nextMeta : {};
       idx = Math.max(0, Math.min(urls.length - 1, Number(nextIdx) || 0));
       failCount = 0;
       prevFocus = document.activeElement instanceof HTMLElement ? document.activeElement : null;
@@ -153,6 +335,8 @@
 
     const close = () => {
       if (!els.lightbox) return;
+      deepZoom.close();
+      removeVideo();
       isOpen = false;
       els.lightbox.classList.remove("is-open");
       els.lightbox.setAttribute("aria-hidden", "true");
@@ -184,7 +368,8 @@
       if (!isOpen) return;
       if (e.key === "Escape") {
         e.preventDefault();
-        close();
+        if (deepZoom.isOpen()) deepZoom.close();
+        else close();
       } else if (e.key === "ArrowLeft") {
         e.preventDefault();
         prev();
@@ -210,6 +395,7 @@
         els.lightboxImg.addEventListener("load", () => {
           failCount = 0;
         });
+        els.lightboxImg.addEventListener("click", zoomAt, { passive: true });
       }
 
       els.lightbox.addEventListener(
@@ -272,6 +458,7 @@
 
     // Gallery
     const urls = p && Array.isArray(p.gallery) ? p.gallery.filter((x) => !isEmptyValue(x)).map(String) : [];
+    const galleryMeta = p && p.galleryMeta && typeof p.galleryMeta === "object" ? p.galleryMeta : {};
     if (els.gallery) els.gallery.replaceChildren();
 
     const syncGalleryEmpty = () => {
@@ -304,7 +491,9 @@
       img.loading = "lazy";
       img.decoding = "async";
       img.alt = `${name} gallery image ${initialIndex + 1}`;
-      img.src = src;
+      // Animated images show their static poster here; the animation only loads in the lightbox.
+      const anim = galleryMeta[src] && galleryMeta[src].animation;
+      img.src = anim && anim.poster ? String(anim.poster) : src;
 
       media.appendChild(img);
       btn.appendChild(media);
@@ -326,7 +515,7 @@
         () => {
           const idxInUrls = urls.indexOf(src);
           if (idxInUrls < 0) return;
-          lightbox.openAt(urls, idxInUrls);
+          lightbox.openAt(urls, idxInUrls, p.galleryMeta);
         },
         { passive: true }
       );
@@ -44,28 +44,57 @@
     return [];
   };
 
-  const yearValue = (p) => {
-    const y = Number(p && p.year);
-    return Number.isFinite(y) ? y : -Infinity;
-  };
-
   const fetchProjects = async () => {
     const res = await fetch("data/projects.json", { cache: "no-store" });
     if (!res.ok) throw new Error(`Failed to load projects.json: ${res.status}`);
     const data = await res.json();
     if (!Array.isArray(data)) throw new Error("projects.json is not an array");
-    const normalized = data.map((p) => ({ ...p, tags: normalizeTags(p) }));
-    normalized.sort((a, b) => {
-      const by = yearValue(b);
-      const ay = yearValue(a);
-      if (by !== ay) return by - ay; // newest first; missing years last
-      return String(a.name || "").localeCompare(String(b.name || ""), undefined, {
-        sensitivity: "base",
-      });
-    });
-    return normalized;
+    // Already in display order (sorted by the pipeline).
+    return data.map((p) => ({ ...p, tags: normalizeTags(p) }));
+  };
+
+  // Tag facets (order + counts) precomputed by the pipeline.
+  const fetchFacets = async () => {
+    const res = await fetch("data/projects-facets.json", { cache: "no-store" });
+    if (!res.ok) throw new Error(`Failed to load projects-facets.json: ${res.status}`);
+    const data = await res.json();
+    if (!data || !Array.isArray(data.tags)) throw new Error("projects-facets.json has no tags");
+    return data.tags.filter((f) => f && f.tag);
   };
 
+  // Per-tag listing shards; each is fetched at most once per page view.
+  const shardCache = new Map();
+  const fetchTagShard = (facet) => {
+    if (!shardCache.has(facet.tag)) {
+      const req = fetch(facet.shard || `data/projects/by-tag/${encodeURIComponent(facet.tag)}.json`)
+        .then((res) => {
+          if (!res.ok) throw new Error(String(res.status));
+          return res.json();
+        })
+        .catch((e) => {
+          shardCache.delete(facet.tag);
+          throw e;
+        });
+      shardCache.set(facet.tag, req);
+    }
+    return shardCache.get(facet.tag);
+  };
+
+  // Cards rendered server-side by partials/projects-grid.php (already sorted).
+  const readRenderedProjects = (gridEl) =>
+    Array.from(gridEl.querySelectorAll(".project-card")).map((a) => {
+      const img = a.querySelector(".project-card__img");
+      return {
+        id: a.dataset.id || "",
+        name: img ? img.alt : "",
+        thumbnail: img ? img.getAttribute("src") : "",
+        thumbnailSrcset: img ? img.getAttribute("srcset") || "" : "",
+        thumbnailSizes: img ? img.getAttribute("sizes") || "" : "",
+        href: a.getAttribute("href") || "",
+        tags: (a.dataset.tags || "").split(" ").filter(Boolean),
+      };
+    });
+
   const createFilterButton = ({ tag, isActive, onToggle }) => {
     const btn = document.createElement("button");
     btn.type = "button";
@@ -90,6 +119,11 @@
     const img = document.createElement("img");
     img.className = "project-card__img";
     img.src = p.thumbnail || "";
+    // Fixed-aspect card crops (tools/pipeline/build_image_derivatives.py, cards stage).
+    if (p.thumbnailSrcset) {
+      img.srcset = p.thumbnailSrcset;
+      img.sizes = p.thumbnailSizes || "";
+    }
     img.alt = p.name || "";
     img.loading = "lazy";
     img.decoding = "async";
@@ -184,18 +218,55 @@
       sizeRaf = window.requestAnimationFrame(updateCardMediaMaxHeight);
     };
 
-    let projects = [];
+    let projects = readRenderedProjects(gridEl);
+    const isServerRendered = projects.length > 0;
+    if (!isServerRendered) {
+      try {
+        projects = await fetchProjects();
+      } catch (e) {
+        emptyEl.textContent = "Projects unavailable right now.";
+        emptyEl.hidden = false;
+        return;
+      }
+    }
+
+    let facets = [];
     try {
-      projects = await fetchProjects();
+      facets = await fetchFacets();
     } catch (e) {
-      emptyEl.textContent = "Projects unavailable right now.";
-      emptyEl.hidden = false;
-      return;
+      facets = uniqInOrder(projects.flatMap((p) => p.tags)).map((tag) => ({ tag }));
     }
-
-    const tags = uniqInOrder(projects.flatMap((p) => p.tags));
+    const tags = facets.map((f) => f.tag);
+    const facetByTag = new Map(facets.map((f) => [f.tag, f]));
     const active = new Set();
 
+    // Resolve the visible projects for the active tags from the per-tag shards.
+    // Falls back to filtering in memory if a shard can't be loaded.
+    const resolveFiltered = async () => {
+      if (active.size === 0) return projects;
+      try {
+        const shards = await Promise.all(
+          Array.from(active).map((t) => fetchTagShard(facetByTag.get(t) || { tag: t }))
+        );
+        if (shards.length === 1) {
+          const byId = new Map(projects.map((p) => [p.id, p]));
+          return shards[0].map((e) => byId.get(e.id)).filter(Boolean);
+        }
+        const ids = new Set(shards.flatMap((entries) => entries.map((e) => e.id)));
+        return projects.filter((p) => ids.has(p.id));
+      } catch (e) {
+        return projects.filter((p) => p.tags.some((t) => active.has(t)));
+      }
+    };
+
+    let filterSeq = 0;
+    const applyFilters = async () => {
+      const seq = ++filterSeq;
+      const filtered = await resolveFiltered();
+      if (seq !== filterSeq) return; // a newer toggle superseded this one
+      fadeAndSwap(gridEl, () => renderGrid(filtered));
+    };
+
     const render = () => {
       // Filters
       filtersEl.replaceChildren();
@@ -213,7 +284,7 @@
             if (tag !== ALL_TAG) return;
             if (active.size === 0) return; // already showing all
             active.clear();
-            fadeAndSwap(gridEl, renderGrid);
+            applyFilters();
             renderFilters();
           },
         })
@@ -228,7 +299,7 @@
               if (tag === ALL_TAG) return;
               if (active.has(tag)) active.delete(tag);
               else active.add(tag);
-              fadeAndSwap(gridEl, renderGrid);
+              applyFilters();
               // Re-render filters without fade (instant feedback)
               renderFilters();
             },
@@ -247,14 +318,9 @@
       });
     };
 
-    const renderGrid = () => {
+    const renderGrid = (filtered) => {
       gridEl.replaceChildren();
 
-      const filtered =
-        active.size === 0
-          ? projects
-          : projects.filter((p) => p.tags.some((t) => active.has(t)));
-
       if (filtered.length === 0) {
         emptyEl.textContent = "No projects match those tags.";
         emptyEl.hidden = false;
@@ -270,7 +336,9 @@
     };
 
     render();
-    renderGrid();
+    // Server-rendered cards are already in place; only build the grid client-side as a fallback.
+    if (isServerRendered) requestSizeUpdate();
+    else renderGrid(projects);
 
     // Keep sizing correct on viewport changes.
     window.addEventListener("resize", requestSizeUpdate, { passive: true });
@@ -0,0 +1,22 @@
+<?php
+/**
+ * Server-rendered blog cards.
+ *
+ * Reads data/blog.php (generated by tools/pipeline/blog_to_json.py).
+ * Markup mirrors createCard() in js/blog-page.js, which keeps these cards as-is.
+ */
+$__blogData = __DIR__ . "/../data/blog.php";
+$__posts = is_file($__blogData) ? require $__blogData : [];
+
+$__e = function ($v): string {
+    return htmlspecialchars((string) $v, ENT_QUOTES, "UTF-8");
+};
+?>
+<?php foreach ($__posts as $p): ?>
+<a href="<?php echo $__e($p["href"] ?? "#"); ?>">
+	<div class="image-overlay">
+		<img src="<?php echo $__e($p["thumbnail"] ?? ""); ?>" alt="<?php echo $__e($p["title"] ?? ""); ?>" loading="lazy" decoding="async">
+		<div class="overlay-text"><?php echo $__e($p["title"] ?? ""); ?><?php if (!empty($p["readingMinutes"])): ?><span class="overlay-text__meta"><?php echo (int) $p["readingMinutes"]; ?> min read</span><?php endif; ?></div>
+	</div>
+</a>
+<?php endforeach; ?>
@@ -0,0 +1,25 @@
+<?php
+/**
+ * Server-rendered project cards.
+ *
+ * Reads data/projects.php (generated by tools/pipeline/sheets_to_projects_json.py,
+ * already in display order).
+ * Markup mirrors createCard() in js/projects-page.js, which hydrates these cards
+ * instead of fetching projects.json.
+ */
+$__projectsData = __DIR__ . "/../data/projects.php";
+$__projects = is_file($__projectsData) ? require $__projectsData : [];
+
+$__e = function ($v): string {
+    return htmlspecialchars((string) $v, ENT_QUOTES, "UTF-8");
+};
+?>
+<?php foreach ($__projects as $p): ?>
+<?php $__tags = is_array($p["tags"] ?? null) ? $p["tags"] : []; ?>
+<a class="project-card" href="project.html?id=<?php echo rawurlencode((string) ($p["id"] ?? "")); ?>" data-id="<?php echo $__e($p["id"] ?? ""); ?>" data-tags="<?php echo $__e(implode(" ", $__tags)); ?>">
+	<div class="project-card__media">
+		<img class="project-card__img" src="<?php echo $__e($p["thumbnail"] ?? ""); ?>"<?php if (!empty($p["thumbnailSrcset"])): ?> srcset="<?php echo $__e($p["thumbnailSrcset"]); ?>" sizes="<?php echo $__e($p["thumbnailSizes"] ?? ""); ?>"<?php endif; ?> alt="<?php echo $__e($p["name"] ?? ""); ?>" loading="lazy" decoding="async">
+		<div class="project-card__caption"><span class="project-card__caption-text"><?php echo $__e($p["name"] ?? ""); ?></span></div>
+	</div>
+</a>
+<?php endforeach; ?>
@@ -0,0 +1,42 @@
+<?php
+/**
+ * Resource hints (preconnect/preload) for detail pages.
+ *
+ * Set $__hintsPage ("project" or "blog-post") before including; the record comes from ?id=.
+ * Reads data/resource-hints.php (generated by tools/pipeline/build_resource_hints.py).
+ * Include it before any output (above the doctype): the hints are sent as Link headers
+ * (hosts with Early Hints turn these into a 103 response) and collected in $__hintsTags,
+ * which the page echoes inside <head>. Nothing is printed here.
+ */
+require_once __DIR__ . "/base.php";
+$__hintsBase = topdot_site_base_url();
+$__hintsData = __DIR__ . "/../data/resource-hints.php";
+$__hintsMap = is_file($__hintsData) ? require $__hintsData : [];
+$__hintsFor = $__hintsMap[$__hintsPage ?? ""] ?? [];
+$__hintsId = isset($_GET["id"]) ? trim((string) $_GET["id"]) : "";
+
+$__hints = $__hintsFor["common"] ?? [];
+if ($__hintsId !== "" && isset($__hintsFor["byId"][$__hintsId])) {
+    $__hints = array_merge($__hints, $__hintsFor["byId"][$__hintsId]);
+}
+
+$__hintsTags = "";
+$__hintAttrs = ["as", "crossorigin", "fetchpriority", "imagesrcset", "imagesizes"];
+foreach ($__hints as $__h) {
+    // Site-relative hrefs are made absolute so Link headers resolve the same as the tags.
+    if (!preg_match('#^https?://#', $__h["href"])) {
+        $__h["href"] = $__hintsBase . "/" . $__h["href"];
+    }
+    if (!headers_sent()) {
+        $__parts = ["<" . $__h["href"] . ">", "rel=" . $__h["rel"]];
+        foreach ($__hintAttrs as $__k) {
+            if (isset($__h[$__k])) $__parts[] = $__k . '="' . $__h[$__k] . '"';
+        }
+        header("Link: " . implode("; ", $__parts), false);
+    }
+    $__tag = '<link rel="' . htmlspecialchars($__h["rel"], ENT_QUOTES, "UTF-8") . '" href="' . htmlspecialchars($__h["href"], ENT_QUOTES, "UTF-8") . '"';
+    foreach ($__hintAttrs as $__k) {
+        if (isset($__h[$__k])) $__tag .= " " . $__k . '="' . htmlspecialchars($__h[$__k], ENT_QUOTES, "UTF-8") . '"';
+    }
+    $__hintsTags .= "\t" . $__tag . ">\n";
+}
@@ -0,0 +1,116 @@
+// sw.js
+// Generated by tools/pipeline/build_service_worker.py. Do not edit.
+/**
+ * Precache the site shell (per-entry revisions) and serve detail JSON stale-while-revalidate.
+ */
+// Changes whenever a precached file or the build manifest changes, so browsers install the update.
+const VERSION = "c17790cd7c645340";
+const PRECACHE = [
+  ["css/base.css", "d8ea47d36a4fa2b2"],
+  ["css/layout.css", "ae9e86292290a540"],
+  ["css/partials/footer.css", "951939be40e4f40f"],
+  ["css/partials/header.css", "118603d056190ac0"],
+  ["css/sections/project-detail.css", "648a7b0ece82425c"],
+  ["css/sections/projects-contact.css", "5240a85612a4820d"],
+  ["css/sections/projects-page.css", "5249141602de19b1"],
+  ["data/blog.json", "9af640f581fa2205"],
+  ["data/projects-facets.json", "4475fbc3dc038a2d"],
+  ["data/projects-spec-index.json", "0eace3e23911580b"],
+  ["data/projects.json", "2bbd8b03a0b57a74"],
+  ["data/projects/by-tag/art-installation.json", "974fe997f550d862"],
+  ["data/projects/by-tag/commercial.json", "fc7eb4486b92dc53"],
+  ["data/projects/by-tag/custom-residential.json", "aa1a51d1e70165e3"],
+  ["data/projects/by-tag/multi-unit.json", "63bccc9300339052"],
+  ["images/circleLogo.png", "2c7d469cd79e7fd0"],
+  ["images/favicon.ico", "38f4da3d1d7c1838"],
+  ["js/blog-page.js", "4c00ba10b8c73b7c"],
+  ["js/blog-post.js", "de81f936ddabe355"],
+  ["js/nav.js", "bad2c06d3d3116de"],
+  ["js/pageName.js", "8c9d2c9b18ccfed6"],
+  ["js/pageNames.js", "868834edd5bcc2f8"],
+  ["js/project-detail.js", "4ee1eeac24751b2d"],
+  ["js/projects-page.js", "846cf2eb9fca7ead"]
+];
+
+const PRECACHE_CACHE = "topdot-precache";
+const RUNTIME_CACHE = "topdot-runtime";
+const REVISIONS_KEY = "__sw-revisions";
+const DETAIL_RE = /^data\/(projects|blog)\/[^/]+\.json$/;
+
+const scoped = (path) => new URL(path, self.registration.scope).href;
+const revisions = new Map(PRECACHE);
+
+const readRevisions = async (cache) => {
+  const res = await cache.match(scoped(REVISIONS_KEY));
+  return res ? await res.json() : {};
+};
+
+self.addEventListener("install", (event) => {
+  event.waitUntil(
+    (async () => {
+      const cache = await caches.open(PRECACHE_CACHE);
+      const cached = await readRevisions(cache);
+      // Only entries whose content changed since the last install are fetched again.
+      const changed = PRECACHE.filter(([path, rev]) => cached[path] !== rev);
+      await Promise.all(
+        changed.map(async ([path]) => {
+          const res = await fetch(scoped(path), { cache: "no-cache" });
+          if (!res.ok) throw new Error(`${path}: ${res.status}`);
+          await cache.put(scoped(path), res);
+        })
+      );
+      await self.skipWaiting();
+    })()
+  );
+});
+
+self.addEventListener("activate", (event) => {
+  event.waitUntil(
+    (async () => {
+      const cache = await caches.open(PRECACHE_CACHE);
+      const keep = new Set(PRECACHE.map(([path]) => scoped(path)));
+      keep.add(scoped(REVISIONS_KEY));
+      const keys = await cache.keys();
+      await Promise.all(keys.filter((req) => !keep.has(req.url)).map((req) => cache.delete(req)));
+      await cache.put(scoped(REVISIONS_KEY), new Response(JSON.stringify(Object.fromEntries(revisions))));
+
+      const names = await caches.keys();
+      await Promise.all(
+        names.filter((n) => n !== PRECACHE_CACHE && n !== RUNTIME_CACHE).map((n) => caches.delete(n))
+      );
+      await self.clients.claim();
+    })()
+  );
+});
+
+const staleWhileRevalidate = async (event, url) => {
+  const cache = await caches.open(RUNTIME_CACHE);
+  const cached = await cache.match(url);
+  const network = fetch(url, { cache: "no-cache" }).then(async (res) => {
+    if (res.ok) await cache.put(url, res.clone());
+    return res;
+  });
+  if (cached) {
+    event.waitUntil(network.catch(() => {}));
+    return cached;
+  }
+  return network;
+};
+
+self.addEventListener("fetch", (event) => {
+  const req = event.request;
+  if (req.method !== "GET" || req.mode === "navigate") return;
+
+  const url = new URL(req.url);
+  const scope = self.registration.scope;
+  if (url.origin !== self.location.origin || url.search || !url.href.startsWith(scope)) return;
+  const path = url.href.slice(scope.length);
+
+  if (revisions.has(path)) {
+    event.respondWith(
+      caches.match(url.href, { cacheName: PRECACHE_CACHE }).then((res) => res || fetch(req))
+    );
+  } else if (DETAIL_RE.test(path)) {
+    event.respondWith(staleWhileRevalidate(event, url.href));
+  }
+});
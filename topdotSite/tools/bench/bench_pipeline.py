@@ -0,0 +1,305 @@
+"""
+Pipeline benchmarks on synthetic corpora.
+
+Generates a throwaway site per corpus size (sheets CSVs + image tree: Featured.jpg and
+--images gallery files per project, named out of order so the first sync has to renumber them)
+and times each pipeline stage twice: cold (fresh corpus, first run) and warm (nothing changed).
+
+Stages:
+- load_projects / load_specs / load_descriptions: CSV loaders in sheets_to_projects_json.py
+- build_specs_array: specs join for every project
+- compile: sheets_to_projects_json.main() end to end (listing, details, shards, PHP, manifest;
+  warm runs skip the unchanged details through the project store)
+- sync_gallery: sync_project_assets.sync_gallery() over every project
+- validate_details: validate_site.validate_details()
+
+The pipeline modules read their paths from module constants, so each run points every
+Path constant under the real site root at the synthetic site instead.
+
+Results are appended to a JSON history (tools/bench/history.json by default; timings are
+machine-specific, so keep it local). The check fails (exit 1) when:
+- a stage is slower than the median of the previous runs for the same corpus by more than
+  --threshold percent (and by at least MIN_REGRESSION_SECONDS), or
+- per-project time grows more than --max-scaling x from the smallest to the largest size
+  (i.e. a stage scales worse than linearly).
+
+Run:
+  python topdotSite/tools/bench/bench_pipeline.py [--sizes 100,1000] [--images 50]
+      [--threshold 25] [--max-scaling 3] [--history PATH] [--no-record] [--keep]
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import csv
+import io
+import json
+import platform
+import random
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+SITE_ROOT = Path(__file__).resolve().parents[2]
+PIPELINE_DIR = SITE_ROOT / "tools" / "pipeline"
+HISTORY_PATH = Path(__file__).resolve().parent / "history.json"
+
+sys.path.insert(0, str(PIPELINE_DIR))
+import sheets_to_projects_json as compiler  # noqa: E402
+import sync_project_assets as assets  # noqa: E402
+import validate_site as validator  # noqa: E402
+import project_store  # noqa: E402
+
+MODULES = (compiler, assets, validator, project_store)
+
+STAGES = (
+    "load_projects",
+    "load_specs",
+    "load_descriptions",
+    "build_specs_array",
+    "compile",
+    "sync_gallery",
+    "validate_details",
+)
+# Differences below this are noise on a shared machine.
+MIN_REGRESSION_SECONDS = 0.05
+
+TYPES = {
+    "custom-residential": "customResidential",
+    "multi-unit": "MultiUnit-Commercial-MixedUse",
+    "art-installation": "artInstallation",
+}
+WORDS = (
+    "light courtyard timber facade stair garden laneway brick glass roof terrace void kitchen "
+    "basement gallery suite massing setback frontage zoning storey ravine"
+).split()
+
+
+def generate_corpus(root: Path, n_projects: int, n_images: int, seed: int = 1) -> None:
+    """Write sheets + an image tree for n_projects under root (a site root)."""
+    rng = random.Random(seed)
+    sheets = root / "data" / "sheets"
+    sheets.mkdir(parents=True)
+    (root / "data" / "projects").mkdir()
+    shutil.copy(SITE_ROOT / "data" / "sheets" / "SpecDefinitions.csv", sheets / "SpecDefinitions.csv")
+
+    projects, descriptions, specs = [], [], []
+    for i in range(n_projects):
+        ptype = rng.choice(list(TYPES))
+        pid = f"{ptype[:2]}{i:05d}"
+        image_dir = f"images/projectsImages/{TYPES[ptype]}/{pid}/"
+        projects.append({
+            "id": pid,
+            "name": " ".join(rng.choice(WORDS).title() for _ in range(3)),
+            "type": ptype,
+            "tags": ptype,
+            "status": "published",
+            "year": str(rng.randint(2010, 2025)) if rng.random() < 0.7 else "",
+            "location": "Toronto, ON",
+            "image_dir": image_dir,
+            "featured_ext": "jpg",
+            "sort_priority": str(rng.randint(1, 5)) if rng.random() < 0.1 else "",
+            "notes": "",
+        })
+        for order in range(1, 4):
+            descriptions.append({
+                "project_id": pid,
+                "order": str(order),
+                "text": " ".join(rng.choice(WORDS) for _ in range(120)),
+            })
+        specs.append({
+            "project_id": pid,
+            "location": "Toronto, ON",
+            "lot_size": f"{rng.randint(25, 60)}x{rng.randint(100, 150)}",
+            "zoning": rng.choice(["RD", "RS", "RM", "CR"]),
+            "type": ptype,
+            "units": str(rng.randint(1, 200)),
+            "development_area": f"{rng.randint(1000, 90000):,} sq ft",
+            "construction_type": rng.choice(["Wood frame", "Concrete", "Steel"]),
+            "developer": "",
+            "architect": "topdot architects",
+            "construction_manager": "",
+        })
+
+        gallery = root / image_dir / "Gallery"
+        gallery.mkdir(parents=True)
+        (root / image_dir / "Featured.jpg").write_bytes(b"\xff\xd8bench")
+        for k in rng.sample(range(1000, 9999), n_images):
+            (gallery / f"IMG_{k}.jpg").write_bytes(b"\xff\xd8bench")
+
+    for name, rows in (("Projects.csv", projects), ("ProjectDescriptions.csv", descriptions), ("ProjectSpecs.csv", specs)):
+        with (sheets / name).open("w", encoding="utf-8", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=list(rows[0]))
+            writer.writeheader()
+            writer.writerows(rows)
+
+
+def rebase_modules(old_root: Path, new_root: Path) -> None:
+    """Point every Path constant under old_root in the pipeline modules at new_root."""
+    for mod in MODULES:
+        for name, val in list(vars(mod).items()):
+            if isinstance(val, Path) and (val == old_root or old_root in val.parents):
+                setattr(mod, name, new_root / val.relative_to(old_root))
+
+
+def stage_functions() -> Dict[str, Callable[[], Any]]:
+    def build_specs() -> None:
+        defs = compiler.load_spec_defs()
+        for project_specs in compiler.load_specs(defs).values():
+            compiler.build_specs_array(project_specs, defs)
+
+    def sync_all() -> None:
+        for item in json.loads(assets.PROJECTS_JSON.read_text(encoding="utf-8")):
+            detail = json.loads((assets.PROJECTS_DIR / f"{item['id']}.json").read_text(encoding="utf-8"))
+            gallery = assets.SITE_ROOT / Path(detail["featuredImage"]).parent / "Gallery"
+            assets.sync_gallery(item["id"], gallery)
+
+    return {
+        "load_projects": compiler.load_projects,
+        "load_specs": lambda: compiler.load_specs(compiler.load_spec_defs()),
+        "load_descriptions": compiler.load_descriptions,
+        "build_specs_array": build_specs,
+        "compile": compiler.main,
+        "sync_gallery": sync_all,
+        "validate_details": validator.validate_details,
+    }
+
+
+def timed(fn: Callable[[], Any]) -> float:
+    with contextlib.redirect_stdout(io.StringIO()):
+        started = time.perf_counter()
+        fn()
+        return time.perf_counter() - started
+
+
+def bench_size(n_projects: int, n_images: int, keep: bool) -> Dict[str, Dict[str, float]]:
+    """Cold and warm seconds per stage for one corpus size."""
+    tmp = Path(tempfile.mkdtemp(prefix=f"topdot-bench-{n_projects}-"))
+    try:
+        started = time.perf_counter()
+        generate_corpus(tmp, n_projects, n_images)
+        print(f"  corpus: {n_projects} projects x {n_images} images ({time.perf_counter() - started:.1f} s to generate)")
+        rebase_modules(SITE_ROOT, tmp)
+
+        fns = stage_functions()
+        results: Dict[str, Dict[str, float]] = {}
+        for run in ("cold", "warm"):
+            for stage in STAGES:
+                results.setdefault(stage, {})[run] = round(timed(fns[stage]), 4)
+        for stage in STAGES:
+            r = results[stage]
+            print(f"  {stage:<18} cold {r['cold']:>8.3f} s  warm {r['warm']:>8.3f} s")
+        return results
+    finally:
+        rebase_modules(tmp, SITE_ROOT)
+        if keep:
+            print(f"  kept corpus at {tmp}")
+        else:
+            shutil.rmtree(tmp, ignore_errors=True)
+
+
+def git_commit() -> str:
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=SITE_ROOT, capture_output=True, text=True)
+        return out.stdout.strip()
+    except OSError:
+        return ""
+
+
+def check_regressions(run: Dict[str, Any], history: List[Dict[str, Any]], threshold: float) -> List[str]:
+    """Stages slower than the median of earlier runs on the same corpus."""
+    failures = []
+    for size, stages in run["results"].items():
+        earlier = [
+            h["results"][size]
+            for h in history
+            if h.get("images") == run["images"] and size in h.get("results", {})
+        ]
+        for stage, timing in stages.items():
+            for mode in ("cold", "warm"):
+                past = [e[stage][mode] for e in earlier if stage in e]
+                if not past:
+                    continue
+                base = statistics.median(past)
+                now = timing[mode]
+                if now - base > MIN_REGRESSION_SECONDS and now > base * (1 + threshold / 100):
+                    failures.append(f"{size} projects, {stage} ({mode}): {base:.3f} s -> {now:.3f} s")
+    return failures
+
+
+def check_scaling(run: Dict[str, Any], max_scaling: float) -> List[str]:
+    """Per-project time should stay roughly flat as the corpus grows."""
+    sizes = sorted(int(s) for s in run["results"])
+    if len(sizes) < 2:
+        return []
+    small, large = str(sizes[0]), str(sizes[-1])
+    failures = []
+    for stage in STAGES:
+        for mode in ("cold", "warm"):
+            t_small = run["results"][small][stage][mode]
+            t_large = run["results"][large][stage][mode]
+            if t_large < MIN_REGRESSION_SECONDS:
+                continue
+            growth = (t_large / int(large)) / max(t_small / int(small), 1e-9)
+            if growth > max_scaling:
+                failures.append(
+                    f"{stage} ({mode}): per-project time x{growth:.1f} from {small} to {large} projects"
+                )
+    return failures
+
+
+def parse_args() -> argparse.Namespace:
+    ap = argparse.ArgumentParser(description="Benchmark pipeline stages on synthetic corpora.")
+    ap.add_argument("--sizes", default="100,1000", help="Comma-separated project counts (e.g. 100,1000,10000).")
+    ap.add_argument("--images", type=int, default=50, help="Gallery images per project.")
+    ap.add_argument("--threshold", type=float, default=25.0, help="Allowed slowdown vs history, in percent.")
+    ap.add_argument("--max-scaling", type=float, default=3.0, help="Allowed per-project time growth across sizes.")
+    ap.add_argument("--history", type=Path, default=HISTORY_PATH)
+    ap.add_argument("--no-record", action="store_true", help="Do not append this run to the history.")
+    ap.add_argument("--keep", action="store_true", help="Keep the generated corpora.")
+    return ap.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    sizes = [int(s) for s in args.sizes.split(",") if s.strip()]
+
+    run: Dict[str, Any] = {
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "commit": git_commit(),
+        "python": platform.python_version(),
+        "images": args.images,
+        "results": {},
+    }
+    for n in sizes:
+        print(f"\n=== {n} projects ===")
+        run["results"][str(n)] = bench_size(n, args.images, args.keep)
+
+    history: List[Dict[str, Any]] = []
+    if args.history.exists():
+        history = json.loads(args.history.read_text(encoding="utf-8"))
+
+    failures = check_regressions(run, history, args.threshold) + check_scaling(run, args.max_scaling)
+
+    if not args.no_record:
+        history.append(run)
+        args.history.write_text(json.dumps(history, indent=2) + "\n", encoding="utf-8")
+        print(f"\nRecorded run in {args.history}")
+
+    if failures:
+        print("\n[ERROR] Benchmark regressions:")
+        for f in failures:
+            print(f"  {f}")
+        sys.exit(1)
+    print("\nBenchmarks OK.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,480 @@
+"""
+Deploy client: upload only what changed, over parallel connections, resumably.
+
+The deploy is driven by content manifests ({path: sha256[:16]}):
+- the local manifest is built from the source tree (dist/ from assemble_dist.py, or
+  topdotSite/ by default, skipping what never ships: tools/, data/sheets/, data/_* build state, dotfiles other than .htaccess,
+  .DS_Store, *.zip, Obsolete/ folders)
+- the remote manifest (REMOTE_MANIFEST at the target root) records what the last deploy put
+  there. Files the site does not manage (e.g. the host's wordfence-waf.php, .user.ini) are
+  never in it, so they are never touched.
+
+Plan, in order:
+1. assets: everything not listed below (images, CSS, JS, ...)
+2. details: data/<dir>/** (project and blog detail JSON, pointing at assets)
+3. listings: data/* (projects.json, shards' index files, PHP mirrors, pointing at details)
+4. pages: *.html, *.php, partials/, sw.js, .htaccess, robots.txt, sitemap.xml
+5. deletes: remote files that left the manifest (nothing references them any more)
+6. the remote manifest itself
+Each phase finishes before the next one starts, so a page never points at an asset that has
+not landed yet. Uploads go to a temporary name and are renamed into place.
+
+Work is spread over --connections connections (one per worker thread). Every finished
+upload/delete is journaled in data/_deploy-state.json (per target); an interrupted deploy
+rerun against the same target skips what already landed. The journal is cleared once the
+remote manifest is written. --force uploads every file whatever the manifest and journal say;
+the remote manifest is still read so files that left the site are deleted.
+
+Targets:
+  /some/dir or file:///some/dir       local directory (loopback; for testing the whole flow offline)
+  ftp://user@host[:port]/path         FTP (password from TOPDOT_DEPLOY_PASSWORD)
+  ftps://user@host[:port]/path        FTP over explicit TLS
+
+Run:
+  python topdotSite/tools/deploy/deploy_site.py --target TARGET [--source dist] [--connections 4]
+      [--dry-run] [--force]
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import fnmatch
+import ftplib
+import hashlib
+import io
+import json
+import os
+import posixpath
+import shutil
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional, Set
+from urllib.parse import unquote, urlsplit
+
+
+SITE_ROOT = Path(__file__).resolve().parents[2]
+STATE_PATH = SITE_ROOT / "data" / "_deploy-state.json"
+
+REMOTE_MANIFEST = ".deploy-manifest.json"
+TMP_SUFFIX = ".deploy-tmp"
+PASSWORD_ENV = "TOPDOT_DEPLOY_PASSWORD"
+
+SKIP_DIRS = {"tools", "Obsolete", "__pycache__"}
+SKIP_PATHS = {"data/sheets", "content"}
+SKIP_PATTERNS = ("*.zip", ".DS_Store", "data/_*")
+KEEP_DOTFILES = {".htaccess"}
+
+PAGE_PATTERNS = ("*.html", "*.htm", "*.php", "partials/*", "sw.js", ".htaccess", "robots.txt", "sitemap.xml")
+PHASES = ("assets", "details", "listings", "pages")
+
+TRANSPORT_ERRORS = (OSError, EOFError, ftplib.Error)
+RETRIES = 3
+JOURNAL_EVERY = 25
+
+
+def file_hash(path: Path) -> str:
+    """Content hash of a file (same 16-hex form as the build manifest)."""
+    h = hashlib.sha256()
+    with path.open("rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()[:16]
+
+
+def is_shipped(rel: str) -> bool:
+    parts = rel.split("/")
+    if any(p in SKIP_DIRS for p in parts[:-1]):
+        return False
+    if any(rel == p or rel.startswith(p + "/") for p in SKIP_PATHS):
+        return False
+    if any(p.startswith(".") and p not in KEEP_DOTFILES for p in parts):
+        return False
+    return not any(fnmatch.fnmatch(rel, pat) or fnmatch.fnmatch(parts[-1], pat) for pat in SKIP_PATTERNS)
+
+
+def build_manifest(source: Path) -> Dict[str, str]:
+    """{relative path: content hash} for every file that ships."""
+    manifest: Dict[str, str] = {}
+    for dirpath, dirnames, filenames in os.walk(source):
+        rel_dir = Path(dirpath).relative_to(source).as_posix()
+        rel_dir = "" if rel_dir == "." else rel_dir + "/"
+        dirnames[:] = sorted(d for d in dirnames if is_shipped(f"{rel_dir}{d}/x"))
+        for name in sorted(filenames):
+            rel = rel_dir + name
+            if is_shipped(rel):
+                manifest[rel] = file_hash(Path(dirpath) / name)
+    return manifest
+
+
+def phase_of(rel: str) -> str:
+    if rel.startswith("data/"):
+        return "details" if rel.count("/") > 1 else "listings"
+    if any(fnmatch.fnmatch(rel, pat) for pat in PAGE_PATTERNS):
+        return "pages"
+    return "assets"
+
+
+# --- transports ---
+
+
+class Connection:
+    """One connection to the target. Paths are relative to the target root, '/'-separated."""
+
+    def put(self, local: Path, remote: str) -> None:
+        raise NotImplementedError
+
+    def delete(self, remote: str) -> None:
+        raise NotImplementedError
+
+    def read(self, remote: str) -> Optional[bytes]:
+        raise NotImplementedError
+
+    def write(self, remote: str, data: bytes) -> None:
+        raise NotImplementedError
+
+    def close(self) -> None:
+        pass
+
+
+class LocalConnection(Connection):
+    def __init__(self, root: Path) -> None:
+        self.root = root
+
+    def put(self, local: Path, remote: str) -> None:
+        dest = self.root / remote
+        dest.parent.mkdir(parents=True, exist_ok=True)
+        tmp = dest.with_name(dest.name + TMP_SUFFIX)
+        shutil.copyfile(local, tmp)
+        os.replace(tmp, dest)
+
+    def delete(self, remote: str) -> None:
+        path = self.root / remote
+        path.unlink(missing_ok=True)
+        # Drop directories the delete left empty (never the root).
+        parent = path.parent
+        while parent != self.root and parent.is_dir() and not any(parent.iterdir()):
+            parent.rmdir()
+            parent = parent.parent
+
+    def read(self, remote: str) -> Optional[bytes]:
+        path = self.root / remote
+        return path.read_bytes() if path.is_file() else None
+
+    def write(self, remote: str, data: bytes) -> None:
+        dest = self.root / remote
+        dest.parent.mkdir(parents=True, exist_ok=True)
+        tmp = dest.with_name(dest.name + TMP_SUFFIX)
+        tmp.write_bytes(data)
+        os.replace(tmp, dest)
+
+
+class FtpConnection(Connection):
+    def __init__(self, host: str, port: int, user: str, password: str, root: str, tls: bool) -> None:
+        self.ftp = ftplib.FTP_TLS() if tls else ftplib.FTP()
+        self.ftp.connect(host, port, timeout=60)
+        self.ftp.login(user, password)
+        if tls:
+            self.ftp.prot_p()
+        self.root = root.rstrip("/") or "/"
+        self.dirs: Set[str] = set()
+
+    def _path(self, remote: str) -> str:
+        return posixpath.join(self.root, remote)
+
+    def _mkdirs(self, remote_dir: str) -> None:
+        path = self.root
+        for part in [p for p in remote_dir.split("/") if p]:
+            path = posixpath.join(path, part)
+            if path in self.dirs:
+                continue
+            try:
+                self.ftp.mkd(path)
+            except ftplib.error_perm:
+                pass  # Already exists.
+            self.dirs.add(path)
+
+    def _store(self, remote: str, f: io.BufferedIOBase) -> None:
+        self._mkdirs(posixpath.dirname(remote))
+        tmp = self._path(remote + TMP_SUFFIX)
+        self.ftp.storbinary(f"STOR {tmp}", f)
+        self.ftp.rename(tmp, self._path(remote))
+
+    def put(self, local: Path, remote: str) -> None:
+        with local.open("rb") as f:
+            self._store(remote, f)
+
+    def delete(self, remote: str) -> None:
+        try:
+            self.ftp.delete(self._path(remote))
+        except ftplib.error_perm as e:
+            if not str(e).startswith("550"):  # 550: already gone.
+                raise
+
+    def read(self, remote: str) -> Optional[bytes]:
+        buf = io.BytesIO()
+        try:
+            self.ftp.retrbinary(f"RETR {self._path(remote)}", buf.write)
+        except ftplib.error_perm as e:
+            if str(e).startswith("550"):
+                return None
+            raise
+        return buf.getvalue()
+
+    def write(self, remote: str, data: bytes) -> None:
+        self._store(remote, io.BytesIO(data))
+
+    def close(self) -> None:
+        try:
+            self.ftp.quit()
+        except (OSError, ftplib.Error):
+            self.ftp.close()
+
+
+def make_connector(target: str) -> Callable[[], Connection]:
+    """A factory for connections to the target (one per worker)."""
+    u = urlsplit(target)
+    if u.scheme in ("ftp", "ftps"):
+        password = os.environ.get(PASSWORD_ENV, "")
+        if not password:
+            print(f"[ERROR] Set {PASSWORD_ENV} for FTP targets.")
+            sys.exit(1)
+        host, port, user = u.hostname or "", u.port or 21, unquote(u.username or "anonymous")
+        root, tls = unquote(u.path) or "/", u.scheme == "ftps"
+        return lambda: FtpConnection(host, port, user, password, root, tls)
+
+    root = Path(unquote(u.path) if u.scheme == "file" else target).resolve()
+    root.mkdir(parents=True, exist_ok=True)
+    return lambda: LocalConnection(root)
+
+
+def target_key(target: str) -> str:
+    """Normalized target, so the journal matches however the target is spelled."""
+    u = urlsplit(target)
+    if u.scheme in ("ftp", "ftps"):
+        return f"{u.scheme}://{u.username or 'anonymous'}@{u.hostname}:{u.port or 21}{u.path or '/'}"
+    return (Path(unquote(u.path)) if u.scheme == "file" else Path(target)).resolve().as_uri()
+
+
+# --- plan and run ---
+
+
+@dataclass
+class Plan:
+    uploads: Dict[str, List[str]] = field(default_factory=lambda: {p: [] for p in PHASES})
+    deletes: List[str] = field(default_factory=list)
+    skipped: int = 0
+
+    def count(self) -> int:
+        return sum(len(v) for v in self.uploads.values()) + len(self.deletes)
+
+
+def make_plan(
+    local: Dict[str, str], remote: Dict[str, str], journal: Dict[str, Optional[str]], force: bool = False
+) -> Plan:
+    """
+    Uploads per phase and deletes; entries already journaled for this content are skipped.
+    With force every local file is uploaded, but deletes still come from the remote manifest.
+    """
+    plan = Plan()
+    for rel, digest in local.items():
+        if not force and (remote.get(rel) == digest or journal.get(rel) == digest):
+            plan.skipped += 1
+            continue
+        plan.uploads[phase_of(rel)].append(rel)
+    for rel in sorted(set(remote) - set(local)):
+        if rel in journal and journal[rel] is None:
+            plan.skipped += 1
+            continue
+        plan.deletes.append(rel)
+    return plan
+
+
+class Deployer:
+    """Runs a plan over a pool of connections and journals progress."""
+
+    def __init__(self, connect: Callable[[], Connection], source: Path, target: str, connections: int) -> None:
+        self.connect = connect
+        self.source = source
+        self.target = target
+        self.workers = max(1, connections)
+        self.local = threading.local()
+        self.opened: List[Connection] = []
+        self.lock = threading.Lock()
+        self.state = load_state()
+        self.journal: Dict[str, Optional[str]] = self.state.setdefault(target, {})
+        self.since_save = 0
+
+    def conn(self) -> Connection:
+        c = getattr(self.local, "conn", None)
+        if c is None:
+            c = self.connect()
+            self.local.conn = c
+            with self.lock:
+                self.opened.append(c)
+        return c
+
+    def reset_conn(self) -> None:
+        c = getattr(self.local, "conn", None)
+        if c is not None:
+            self.local.conn = None
+            with contextlib.suppress(*TRANSPORT_ERRORS):
+                c.close()
+
+    def retry(self, fn: Callable[[Connection], None]) -> None:
+        for attempt in range(1, RETRIES + 1):
+            try:
+                fn(self.conn())
+                return
+            except TRANSPORT_ERRORS:
+                self.reset_conn()
+                if attempt == RETRIES:
+                    raise
+                time.sleep(attempt)
+
+    def record(self, rel: str, digest: Optional[str]) -> None:
+        with self.lock:
+            self.journal[rel] = digest
+            self.since_save += 1
+            if self.since_save >= JOURNAL_EVERY:
+                save_state(self.state)
+                self.since_save = 0
+
+    def run_batch(self, label: str, items: List[str], job: Callable[[str], None]) -> None:
+        if not items:
+            return
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            futures = {pool.submit(job, rel): rel for rel in items}
+            for fut in as_completed(futures):
+                fut.result()
+        print(f"  {label}: {len(items)} files ({time.perf_counter() - started:.1f} s)")
+
+    def upload(self, rel: str, digest: str) -> None:
+        self.retry(lambda c: c.put(self.source / rel, rel))
+        self.record(rel, digest)
+
+    def delete(self, rel: str) -> None:
+        self.retry(lambda c: c.delete(rel))
+        self.record(rel, None)
+
+    def run(self, plan: Plan, local: Dict[str, str]) -> None:
+        try:
+            for phase in PHASES:
+                self.run_batch(f"upload {phase}", plan.uploads[phase], lambda rel: self.upload(rel, local[rel]))
+            self.run_batch("delete orphans", plan.deletes, self.delete)
+            data = (json.dumps(local, indent=2, sort_keys=True) + "\n").encode("utf-8")
+            self.retry(lambda c: c.write(REMOTE_MANIFEST, data))
+            self.state.pop(self.target, None)
+        finally:
+            save_state(self.state)
+            for c in self.opened:
+                with contextlib.suppress(*TRANSPORT_ERRORS):
+                    c.close()
+
+
+def load_state() -> Dict[str, Dict[str, Optional[str]]]:
+    if STATE_PATH.exists():
+        try:
+            return json.loads(STATE_PATH.read_text(encoding="utf-8"))
+        except ValueError:
+            print(f"[WARN] {STATE_PATH.name} unreadable; starting without a journal")
+    return {}
+
+
+def save_state(state: Dict[str, Dict[str, Optional[str]]]) -> None:
+    if not state:
+        STATE_PATH.unlink(missing_ok=True)
+        return
+    tmp = STATE_PATH.with_name(STATE_PATH.name + ".tmp")
+    tmp.write_text(json.dumps(state, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+    os.replace(tmp, STATE_PATH)
+
+
+def read_remote_manifest(connect: Callable[[], Connection]) -> Dict[str, str]:
+    c = connect()
+    try:
+        raw = c.read(REMOTE_MANIFEST)
+    finally:
+        c.close()
+    if raw is None:
+        return {}
+    try:
+        return json.loads(raw)
+    except ValueError:
+        print(f"[WARN] Remote {REMOTE_MANIFEST} unreadable; treating the target as empty")
+        return {}
+
+
+def iter_plan_lines(plan: Plan) -> Iterator[str]:
+    for phase in PHASES:
+        for rel in plan.uploads[phase]:
+            yield f"  + [{phase}] {rel}"
+    for rel in plan.deletes:
+        yield f"  - {rel}"
+
+
+def parse_args() -> argparse.Namespace:
+    ap = argparse.ArgumentParser(description="Upload changed files to the host, resumably.")
+    ap.add_argument("--target", required=True, help="Directory, file://DIR, ftp://user@host/path or ftps://...")
+    ap.add_argument("--source", type=Path, default=SITE_ROOT, help="Tree to deploy (default: topdotSite/).")
+    ap.add_argument("--connections", type=int, default=4, help="Parallel connections.")
+    ap.add_argument("--dry-run", action="store_true", help="Print the plan; transfer nothing.")
+    ap.add_argument("--force", action="store_true", help="Upload everything (remote files that left the site are still deleted).")
+    return ap.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    source = args.source.resolve()
+    if not source.is_dir():
+        print(f"Error: {source} not found")
+        sys.exit(1)
+
+    connect = make_connector(args.target)
+    started = time.perf_counter()
+    local = build_manifest(source)
+    # Read even with --force: it is the only record of what to delete on the target.
+    remote = read_remote_manifest(connect)
+    deployer = Deployer(connect, source, target_key(args.target), args.connections)
+    if args.force:
+        deployer.journal.clear()
+    elif deployer.journal:
+        print(f"Resuming: {len(deployer.journal)} operations already done on this target")
+
+    plan = make_plan(local, remote, deployer.journal, args.force)
+    print(
+        f"Local: {len(local)} files ({time.perf_counter() - started:.1f} s to hash), remote manifest: {len(remote)} files"
+    )
+    print(
+        "Plan: "
+        + ", ".join(f"{len(plan.uploads[p])} {p}" for p in PHASES)
+        + f", {len(plan.deletes)} deletes, {plan.skipped} unchanged"
+    )
+
+    if args.dry_run:
+        for line in iter_plan_lines(plan):
+            print(line)
+        print("\nDry run: nothing transferred.")
+        return
+    if not plan.count() and remote == local:
+        print("\nTarget is up to date.")
+        return
+
+    try:
+        deployer.run(plan, local)
+    except KeyboardInterrupt:
+        print("\n[WARN] Interrupted; rerun the same command to resume.")
+        sys.exit(130)
+    except TRANSPORT_ERRORS as e:
+        print(f"\n[ERROR] Deploy failed: {e}; rerun the same command to resume.")
+        sys.exit(1)
+    print(f"\nDeploy complete ({time.perf_counter() - started:.1f} s).")
+
+
+if __name__ == "__main__":
+    main()
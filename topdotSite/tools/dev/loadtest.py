@@ -0,0 +1,383 @@
+"""
+Navigation replay load test: what a visitor pays for a typical journey.
+
+Replays scripted journeys against a running server (tools/dev/serve_site.py or a staging host):
+  index -> projects -> project detail -> gallery lightbox -> blog post
+Journeys are planned from data/projects.json and data/blog.json (random project/post per
+journey, seeded). Each step fetches the page, then the same-origin CSS/JS/images it references
+and the data the page script would load (detail JSON, hero, first gallery images, lightbox image
+or tile preview). Every virtual user has its own keep-alive connections (6, like a browser) and
+cache: files already fetched in the journey are not fetched again unless they were sent no-store.
+
+Reports, per page type: steps, requests, bytes transferred, and p50/p99 of step latency (page
+plus its subresources) and request latency. --save writes the results as JSON; --compare prints
+deltas against a saved run and exits 1 when p99 latency or bytes regress beyond --threshold.
+
+Run:
+  python topdotSite/tools/dev/serve_site.py --port 8000 &
+  python topdotSite/tools/dev/loadtest.py [--base-url http://127.0.0.1:8000/] [--users 10] [--journeys 50]
+      [--seed 1] [--save results.json] [--compare baseline.json] [--threshold 10]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import random
+import re
+import sys
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Set, Tuple
+from urllib.parse import urljoin, urlsplit
+
+
+SITE_ROOT = Path(__file__).resolve().parents[2]
+DATA_DIR = SITE_ROOT / "data"
+PROJECTS_JSON = DATA_DIR / "projects.json"
+PROJECTS_DIR = DATA_DIR / "projects"
+BLOG_JSON = DATA_DIR / "blog.json"
+BLOG_DIR = DATA_DIR / "blog"
+
+PAGE_TYPES = ("index", "projects", "project", "lightbox", "blog-post")
+CONNECTIONS_PER_USER = 6
+GALLERY_IMAGES_PER_VISIT = 6
+CARD_IMAGES_PER_VISIT = 12
+
+_SUBRESOURCE_RE = re.compile(
+    r"""<(?:link\b[^>]*?\brel=["']stylesheet["'][^>]*?\bhref|script\b[^>]*?\bsrc|img\b[^>]*?\bsrc)=["']([^"'#]+)["']""",
+    re.I,
+)
+_CSS_IMPORT_RE = re.compile(r"""@import\s+url\(\s*["']?([^"')]+)["']?\s*\)""", re.I)
+
+
+@dataclass
+class Fetch:
+    url: str
+    status: int
+    nbytes: int
+    elapsed: float
+    no_store: bool
+    body: bytes = b""
+
+
+@dataclass
+class Step:
+    page_type: str
+    elapsed: float = 0.0
+    fetches: List[Fetch] = field(default_factory=list)
+
+
+class Connection:
+    """One keep-alive HTTP/1.1 connection."""
+
+    def __init__(self, host: str, port: int) -> None:
+        self.host, self.port = host, port
+        self.reader: Optional[asyncio.StreamReader] = None
+        self.writer: Optional[asyncio.StreamWriter] = None
+
+    async def request(self, path: str) -> Tuple[int, Dict[str, str], bytes]:
+        for attempt in (1, 2):  # Reconnect once if the server closed an idle connection.
+            if self.writer is None:
+                self.reader, self.writer = await asyncio.open_connection(self.host, self.port)
+            try:
+                return await self._exchange(path)
+            except (asyncio.IncompleteReadError, ConnectionError):
+                self.close()
+                if attempt == 2:
+                    raise
+        raise RuntimeError("unreachable")
+
+    async def _exchange(self, path: str) -> Tuple[int, Dict[str, str], bytes]:
+        assert self.reader and self.writer
+        self.writer.write(
+            f"GET {path} HTTP/1.1\r\nHost: {self.host}:{self.port}\r\n"
+            f"Accept-Encoding: br, gzip\r\nConnection: keep-alive\r\n\r\n".encode("latin-1")
+        )
+        await self.writer.drain()
+        head = (await self.reader.readuntil(b"\r\n\r\n")).decode("latin-1").split("\r\n")
+        status = int(head[0].split()[1])
+        headers: Dict[str, str] = {}
+        for line in head[1:]:
+            name, sep, value = line.partition(":")
+            if sep:
+                headers[name.strip().lower()] = value.strip()
+
+        if headers.get("transfer-encoding", "").lower() == "chunked":
+            chunks = []
+            while True:
+                size = int((await self.reader.readuntil(b"\r\n")).split(b";")[0], 16)
+                data = await self.reader.readexactly(size + 2)
+                if size == 0:
+                    break
+                chunks.append(data[:-2])
+            body = b"".join(chunks)
+        elif "content-length" in headers:
+            body = await self.reader.readexactly(int(headers["content-length"]))
+        else:
+            body = await self.reader.read()
+            self.close()
+        if headers.get("connection", "").lower() == "close":
+            self.close()
+        return status, headers, body
+
+    def close(self) -> None:
+        if self.writer is not None:
+            self.writer.close()
+        self.reader = self.writer = None
+
+
+class Visitor:
+    """A virtual user: a small connection pool and a per-journey cache."""
+
+    def __init__(self, base_url: str) -> None:
+        u = urlsplit(base_url)
+        self.base_url = base_url
+        self.origin = f"{u.scheme}://{u.netloc}"
+        self.pool: asyncio.Queue = asyncio.Queue()
+        for _ in range(CONNECTIONS_PER_USER):
+            self.pool.put_nowait(Connection(u.hostname or "127.0.0.1", u.port or 80))
+        self.cached: Set[str] = set()
+
+    def reset(self) -> None:
+        self.cached.clear()
+
+    async def fetch(self, url: str) -> Optional[Fetch]:
+        if url in self.cached:
+            return None
+        u = urlsplit(url)
+        path = u.path + (f"?{u.query}" if u.query else "")
+        conn = await self.pool.get()
+        try:
+            started = time.perf_counter()
+            try:
+                status, headers, body = await conn.request(path)
+            except (OSError, asyncio.IncompleteReadError, ValueError):
+                conn.close()
+                status, headers, body = 0, {}, b""
+            elapsed = time.perf_counter() - started
+        finally:
+            self.pool.put_nowait(conn)
+        no_store = "no-store" in headers.get("cache-control", "")
+        if status == 200 and not no_store:
+            self.cached.add(url)
+        return Fetch(url, status, len(body), elapsed, no_store, body)
+
+    async def fetch_all(self, urls: List[str]) -> List[Fetch]:
+        results = await asyncio.gather(*(self.fetch(u) for u in dict.fromkeys(urls)))
+        return [r for r in results if r is not None]
+
+    def same_origin(self, base: str, refs: List[str]) -> List[str]:
+        out = []
+        for ref in refs:
+            url = urljoin(base, ref)
+            if url.startswith(self.origin):
+                out.append(url)
+        return out
+
+    async def visit(self, page_type: str, page: str, extra: List[str]) -> Step:
+        """Fetch a page, its subresources (and CSS @imports), then the data its script loads."""
+        step = Step(page_type)
+        started = time.perf_counter()
+        url = urljoin(self.base_url, page)
+        first = await self.fetch(url)
+        if first:
+            step.fetches.append(first)
+            html = first.body.decode("utf-8", "replace")
+            subs = await self.fetch_all(self.same_origin(url, _SUBRESOURCE_RE.findall(html)))
+            step.fetches += subs
+            imports: List[str] = []
+            for f in subs:
+                if f.url.endswith(".css"):
+                    imports += self.same_origin(f.url, _CSS_IMPORT_RE.findall(f.body.decode("utf-8", "replace")))
+            step.fetches += await self.fetch_all(imports)
+        step.fetches += await self.fetch_all([urljoin(self.base_url, e) for e in extra])
+        step.elapsed = time.perf_counter() - started
+        return step
+
+
+def load_json(path: Path, default: Any) -> Any:
+    return json.loads(path.read_text(encoding="utf-8")) if path.exists() else default
+
+
+def plan_journey(rng: random.Random, projects: List[Dict[str, Any]], posts: List[Dict[str, Any]]) -> List[Tuple[str, str, List[str]]]:
+    """(page type, page URL, extra URLs the page script would fetch) for one journey."""
+    steps: List[Tuple[str, str, List[str]]] = [("index", "", [])]
+
+    cards = [p.get("thumbnail", "") for p in projects[:CARD_IMAGES_PER_VISIT] if p.get("thumbnail")]
+    steps.append(("projects", "projects.html", ["data/projects-facets.json"] + cards))
+
+    if projects:
+        pid = rng.choice(projects)["id"]
+        detail = load_json(PROJECTS_DIR / f"{pid}.json", {})
+        gallery = [g for g in detail.get("gallery", []) if isinstance(g, str)]
+        hero = [detail["featuredImage"]] if detail.get("featuredImage") else []
+        steps.append(("project", f"project.html?id={pid}", [f"data/projects/{pid}.json"] + hero + gallery[:GALLERY_IMAGES_PER_VISIT]))
+        if gallery:
+            pick = rng.choice(gallery)
+            tiles = ((detail.get("galleryMeta") or {}).get(pick) or {}).get("tiles") or {}
+            steps.append(("lightbox", "", [tiles.get("preview") or pick]))
+
+    if posts:
+        bid = rng.choice(posts)["id"]
+        post = load_json(BLOG_DIR / f"{bid}.json", {})
+        hero = [post["featuredImage"]] if post.get("featuredImage") else []
+        steps.append(("blog-post", f"blog-post.html?id={bid}", [f"data/blog/{bid}.json"] + hero))
+    return steps
+
+
+async def run_user(
+    base_url: str,
+    journeys: asyncio.Queue,
+    steps_out: List[Step],
+) -> None:
+    visitor = Visitor(base_url)
+    try:
+        while True:
+            try:
+                journey = journeys.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            visitor.reset()
+            for page_type, page, extra in journey:
+                if page_type == "lightbox":
+                    step = Step(page_type)
+                    started = time.perf_counter()
+                    step.fetches = await visitor.fetch_all([urljoin(base_url, e) for e in extra])
+                    step.elapsed = time.perf_counter() - started
+                else:
+                    step = await visitor.visit(page_type, page, extra)
+                steps_out.append(step)
+    finally:
+        while not visitor.pool.empty():
+            visitor.pool.get_nowait().close()
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """Nearest-rank percentile (0 for no values)."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, min(len(ordered), round(pct / 100 * len(ordered) + 0.5)))
+    return ordered[rank - 1]
+
+
+def summarize(steps: List[Step]) -> Dict[str, Dict[str, float]]:
+    out: Dict[str, Dict[str, float]] = {}
+    for page_type in PAGE_TYPES + ("total",):
+        chosen = steps if page_type == "total" else [s for s in steps if s.page_type == page_type]
+        if not chosen:
+            continue
+        fetches = [f for s in chosen for f in s.fetches]
+        step_ms = [s.elapsed * 1000 for s in chosen]
+        req_ms = [f.elapsed * 1000 for f in fetches]
+        out[page_type] = {
+            "steps": len(chosen),
+            "requests": len(fetches),
+            "errors": sum(1 for f in fetches if f.status == 0 or f.status >= 400),
+            "bytes": sum(f.nbytes for f in fetches),
+            "bytes_per_step": round(sum(f.nbytes for f in fetches) / len(chosen)),
+            "step_p50_ms": round(percentile(step_ms, 50), 2),
+            "step_p99_ms": round(percentile(step_ms, 99), 2),
+            "req_p50_ms": round(percentile(req_ms, 50), 2),
+            "req_p99_ms": round(percentile(req_ms, 99), 2),
+        }
+    return out
+
+
+def print_summary(summary: Dict[str, Dict[str, float]]) -> None:
+    print(f"{'page':<10} {'steps':>6} {'reqs':>6} {'err':>4} {'KB/step':>9} {'p50 ms':>8} {'p99 ms':>8} {'req p99':>8}")
+    for page_type, s in summary.items():
+        print(
+            f"{page_type:<10} {s['steps']:>6} {s['requests']:>6} {s['errors']:>4} "
+            f"{s['bytes_per_step'] / 1024:>9.1f} {s['step_p50_ms']:>8.1f} {s['step_p99_ms']:>8.1f} {s['req_p99_ms']:>8.1f}"
+        )
+
+
+def compare(summary: Dict[str, Dict[str, float]], baseline: Dict[str, Dict[str, float]], threshold: float) -> List[str]:
+    """Print deltas against a saved run; return the regressions beyond threshold (%)."""
+    regressions = []
+    print(f"\nCompared with baseline (threshold {threshold:g}%):")
+    print(f"{'page':<10} {'KB/step':>16} {'p50 ms':>16} {'p99 ms':>16}")
+    for page_type, s in summary.items():
+        b = baseline.get(page_type)
+        if not b:
+            continue
+        cells = []
+        for key in ("bytes_per_step", "step_p50_ms", "step_p99_ms"):
+            old, new = b.get(key, 0), s[key]
+            delta = (new - old) / old * 100 if old else 0.0
+            scale = 1024 if key == "bytes_per_step" else 1
+            cells.append(f"{new / scale:>8.1f} ({delta:+5.1f}%)")
+            if key in {"bytes_per_step", "step_p99_ms"} and delta > threshold:
+                regressions.append(f"{page_type}: {key} {old} -> {new} ({delta:+.1f}%)")
+        print(f"{page_type:<10} " + " ".join(cells))
+    return regressions
+
+
+def parse_args() -> argparse.Namespace:
+    ap = argparse.ArgumentParser(description="Replay visitor journeys against a local server.")
+    ap.add_argument("--base-url", default="http://127.0.0.1:8000/")
+    ap.add_argument("--users", type=int, default=10, help="Concurrent virtual users.")
+    ap.add_argument("--journeys", type=int, default=50, help="Total journeys to replay.")
+    ap.add_argument("--seed", type=int, default=1)
+    ap.add_argument("--save", type=Path, help="Write results JSON here.")
+    ap.add_argument("--compare", type=Path, help="Baseline results JSON to compare with.")
+    ap.add_argument("--threshold", type=float, default=10.0, help="Regression threshold in percent.")
+    return ap.parse_args()
+
+
+async def main_async(args: argparse.Namespace) -> Dict[str, Dict[str, float]]:
+    base_url = args.base_url if args.base_url.endswith("/") else args.base_url + "/"
+    projects = load_json(PROJECTS_JSON, [])
+    posts = load_json(BLOG_JSON, [])
+
+    rng = random.Random(args.seed)
+    journeys: asyncio.Queue = asyncio.Queue()
+    for _ in range(args.journeys):
+        journeys.put_nowait(plan_journey(rng, projects, posts))
+
+    # Fetch errors during the run only count as failed requests, so check the server is up first.
+    u = urlsplit(base_url)
+    probe = Connection(u.hostname or "127.0.0.1", u.port or 80)
+    try:
+        await probe.request(u.path or "/")
+    except asyncio.IncompleteReadError as e:
+        raise ConnectionError("connection closed without a response") from e
+    finally:
+        probe.close()
+
+    steps: List[Step] = []
+    started = time.perf_counter()
+    await asyncio.gather(*(run_user(base_url, journeys, steps) for _ in range(max(1, args.users))))
+    print(f"{args.journeys} journeys, {args.users} users, {time.perf_counter() - started:.2f} s against {base_url}\n")
+    return summarize(steps)
+
+
+def main() -> None:
+    args = parse_args()
+    try:
+        summary = asyncio.run(main_async(args))
+    except OSError as e:
+        print(f"Error: cannot reach {args.base_url} ({e})")
+        sys.exit(1)
+    print_summary(summary)
+
+    if args.save:
+        args.save.write_text(json.dumps({"args": {"users": args.users, "journeys": args.journeys, "seed": args.seed}, "summary": summary}, indent=2) + "\n", encoding="utf-8")
+        print(f"\nSaved: {args.save}")
+
+    if args.compare:
+        baseline = json.loads(args.compare.read_text(encoding="utf-8")).get("summary", {})
+        regressions = compare(summary, baseline, args.threshold)
+        if regressions:
+            print("\n[ERROR] Regressions:")
+            for r in regressions:
+                print(f"  {r}")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
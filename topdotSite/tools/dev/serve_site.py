@@ -0,0 +1,388 @@
+"""
+Local dev server for topdotSite/ that emulates the production .htaccess.
+
+Production behaviour lives in .htaccess, so plain static servers give misleading results.
+This server reproduces it:
+- extensionless URLs: /projects -> projects.html (when that file exists), trailing slash ignored
+- .html/.htm/.php are run through PHP: php-cgi when it is on PATH, otherwise a built-in
+  emulation that expands `include`/`require` of partials/*.php (relative to the including
+  file, like __DIR__) and drops any other PHP code, `<?= ... ?>` echoes included
+  (server-rendered grids then stay empty and the page JS falls back to fetching JSON)
+- Cache-Control: no-store (+ Pragma: no-cache) on .html/.css, no-cache on sw.js
+- .user.ini and dotfiles are denied
+
+On top of that it serves what the pipeline produces the way a tuned host would:
+- precompressed sidecars: <file>.br / <file>.gz are sent (Content-Encoding, Vary) when the
+  client accepts them and the sidecar exists
+- content-hashed filenames (name.<8+ hex>.ext) get Cache-Control: public, max-age=31536000, immutable
+- ETag / Last-Modified and 304 responses for static files
+
+Every request is logged with status, latency, bytes sent, Cache-Control and how it was served.
+
+Run:
+  python topdotSite/tools/dev/serve_site.py [--host 127.0.0.1] [--port 8000] [--no-php]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import email.utils
+import mimetypes
+import os
+import re
+import shutil
+import sys
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import unquote, urlsplit
+
+
+SITE_ROOT = Path(__file__).resolve().parents[2]
+
+PHP_EXTENSIONS = {".html", ".htm", ".php"}
+NO_STORE_EXTENSIONS = {".html", ".css"}
+NO_CACHE_FILES = {"sw.js"}
+DENIED_NAMES = {".user.ini", ".htaccess"}
+
+HASHED_NAME_RE = re.compile(r"\.[0-9a-f]{8,}\.[A-Za-z0-9]+$")
+# Sidecars in preference order (token in Accept-Encoding, file suffix).
+SIDECARS = (("br", ".br"), ("gzip", ".gz"))
+
+# <?php ... ?> blocks and <?= ... ?> echoes (an echo never includes anything, so it becomes "").
+# Like PHP, a newline right after ?> is dropped with the block.
+_PHP_BLOCK_RE = re.compile(r"<\?(php|=)(.*?)(?:\?>\n?|\Z)", re.S)
+_PHP_INCLUDE_RE = re.compile(
+    r"""\b(?:include|require)(?:_once)?\s*\(?\s*(__DIR__|\$__dir)\s*\.\s*["'](/[^"']+\.php)["']"""
+)
+
+mimetypes.add_type("application/json", ".json")
+mimetypes.add_type("image/webp", ".webp")
+mimetypes.add_type("image/svg+xml", ".svg")
+mimetypes.add_type("application/xml", ".dzi")
+mimetypes.add_type("text/javascript", ".js")
+
+STATUS_TEXT = {
+    200: "OK",
+    304: "Not Modified",
+    400: "Bad Request",
+    403: "Forbidden",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    500: "Internal Server Error",
+    501: "Not Implemented",
+}
+
+
+@dataclass
+class Request:
+    method: str
+    target: str
+    path: str
+    query: str
+    headers: Dict[str, str]
+    body: bytes = b""
+
+
+@dataclass
+class Response:
+    status: int = 200
+    headers: List[Tuple[str, str]] = field(default_factory=list)
+    body: bytes = b""
+    via: str = "-"
+
+    def header(self, name: str) -> str:
+        for k, v in self.headers:
+            if k.lower() == name.lower():
+                return v
+        return ""
+
+
+def resolve_path(url_path: str) -> Tuple[Optional[Path], str]:
+    """
+    Map a URL path to a file under SITE_ROOT, applying the .htaccess rewrite.
+
+    Returns (path, script_name) or (None, "") if nothing matches.
+    """
+    rel = unquote(url_path).lstrip("/")
+    if any(part in {"..", ""} for part in rel.split("/")[:-1]):
+        return None, ""
+    candidate = (SITE_ROOT / rel).resolve()
+    if SITE_ROOT not in candidate.parents and candidate != SITE_ROOT:
+        return None, ""
+
+    if candidate.is_dir():
+        index = candidate / "index.html"
+        if index.is_file():
+            return index, "/" + index.relative_to(SITE_ROOT).as_posix()
+    if candidate.is_file():
+        return candidate, "/" + rel
+
+    # RewriteCond %{REQUEST_FILENAME}.html -f / RewriteRule ^(.+?)/?$ $1.html
+    stripped = rel.rstrip("/")
+    if stripped:
+        html = SITE_ROOT / f"{stripped}.html"
+        if html.is_file():
+            return html, f"/{stripped}.html"
+    return None, ""
+
+
+def is_denied(path: Path) -> bool:
+    return path.name in DENIED_NAMES or any(
+        part.startswith(".") for part in path.relative_to(SITE_ROOT).parts
+    )
+
+
+def cache_headers(path: Path) -> List[Tuple[str, str]]:
+    """Cache-Control as production sends it (plus immutable for hashed filenames)."""
+    if path.suffix.lower() in NO_STORE_EXTENSIONS:
+        return [("Cache-Control", "no-store, no-cache, must-revalidate, max-age=0"), ("Pragma", "no-cache")]
+    if path.name in NO_CACHE_FILES:
+        return [("Cache-Control", "no-cache")]
+    if HASHED_NAME_RE.search(path.name):
+        return [("Cache-Control", "public, max-age=31536000, immutable")]
+    return []
+
+
+def content_type(path: Path) -> str:
+    ctype = mimetypes.guess_type(path.name)[0] or "application/octet-stream"
+    if ctype.startswith("text/") or ctype in {"application/json", "application/xml", "image/svg+xml"}:
+        ctype += "; charset=utf-8"
+    return ctype
+
+
+def pick_sidecar(path: Path, accept_encoding: str) -> Tuple[Path, str]:
+    """Return (file to send, content-encoding or "")."""
+    accepted = {t.split(";")[0].strip().lower() for t in accept_encoding.split(",")}
+    for token, suffix in SIDECARS:
+        sidecar = path.with_name(path.name + suffix)
+        if token in accepted and sidecar.is_file():
+            return sidecar, token
+    return path, ""
+
+
+def serve_static(req: Request, path: Path) -> Response:
+    has_sidecars = any(path.with_name(path.name + s).is_file() for _, s in SIDECARS)
+    send, encoding = pick_sidecar(path, req.headers.get("accept-encoding", ""))
+    st = send.stat()
+    etag = f'"{st.st_size:x}-{st.st_mtime_ns:x}{"-" + encoding if encoding else ""}"'
+    last_modified = email.utils.formatdate(st.st_mtime, usegmt=True)
+
+    headers = [("Content-Type", content_type(path)), ("ETag", etag), ("Last-Modified", last_modified)]
+    headers += cache_headers(path)
+    if encoding:
+        headers.append(("Content-Encoding", encoding))
+    if has_sidecars:
+        headers.append(("Vary", "Accept-Encoding"))
+
+    via = f"static+{encoding}" if encoding else "static"
+    if req.headers.get("if-none-match") == etag:
+        return Response(304, headers, b"", via)
+    return Response(200, headers, send.read_bytes(), via)
+
+
+def include_target(path: Path, base: str, inc: str) -> Optional[Path]:
+    """
+    The file an include in path refers to. __DIR__ is path's directory; the pages' $__dir
+    starts there and walks up until the partial exists. None if it is missing or outside the site.
+    """
+    directory = path.parent
+    while True:
+        target = (directory / inc.lstrip("/")).resolve()
+        if target.is_file() or base == "__DIR__" or directory == SITE_ROOT or directory.parent == directory:
+            break
+        directory = directory.parent
+    if not target.is_file() or SITE_ROOT not in target.parents:
+        return None
+    return target
+
+
+def emulate_php(path: Path, seen: Optional[set] = None) -> str:
+    """Expand partial includes; drop any other PHP code."""
+    seen = seen if seen is not None else set()
+    text = path.read_text(encoding="utf-8", errors="replace")
+
+    def expand(m: re.Match) -> str:
+        if m.group(1) == "=":
+            return ""
+        out = []
+        for base, inc in _PHP_INCLUDE_RE.findall(m.group(2)):
+            target = include_target(path, base, inc)
+            if target is not None and target not in seen:
+                if "require_once" in m.group(2) or "include_once" in m.group(2):
+                    seen.add(target)
+                out.append(emulate_php(target, seen))
+        return "".join(out)
+
+    return _PHP_BLOCK_RE.sub(expand, text)
+
+
+async def run_php_cgi(php_cgi: str, req: Request, path: Path, script_name: str) -> Response:
+    """Run a script through php-cgi and translate its CGI response."""
+    env = {
+        "PATH": os.environ.get("PATH", ""),
+        "GATEWAY_INTERFACE": "CGI/1.1",
+        "SERVER_PROTOCOL": "HTTP/1.1",
+        "SERVER_SOFTWARE": "topdot-dev",
+        "SERVER_NAME": req.headers.get("host", "localhost").split(":")[0],
+        "REQUEST_METHOD": req.method,
+        "REQUEST_URI": req.target,
+        "QUERY_STRING": req.query,
+        "SCRIPT_NAME": script_name,
+        "SCRIPT_FILENAME": str(path),
+        "DOCUMENT_ROOT": str(SITE_ROOT),
+        "REDIRECT_STATUS": "200",
+        "CONTENT_LENGTH": str(len(req.body)),
+        "CONTENT_TYPE": req.headers.get("content-type", ""),
+    }
+    for k, v in req.headers.items():
+        env["HTTP_" + k.upper().replace("-", "_")] = v
+
+    proc = await asyncio.create_subprocess_exec(
+        php_cgi,
+        "-d", "cgi.force_redirect=0",
+        stdin=asyncio.subprocess.PIPE,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+        env=env,
+        cwd=str(path.parent),
+    )
+    out, err = await proc.communicate(req.body)
+    if err:
+        print(f"  [php] {err.decode('utf-8', 'replace').strip()}", file=sys.stderr)
+
+    head, _, body = out.partition(b"\r\n\r\n")
+    if not _:
+        head, _, body = out.partition(b"\n\n")
+    status = 200
+    headers: List[Tuple[str, str]] = []
+    for line in head.decode("latin-1").splitlines():
+        name, _, value = line.partition(":")
+        if name.lower() == "status":
+            status = int(value.strip().split()[0])
+        elif name:
+            headers.append((name.strip(), value.strip()))
+    if not any(k.lower() == "content-type" for k, _ in headers):
+        headers.append(("Content-Type", "text/html; charset=utf-8"))
+    return Response(status, headers + cache_headers(path), body, "php-cgi")
+
+
+async def handle(req: Request, php_cgi: Optional[str]) -> Response:
+    if req.method not in {"GET", "HEAD", "POST"}:
+        return Response(405, [("Allow", "GET, HEAD, POST")], b"Method Not Allowed\n")
+
+    path, script_name = resolve_path(req.path)
+    if path is None:
+        return Response(404, [("Content-Type", "text/plain; charset=utf-8")], b"Not Found\n")
+    if is_denied(path):
+        return Response(403, [("Content-Type", "text/plain; charset=utf-8")], b"Forbidden\n")
+
+    if path.suffix.lower() in PHP_EXTENSIONS:
+        if php_cgi:
+            return await run_php_cgi(php_cgi, req, path, script_name)
+        if req.method == "POST":
+            return Response(501, [("Content-Type", "text/plain; charset=utf-8")], b"POST needs php-cgi\n")
+        body = (await asyncio.to_thread(emulate_php, path)).encode("utf-8")
+        headers = [("Content-Type", "text/html; charset=utf-8")] + cache_headers(path)
+        return Response(200, headers, body, "php-emulated")
+
+    if req.method == "POST":
+        return Response(405, [("Allow", "GET, HEAD")], b"Method Not Allowed\n")
+    return await asyncio.to_thread(serve_static, req, path)
+
+
+async def read_request(reader: asyncio.StreamReader) -> Optional[Request]:
+    try:
+        head = await reader.readuntil(b"\r\n\r\n")
+    except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError):
+        return None
+    lines = head.decode("latin-1").split("\r\n")
+    parts = lines[0].split()
+    if len(parts) != 3:
+        return None
+    method, target, _version = parts
+    headers: Dict[str, str] = {}
+    for line in lines[1:]:
+        name, sep, value = line.partition(":")
+        if sep:
+            headers[name.strip().lower()] = value.strip()
+    body = b""
+    length = int(headers.get("content-length", "0") or 0)
+    if length:
+        body = await reader.readexactly(length)
+    url = urlsplit(target)
+    return Request(method.upper(), target, url.path or "/", url.query, headers, body)
+
+
+def log_request(req: Request, res: Response, sent: int, elapsed: float) -> None:
+    cache = res.header("Cache-Control") or "-"
+    print(
+        f"{req.method} {req.target} {res.status} {sent / 1024:.1f} KB "
+        f"{elapsed * 1000:.1f} ms [{cache}] {res.via}"
+    )
+
+
+async def serve_connection(reader: asyncio.StreamReader, writer: asyncio.StreamWriter, php_cgi: Optional[str]) -> None:
+    try:
+        while True:
+            req = await read_request(reader)
+            if req is None:
+                break
+            started = time.perf_counter()
+            try:
+                res = await handle(req, php_cgi)
+            except Exception as e:  # Keep serving; report the failure.
+                print(f"[ERROR] {req.method} {req.target}: {e}", file=sys.stderr)
+                res = Response(500, [("Content-Type", "text/plain; charset=utf-8")], b"Internal Server Error\n")
+
+            keep_alive = req.headers.get("connection", "").lower() != "close"
+            body = b"" if req.method == "HEAD" else res.body
+            head = [f"HTTP/1.1 {res.status} {STATUS_TEXT.get(res.status, '')}"]
+            head += [f"{k}: {v}" for k, v in res.headers]
+            head += [
+                f"Date: {email.utils.formatdate(usegmt=True)}",
+                f"Content-Length: {len(res.body)}",
+                f"Connection: {'keep-alive' if keep_alive else 'close'}",
+            ]
+            writer.write(("\r\n".join(head) + "\r\n\r\n").encode("latin-1") + body)
+            await writer.drain()
+            log_request(req, res, len(body), time.perf_counter() - started)
+            if not keep_alive:
+                break
+    except ConnectionError:
+        pass
+    finally:
+        writer.close()
+
+
+def parse_args() -> argparse.Namespace:
+    ap = argparse.ArgumentParser(description="Serve topdotSite/ with the production .htaccess rules emulated.")
+    ap.add_argument("--host", default="127.0.0.1")
+    ap.add_argument("--port", type=int, default=8000)
+    ap.add_argument("--no-php", action="store_true", help="Use the include emulation even if php-cgi is available.")
+    return ap.parse_args()
+
+
+async def main_async(args: argparse.Namespace) -> None:
+    php_cgi = None if args.no_php else shutil.which("php-cgi")
+    server = await asyncio.start_server(
+        lambda r, w: serve_connection(r, w, php_cgi), host=args.host, port=args.port
+    )
+    mode = f"php-cgi ({php_cgi})" if php_cgi else "include emulation (php-cgi not found)"
+    print(f"Serving {SITE_ROOT} at http://{args.host}:{args.port}/ - PHP: {mode}")
+    async with server:
+        await server.serve_forever()
+
+
+def main() -> None:
+    args = parse_args()
+    try:
+        asyncio.run(main_async(args))
+    except KeyboardInterrupt:
+        print("\nStopped.")
+
+
+if __name__ == "__main__":
+    main()
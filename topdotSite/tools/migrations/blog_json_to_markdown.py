@@ -0,0 +1,133 @@
+"""
+One-off: convert the blog JSON into Markdown sources for tools/pipeline/blog_to_json.py.
+
+Reads topdotSite/data/blog.json and topdotSite/data/blog/<id>.json, writes
+topdotSite/content/blog/<id>.md. <strong> and new-tab <a href> become **bold** and [links];
+any other inline HTML is kept as written. Compiling the output reproduces the JSON
+(plus the excerpt/reading-time fields the compiler adds).
+
+Run:
+  python topdotSite/tools/migrations/blog_json_to_markdown.py [--overwrite]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import re
+import sys
+from pathlib import Path
+from typing import Any, Dict, List
+
+SITE_ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(SITE_ROOT / "tools" / "pipeline"))
+
+from sheets_to_projects_json import slugify  # noqa: E402
+
+
+DATA_DIR = SITE_ROOT / "data"
+CONTENT_DIR = SITE_ROOT / "content" / "blog"
+
+TOKEN_RE = re.compile(r"(<[^>]+>)")
+MD_LINK_RE = re.compile(r'^<a href="([^"\s()]*)" target="_blank">$')
+
+
+def escape(text: str) -> str:
+    return re.sub(r"([\\*\[\]{}#])", r"\\\1", text)
+
+
+def to_markdown(fragment: str) -> str:
+    out: List[str] = []
+    links: List[str] = []  # closing text for each open <a>: "](url)" or "</a>"
+    for token in TOKEN_RE.split(fragment):
+        if not token.startswith("<"):
+            out.append(escape(token))
+        elif token in ("<strong>", "</strong>"):
+            out.append("**")
+        elif token.lower().startswith("<a "):
+            m = MD_LINK_RE.match(token)
+            out.append("[" if m else token)
+            links.append(f"]({m.group(1)})" if m else "</a>")
+        elif token.lower() == "</a>" and links:
+            out.append(links.pop())
+        else:
+            out.append(token)
+    # Blank lines would end the paragraph.
+    return re.sub(r"\n\s*\n", "\n", "".join(out)).strip()
+
+
+def front_value(value: Any) -> str:
+    if isinstance(value, str) and value and value == value.strip() and value[0] not in '["{' \
+            and value not in {"null", "true", "false"} and not re.fullmatch(r"-?\d+(\.\d+)?", value):
+        return value
+    return json.dumps(value, ensure_ascii=False)
+
+
+def block_markdown(block: Dict[str, Any]) -> str:
+    kind = block.get("type")
+    if kind == "img":
+        return f"![{escape(block.get('alt') or '')}]({block.get('src', '')})"
+    if kind == "iframe":
+        return f'<iframe src="{block.get("src", "")}" height="{block.get("height") or ""}" title="{block.get("title") or ""}"></iframe>'
+    text = to_markdown(block.get("html") or "")
+    indent = block.get("indent")
+    if isinstance(indent, (int, float)) and indent:
+        text += f" {{indent={indent:g}}}"
+    return text
+
+
+def post_markdown(detail: Dict[str, Any], entry: Dict[str, Any]) -> str:
+    title = detail.get("title") or entry.get("title") or detail["id"]
+    meta: Dict[str, Any] = {"title": title}
+    if detail.get("date") or entry.get("date"):
+        meta["date"] = detail.get("date") or entry.get("date")
+    if entry.get("tags"):
+        meta["tags"] = entry["tags"]
+    meta["featuredImage"] = detail.get("featuredImage") or ""
+    if entry.get("thumbnail") and entry["thumbnail"] != meta["featuredImage"]:
+        meta["thumbnail"] = entry["thumbnail"]
+    meta["description"] = (detail.get("meta") or {}).get("description") or ""
+    if detail.get("slug") and detail["slug"] != slugify(title):
+        meta["slug"] = detail["slug"]
+    if detail.get("legacyHtml"):
+        meta["legacyHtml"] = detail["legacyHtml"]
+
+    lines = ["---"] + [f"{k}: {front_value(v)}" for k, v in meta.items()] + ["---", ""]
+    for block in detail.get("intro") or []:
+        lines += [block_markdown(block), ""]
+    for section in detail.get("sections") or []:
+        heading = f"## {escape(section.get('title') or '')}"
+        if section.get("id") and section["id"] != slugify(section.get("title") or ""):
+            heading += f" {{#{section['id']}}}"
+        lines += [heading, ""]
+        for block in section.get("blocks") or []:
+            lines += [block_markdown(block), ""]
+    return "\n".join(lines).rstrip() + "\n"
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description="Convert the blog JSON into Markdown sources.")
+    ap.add_argument("--overwrite", action="store_true", help="Replace existing .md files.")
+    args = ap.parse_args()
+
+    listing = json.loads((DATA_DIR / "blog.json").read_text(encoding="utf-8"))
+    CONTENT_DIR.mkdir(parents=True, exist_ok=True)
+    written = 0
+    for entry in listing:
+        src = DATA_DIR / "blog" / f"{entry['id']}.json"
+        out = CONTENT_DIR / f"{entry['id']}.md"
+        if not src.exists():
+            print(f"[WARN] {entry['id']}: {src.relative_to(SITE_ROOT)} not found, skipped")
+            continue
+        if out.exists() and not args.overwrite:
+            print(f"[WARN] {out.relative_to(SITE_ROOT)} exists, skipped (use --overwrite)")
+            continue
+        detail = json.loads(src.read_text(encoding="utf-8"))
+        out.write_text(post_markdown(detail, entry), encoding="utf-8")
+        written += 1
+
+    print(f"Wrote {written} posts -> {CONTENT_DIR.relative_to(SITE_ROOT)}/")
+
+
+if __name__ == "__main__":
+    main()
@@ -5,6 +5,10 @@ Outputs:
 - topdotSite/data/blog.json (lightweight listing)
 - topdotSite/data/blog/{id}.json (detail data, one per post)
 
+Superseded: posts are now written in content/blog/*.md and compiled by
+tools/pipeline/blog_to_json.py (blog_json_to_markdown.py did the one-off conversion).
+Running this would overwrite the compiled JSON.
+
 Run:
   python topdotSite/tools/migrations/generate_blog_data.py
 """
@@ -18,6 +18,8 @@ from dataclasses import dataclass
 from pathlib import Path
 from typing import Dict, List, Tuple
 
+from tag_classifier import TagClassifier
+
 
 SITE_ROOT = Path(__file__).resolve().parents[2]
 
@@ -37,7 +39,7 @@ CATEGORY_PAGES: List[CategoryPage] = [
     ),
     CategoryPage(
         # Split into independent tags for filtering.
-        # We'll refine per-project tags with heuristics below.
+        # Per-project tags are refined with the taxonomy classifier below.
         tags=["multi-unit", "commercial", "mixed-use"],
         page=SITE_ROOT / "_legacy" / "Projects" / "multiUnit-Commercial-MixedUse.html",
         page_dir=SITE_ROOT / "_legacy" / "Projects",
@@ -172,78 +174,6 @@ def parse_detail_page(detail_file: Path) -> Tuple[str, List[str], List[str], str
     return location, desc, gallery, featured
 
 
-def infer_muc_tags(*, name: str, description: List[str]) -> List[str]:
-    """
-    Best-effort tag inference for the legacy MultiUnit-Commercial-MixedUse category.
-    This is intentionally conservative; final tagging should come from Sheets.
-    """
-    hay = (name + " " + " ".join(description)).lower()
-
-    # "Multi-unit" signals.
-    is_multi = any(
-        k in hay
-        for k in [
-            "multiplex",
-            "multi",
-            "units",
-            "unit",
-            "housing",
-            "apartment",
-            "duplex",
-            "triplex",
-            "fourplex",
-            "sixplex",
-            "missing middle",
-            "residential",
-        ]
-    )
-
-    # "Commercial" signals.
-    # NOTE: Don't treat "home office" as a commercial indicator.
-    commercial_keywords = [
-        "restaurant",
-        "burger",
-        "retail",
-        "shop",
-        "store",
-        "clinic",
-        "dentist",
-        "museum",
-        "centre",
-        "center",
-        "park",
-    ]
-    is_commercial = any(k in hay for k in commercial_keywords)
-    if not is_commercial and re.search(r"\boffice\b", hay) and not re.search(r"\bhome\s+office\b", hay):
-        is_commercial = True
-
-    is_mixed = any(k in hay for k in ["mixed-use", "mixed use", "retail at grade", "commercial at grade"])
-
-    tags: List[str] = []
-
-    # If a project is clearly a public/commercial program (museum/centre/park/etc.),
-    # prefer "commercial" unless there are strong housing terms.
-    public_program = any(k in hay for k in ["museum", "centre", "center", "park"])
-    if public_program and not any(k in hay for k in ["multiplex", "housing", "apartment", "duplex", "triplex", "fourplex", "sixplex"]):
-        is_multi = False
-
-    if is_multi:
-        tags.append("multi-unit")
-    if is_commercial:
-        tags.append("commercial")
-    if is_mixed:
-        tags.append("mixed-use")
-
-    # Fallback: pick one reasonable tag so filtering is meaningful even without data.
-    if not tags:
-        if "burger" in hay or "dentist" in hay or "museum" in hay or "centre" in hay or "center" in hay:
-            tags = ["commercial"]
-        else:
-            tags = ["multi-unit"]
-
-    return tags
-
-
 def build_default_specs(*, location: str) -> List[dict]:
     """
     Build a minimal specs list from what we can reliably extract today.
@@ -271,6 +201,7 @@ def main() -> None:
 
     listing: List[dict] = []
     seen: set[str] = set()
+    classifier = TagClassifier.from_file()
 
     for cat in CATEGORY_PAGES:
         html = read_text(cat.page)
@@ -295,7 +226,10 @@ def main() -> None:
                     _, desc, _, _ = parse_detail_page(detail_path)
                 else:
                     desc = []
-                tags = infer_muc_tags(name=name, description=desc)
+                # Best-effort and conservative; final tagging should come from Sheets.
+                result = classifier.classify(" ".join([name] + desc))
+                tags = result.tags
+                print(f"  {it.id}: {', '.join(tags)}  [{result.describe()}]")
 
             listing.append(
                 {
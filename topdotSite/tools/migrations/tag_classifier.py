@@ -0,0 +1,196 @@
+"""
+Taxonomy-driven tag classifier.
+
+Tags and their keywords live in tag_taxonomy.json (no code edits for new tags):
+
+  "tags": {
+    "<tag>": {
+      "terms": [...],                 words/phrases that are evidence for the tag
+      "exclude": [...],               phrases that must not count (e.g. "home office")
+      "suppressedBy": {               drop the tag when any of "terms" appears,
+        "terms": [...], "unless": [...]   unless one of "unless" appears too
+      }
+    }
+  },
+  "default": [...]                    tags to use when nothing matched
+
+Terms match whole words, case-insensitively; spaces in a phrase match any whitespace and a
+trailing "*" matches any word ending ("burger*" matches "burgers"). Every term of every tag
+is compiled once into a single regex (longest terms first), so classifying a text is one
+left-to-right scan however many tags there are. Where a longer term contains a shorter one
+("retail at grade" / "retail"), the longer match also carries the shorter term's roles,
+unless the longer term is an exclude for that tag.
+
+Run (re-tag the projects that carry one of the taxonomy's tags, or the given ids; prints
+suggested tags with evidence, "~" where they differ from the current tags):
+  python topdotSite/tools/migrations/tag_classifier.py [--taxonomy PATH] [--json] [id ...]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import re
+import sys
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Set, Tuple
+
+
+SITE_ROOT = Path(__file__).resolve().parents[2]
+PROJECTS_DIR = SITE_ROOT / "data" / "projects"
+TAXONOMY_PATH = Path(__file__).resolve().parent / "tag_taxonomy.json"
+
+# Roles a term can play for a tag.
+MATCH, EXCLUDE, SUPPRESS, UNLESS = "match", "exclude", "suppress", "unless"
+
+Role = Tuple[str, str]  # (role, tag)
+
+
+def term_pattern(term: str) -> str:
+    """Regex for one taxonomy term (without the word-boundary checks)."""
+    wildcard = term.endswith("*")
+    words = term.rstrip("*").lower().split()
+    body = r"\s+".join(re.escape(w) for w in words)
+    return body + r"\w*" if wildcard else body
+
+
+def bounded(pattern: str) -> str:
+    # Word start first: the scan rejects mid-word positions before trying any alternative.
+    return rf"\b(?=\w)(?:{pattern})(?!\w)"
+
+
+@dataclass
+class Classification:
+    tags: List[str]
+    # tag -> {matched text: count}
+    evidence: Dict[str, Dict[str, int]] = field(default_factory=dict)
+    # tag -> the terms that suppressed it
+    suppressed: Dict[str, List[str]] = field(default_factory=dict)
+    default: bool = False
+
+    def describe(self) -> str:
+        parts = []
+        for tag in self.tags:
+            words = self.evidence.get(tag, {})
+            found = ", ".join(f"{w} x{n}" if n > 1 else w for w, n in words.items())
+            parts.append(f"{tag} ({found})" if found else tag)
+        for tag, by in self.suppressed.items():
+            parts.append(f"not {tag}: suppressed by {', '.join(by)}")
+        if self.default:
+            parts.append("default: nothing matched")
+        return "; ".join(parts)
+
+
+class TagClassifier:
+    """A taxonomy compiled into one regex."""
+
+    def __init__(self, taxonomy: Dict[str, Any]) -> None:
+        self.tag_order: List[str] = list(taxonomy.get("tags", {}))
+        self.default: List[str] = list(taxonomy.get("default", []))
+        self.suppressible: Set[str] = set()
+
+        roles: Dict[str, Set[Role]] = {}
+
+        def add(terms: List[str], role: str, tag: str) -> None:
+            for term in terms:
+                roles.setdefault(term.strip().lower(), set()).add((role, tag))
+
+        for tag, spec in taxonomy.get("tags", {}).items():
+            add(spec.get("terms", []), MATCH, tag)
+            add(spec.get("exclude", []), EXCLUDE, tag)
+            suppressed_by = spec.get("suppressedBy")
+            if suppressed_by:
+                self.suppressible.add(tag)
+                add(suppressed_by.get("terms", []), SUPPRESS, tag)
+                add(suppressed_by.get("unless", []), UNLESS, tag)
+
+        # A term that contains another term carries its roles too (a regex scan reports
+        # only the longest match at each position), except matches an exclude cancels.
+        terms = sorted(roles, key=lambda t: len(t.rstrip("*")))
+        compiled = {t: re.compile(bounded(term_pattern(t))) for t in terms}
+        for i, term in enumerate(terms):
+            literal = term.rstrip("*")
+            excluded = {tag for role, tag in roles[term] if role == EXCLUDE}
+            for shorter in terms[:i]:
+                if shorter != term and compiled[shorter].search(literal):
+                    roles[term] |= {r for r in roles[shorter] if not (r[0] == MATCH and r[1] in excluded)}
+
+        # Longest first, so a phrase wins over the words inside it.
+        self.terms: List[str] = sorted(terms, key=lambda t: (-len(t.rstrip("*")), t))
+        self.roles: List[Set[Role]] = [roles[t] for t in self.terms]
+        self.regex = re.compile(
+            bounded("|".join(f"(?P<t{i}>{term_pattern(t)})" for i, t in enumerate(self.terms))),
+            re.IGNORECASE,
+        )
+
+    @classmethod
+    def from_file(cls, path: Path = TAXONOMY_PATH) -> "TagClassifier":
+        return cls(json.loads(path.read_text(encoding="utf-8")))
+
+    def classify(self, text: str) -> Classification:
+        hits: Dict[Role, Dict[str, int]] = {}
+        for m in self.regex.finditer(text):
+            word = re.sub(r"\s+", " ", m.group(0).lower())
+            for role in self.roles[int(m.lastgroup[1:])]:  # type: ignore[index]
+                counts = hits.setdefault(role, {})
+                counts[word] = counts.get(word, 0) + 1
+
+        result = Classification(tags=[])
+        for tag in self.tag_order:
+            evidence = hits.get((MATCH, tag))
+            if not evidence:
+                continue
+            if tag in self.suppressible and (SUPPRESS, tag) in hits and (UNLESS, tag) not in hits:
+                result.suppressed[tag] = list(hits[(SUPPRESS, tag)])
+                continue
+            result.tags.append(tag)
+            result.evidence[tag] = evidence
+
+        if not result.tags:
+            result.tags = list(self.default)
+            result.default = True
+        return result
+
+
+def project_text(detail: Dict[str, Any]) -> str:
+    return " ".join([detail.get("name", "")] + [str(p) for p in detail.get("description", [])])
+
+
+def parse_args() -> argparse.Namespace:
+    ap = argparse.ArgumentParser(description="Suggest project tags from the taxonomy, with evidence.")
+    ap.add_argument("ids", nargs="*", help="Project ids (default: projects already tagged with a taxonomy tag).")
+    ap.add_argument("--taxonomy", type=Path, default=TAXONOMY_PATH)
+    ap.add_argument("--json", action="store_true", help="Print JSON instead of text.")
+    return ap.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    classifier = TagClassifier.from_file(args.taxonomy)
+
+    paths = [PROJECTS_DIR / f"{pid}.json" for pid in args.ids] or sorted(PROJECTS_DIR.glob("*.json"))
+    out: Dict[str, Any] = {}
+    for path in paths:
+        if not path.exists():
+            print(f"[ERROR] {path.stem}: detail JSON not found")
+            sys.exit(1)
+        detail = json.loads(path.read_text(encoding="utf-8"))
+        current = detail.get("tags", [])
+        if not args.ids and not set(current) & set(classifier.tag_order):
+            continue
+        c = classifier.classify(project_text(detail))
+        if args.json:
+            out[path.stem] = {"current": current, "suggested": c.tags, "evidence": c.evidence, "suppressed": c.suppressed}
+            continue
+        marker = " " if sorted(current) == sorted(c.tags) else "~"
+        print(f"{marker} {path.stem}: {', '.join(c.tags)}  [{c.describe()}]")
+        if marker == "~":
+            print(f"    current: {', '.join(current)}")
+
+    if args.json:
+        print(json.dumps(out, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,462 @@
+"""
+Artifact cache: a content-addressable store for derived files, shared across checkouts and machines.
+
+Derivatives (card crops, tile pyramids, animation transcodes, blog variants) are keyed by the
+source hash + the transform parameters + the encoder version, so a clean checkout (or another
+laptop) can restore them instead of recomputing them. The store lives outside the repo:
+
+  $TOPDOT_ARTIFACT_CACHE   (default: $XDG_CACHE_HOME/topdot/artifacts, i.e. ~/.cache/topdot/artifacts;
+                            set it to "off" to disable the cache)
+  objects/<ab>/<sha256>    file contents, stored once however many entries use them
+  entries/<ab>/<key>.json  {kind, files: {site-relative path: [sha256, size]}, meta}
+
+An entry's mtime is its last use. When the objects exceed the size cap
+($TOPDOT_ARTIFACT_CACHE_MAX, e.g. "5G"; default 5 GB), the least recently used entries are
+evicted, and then any objects no entry references. Objects written or reused in the last
+EVICT_GRACE_SECONDS are not deleted as unreferenced, and an evicted entry's objects are kept if
+they were reused after its last use: store() writes objects before their entry, so another
+process may be in the middle of storing them.
+
+Restored files are copied (reflinked where the filesystem supports it) and renamed into place,
+never hardlinked, so rewriting a derivative cannot corrupt the store. Objects are verified
+against their hash when imported. Entries whose paths are absolute, contain "..", or land
+outside images/_derived/ are rejected, so an imported store cannot write elsewhere in the site.
+
+The pipeline scripts use the cache automatically; this script manages it:
+  python topdotSite/tools/pipeline/artifact_cache.py stats
+  python topdotSite/tools/pipeline/artifact_cache.py export artifacts.tar.gz    # or a directory (shared store)
+  python topdotSite/tools/pipeline/artifact_cache.py import artifacts.tar.gz    # or a directory
+  python topdotSite/tools/pipeline/artifact_cache.py evict [--max-size 2G]
+  python topdotSite/tools/pipeline/artifact_cache.py clear
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import shutil
+import sys
+import tarfile
+import time
+from pathlib import Path, PurePosixPath
+from typing import Any, Dict, Iterable, Iterator, Optional, Tuple
+
+from reflink import reflink
+
+
+SITE_ROOT = Path(__file__).resolve().parents[2]
+DERIVED_DIR = "images/_derived"  # the only part of the site an entry may restore into
+
+CACHE_ENV = "TOPDOT_ARTIFACT_CACHE"
+MAX_SIZE_ENV = "TOPDOT_ARTIFACT_CACHE_MAX"
+DEFAULT_MAX_BYTES = 5 * 1024**3
+# Unreferenced objects younger than this may belong to an entry another process is storing.
+EVICT_GRACE_SECONDS = 3600
+SIZE_UNITS = {"": 1, "K": 1024, "M": 1024**2, "G": 1024**3, "T": 1024**4}
+HEX_RE = re.compile(r"[0-9a-f]{64}")
+
+
+def default_store() -> Optional[Path]:
+    value = os.environ.get(CACHE_ENV, "").strip()
+    if value.lower() in {"off", "0", "none"}:
+        return None
+    if value:
+        return Path(value).expanduser()
+    base = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(base) / "topdot" / "artifacts"
+
+
+def parse_size(text: str) -> int:
+    """Bytes for "500M", "5G", "1.5g" or a plain number."""
+    text = text.strip().upper().removesuffix("B")
+    unit = text[-1:] if text[-1:] in SIZE_UNITS and not text[-1:].isdigit() else ""
+    return int(float(text[: len(text) - len(unit)]) * SIZE_UNITS[unit])
+
+
+def sha256_file(path: Path) -> str:
+    h = hashlib.sha256()
+    with path.open("rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+# Cleared after the first failed reflink: the store and the site stay on the same filesystems.
+_reflink_ok = True
+
+
+def place_copy(src: Path, dest: Path) -> None:
+    """Copy src to dest via a temp file + rename (reflink if possible)."""
+    global _reflink_ok
+    dest.parent.mkdir(parents=True, exist_ok=True)
+    tmp = dest.with_name(f".{dest.name}.{os.getpid()}.tmp")
+    try:
+        if _reflink_ok:
+            try:
+                reflink(src, tmp)
+            except OSError:
+                _reflink_ok = False
+        if not _reflink_ok:
+            shutil.copyfile(src, tmp)
+        os.replace(tmp, dest)
+    finally:
+        tmp.unlink(missing_ok=True)
+
+
+def write_json_atomic(path: Path, data: Dict[str, Any]) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    tmp.write_text(json.dumps(data, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+    os.replace(tmp, path)
+
+
+class ArtifactCache:
+    """
+    One store directory. Safe to share between processes: every write is a rename, and evict()
+    spares objects that a concurrent store() may be about to reference.
+    """
+
+    def __init__(self, root: Path, max_bytes: int = DEFAULT_MAX_BYTES, site_root: Path = SITE_ROOT) -> None:
+        self.root = root
+        self.max_bytes = max_bytes
+        self.site_root = site_root
+        self.hits = 0
+        self.misses = 0
+        self.stored = 0
+
+    @classmethod
+    def from_env(cls) -> Optional["ArtifactCache"]:
+        """The configured store, or None if the cache is turned off (or unusable)."""
+        root = default_store()
+        if root is None:
+            return None
+        try:
+            max_bytes = parse_size(os.environ.get(MAX_SIZE_ENV, "") or str(DEFAULT_MAX_BYTES))
+        except ValueError:
+            print(f"[WARN] {MAX_SIZE_ENV} is not a size (e.g. 5G); using the default")
+            max_bytes = DEFAULT_MAX_BYTES
+        try:
+            root.mkdir(parents=True, exist_ok=True)
+        except OSError as e:
+            print(f"[WARN] artifact cache {root} unavailable ({e}); building without it")
+            return None
+        return cls(root, max_bytes)
+
+    @staticmethod
+    def key(kind: str, source: str, params: Dict[str, Any], encoder: str) -> str:
+        """Cache key: what was built (kind + params), from what (source hash), and with what (encoder)."""
+        blob = json.dumps({"kind": kind, "source": source, "params": params, "encoder": encoder}, sort_keys=True)
+        return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+    def _object(self, digest: str) -> Path:
+        return self.root / "objects" / digest[:2] / digest
+
+    def _entry(self, key: str) -> Path:
+        return self.root / "entries" / key[:2] / f"{key}.json"
+
+    def _read_entry(self, path: Path) -> Optional[Dict[str, Any]]:
+        try:
+            return json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+
+    def site_path(self, rel: Any) -> Optional[Path]:
+        """Where an entry file is restored, or None unless rel is a relative path inside images/_derived/."""
+        if not isinstance(rel, str) or "\\" in rel:
+            return None
+        parts = PurePosixPath(rel).parts
+        if PurePosixPath(rel).is_absolute() or ".." in parts or "/".join(parts[:2]) != DERIVED_DIR or len(parts) < 3:
+            return None
+        dest = self.site_root / rel
+        if not dest.resolve().is_relative_to((self.site_root / DERIVED_DIR).resolve()):
+            return None  # a symlinked directory points out of the tree
+        return dest
+
+    def invalid_entry(self, key: str, entry: Any) -> Optional[str]:
+        """Why an entry (from this store or an imported one) can't be used, or None if it is sound."""
+        if not HEX_RE.fullmatch(key):
+            return "key is not a sha256"
+        files = entry.get("files") if isinstance(entry, dict) else None
+        if not isinstance(files, dict):
+            return "no file list"
+        for rel, value in files.items():
+            if not (isinstance(value, list) and len(value) == 2 and isinstance(value[0], str) and HEX_RE.fullmatch(value[0])):
+                return f"bad object reference for {rel!r}"
+            if self.site_path(rel) is None:
+                return f"path {rel!r} is outside {DERIVED_DIR}/"
+        return None
+
+    def fetch(self, key: str) -> Optional[Dict[str, Any]]:
+        """Restore an entry's files into the site tree; returns its meta, or None on a miss."""
+        path = self._entry(key)
+        entry = self._read_entry(path)
+        if entry is not None and (reason := self.invalid_entry(key, entry)):
+            print(f"[WARN] artifact {key[:12]}: {reason}; ignored")
+            entry = None
+        if entry is None or not all(self._object(d).exists() for d, _size in entry["files"].values()):
+            self.misses += 1
+            return None
+        try:
+            for rel, (digest, _size) in entry["files"].items():
+                place_copy(self._object(digest), self.site_path(rel))
+            os.utime(path)  # last use, for LRU eviction
+        except OSError:
+            # Evicted by another process mid-restore; the caller rebuilds (and overwrites).
+            self.misses += 1
+            return None
+        self.hits += 1
+        return entry.get("meta", {})
+
+    def store(self, key: str, kind: str, files: Iterable[Path], meta: Optional[Dict[str, Any]] = None) -> None:
+        """Add the given site files (and their meta) under key. Failures only warn."""
+        try:
+            listed: Dict[str, Tuple[str, int]] = {}
+            for path in files:
+                digest = sha256_file(path)
+                obj = self._object(digest)
+                if obj.exists():
+                    os.utime(obj)  # protects it from a concurrent evict until the entry is written
+                else:
+                    place_copy(path, obj)
+                listed[path.relative_to(self.site_root).as_posix()] = (digest, path.stat().st_size)
+            write_json_atomic(
+                self._entry(key),
+                {"kind": kind, "files": listed, "meta": meta or {}, "created": time.strftime("%Y-%m-%dT%H:%M:%S")},
+            )
+            self.stored += 1
+        except OSError as e:
+            print(f"[WARN] cannot store {kind} artifact in {self.root} ({e})")
+
+    def iter_entries(self) -> Iterator[Tuple[Path, Dict[str, Any]]]:
+        entries_dir = self.root / "entries"
+        if not entries_dir.exists():
+            return
+        for path in sorted(entries_dir.glob("*/*.json")):
+            entry = self._read_entry(path)
+            if entry is not None:
+                yield path, entry
+
+    def iter_objects(self) -> Iterator[Path]:
+        objects_dir = self.root / "objects"
+        if objects_dir.exists():
+            yield from (p for p in objects_dir.glob("*/*") if not p.name.startswith("."))
+
+    def size(self) -> int:
+        return sum(p.stat().st_size for p in self.iter_objects())
+
+    def evict(self, max_bytes: Optional[int] = None) -> Tuple[int, int]:
+        """
+        Drop least recently used entries until the objects fit in max_bytes, then delete
+        unreferenced objects. Returns (entries removed, bytes freed).
+        """
+        limit = self.max_bytes if max_bytes is None else max_bytes
+        entries = [(path.stat().st_mtime, path, entry) for path, entry in self.iter_entries()]
+        refs: Dict[str, int] = {}
+        for _mtime, _path, entry in entries:
+            for digest, _size in entry["files"].values():
+                refs[digest] = refs.get(digest, 0) + 1
+
+        grace_start = time.time() - EVICT_GRACE_SECONDS
+        freed = 0
+        total = 0
+        for obj in list(self.iter_objects()):
+            st = obj.stat()
+            if obj.name in refs or st.st_mtime > grace_start:
+                total += st.st_size
+            else:
+                obj.unlink()
+                freed += st.st_size
+
+        removed = 0
+        for mtime, path, entry in sorted(entries, key=lambda e: e[0]):
+            if total <= limit:
+                break
+            path.unlink(missing_ok=True)
+            removed += 1
+            for digest, size in entry["files"].values():
+                refs[digest] -= 1
+                obj = self._object(digest)
+                # An object touched after the entry's last use is being reused by a concurrent store().
+                if refs[digest] == 0 and obj.exists() and obj.stat().st_mtime <= mtime:
+                    obj.unlink(missing_ok=True)
+                    total -= size
+                    freed += size
+        return removed, freed
+
+    def merge_from(self, other: Path) -> Tuple[int, int]:
+        """Copy entries (and their objects) from another store directory. Returns (entries, objects) added."""
+        source = ArtifactCache(other, site_root=self.site_root)
+        added_entries = added_objects = 0
+        for path, entry in source.iter_entries():
+            key = path.stem
+            reason = source.invalid_entry(key, entry)
+            if reason:
+                print(f"[WARN] {key[:12]}: {reason}; entry skipped")
+                continue
+            if self._entry(key).exists():
+                continue
+            ok = True
+            for digest, _size in entry["files"].values():
+                obj = self._object(digest)
+                if obj.exists():
+                    continue
+                src = source._object(digest)
+                if not src.exists() or sha256_file(src) != digest:
+                    print(f"[WARN] {key[:12]}: object {digest[:12]} missing or corrupt; entry skipped")
+                    ok = False
+                    break
+                place_copy(src, obj)
+                added_objects += 1
+            if ok:
+                write_json_atomic(self._entry(key), entry)
+                added_entries += 1
+        return added_entries, added_objects
+
+    def export_tar(self, dest: Path) -> int:
+        """Write entries + objects to a tarball (.tar, or gzip for .tar.gz/.tgz). Returns entries written."""
+        mode = "w:gz" if dest.name.endswith((".gz", ".tgz")) else "w"
+        count = 0
+        written = set()
+        with tarfile.open(dest, mode) as tar:
+            for path, entry in self.iter_entries():
+                for digest, _size in entry["files"].values():
+                    obj = self._object(digest)
+                    if digest not in written and obj.exists():
+                        tar.add(obj, arcname=f"objects/{digest[:2]}/{digest}")
+                        written.add(digest)
+                tar.add(path, arcname=path.relative_to(self.root).as_posix())
+                count += 1
+        return count
+
+    def import_tar(self, src: Path) -> Tuple[int, int]:
+        """Merge a tarball written by export_tar. Only objects/ and entries/ members are read."""
+        added_entries = added_objects = 0
+        entries: Dict[str, Dict[str, Any]] = {}
+        with tarfile.open(src, "r:*") as tar:
+            for member in tar:
+                parts = member.name.split("/")
+                if not member.isfile() or len(parts) != 3 or parts[0] not in {"objects", "entries"}:
+                    continue
+                f = tar.extractfile(member)
+                if f is None:
+                    continue
+                data = f.read()
+                if parts[0] == "entries":
+                    try:
+                        entries[parts[2].removesuffix(".json")] = json.loads(data)
+                    except ValueError:
+                        print(f"[WARN] {member.name}: not JSON; skipped")
+                    continue
+                digest = parts[2]
+                if hashlib.sha256(data).hexdigest() != digest:
+                    print(f"[WARN] {member.name}: content does not match its hash; skipped")
+                    continue
+                obj = self._object(digest)
+                if not obj.exists():
+                    obj.parent.mkdir(parents=True, exist_ok=True)
+                    tmp = obj.with_name(f".{digest}.{os.getpid()}.tmp")
+                    tmp.write_bytes(data)
+                    os.replace(tmp, obj)
+                    added_objects += 1
+        for key, entry in entries.items():
+            reason = self.invalid_entry(key, entry)
+            if reason:
+                print(f"[WARN] {key[:12]}: {reason}; entry skipped")
+                continue
+            if self._entry(key).exists():
+                continue
+            if all(self._object(d).exists() for d, _size in entry.get("files", {}).values()):
+                write_json_atomic(self._entry(key), entry)
+                added_entries += 1
+            else:
+                print(f"[WARN] {key[:12]}: objects missing from the archive; entry skipped")
+        return added_entries, added_objects
+
+    def report(self) -> str:
+        """One-line summary for the end of a pipeline run."""
+        return f"Artifact cache: {self.hits} restored, {self.stored} built and stored ({self.root})"
+
+
+def open_cache(disabled: bool = False) -> Optional[ArtifactCache]:
+    """The cache for a pipeline run (None with --no-cache or when turned off)."""
+    return None if disabled else ArtifactCache.from_env()
+
+
+def fmt_size(n: float) -> str:
+    if n >= 1024**3:
+        return f"{n / 1024**3:.1f} GB"
+    if n >= 1024 * 1024:
+        return f"{n / 1024 / 1024:.1f} MB"
+    return f"{n / 1024:.1f} KB"
+
+
+def parse_args() -> argparse.Namespace:
+    ap = argparse.ArgumentParser(description="Manage the shared artifact cache for derived images.")
+    ap.add_argument("--store", type=Path, help=f"Store directory (default: ${CACHE_ENV} or ~/.cache/topdot/artifacts).")
+    sub = ap.add_subparsers(dest="command", required=True)
+    sub.add_parser("stats", help="Entries, objects and size by kind.")
+    p = sub.add_parser("export", help="Write the store to a tarball or merge it into another directory.")
+    p.add_argument("dest", type=Path)
+    p = sub.add_parser("import", help="Merge a tarball or another store directory into this one.")
+    p.add_argument("src", type=Path)
+    p = sub.add_parser("evict", help="Evict least recently used entries down to the size cap.")
+    p.add_argument("--max-size", help=f"Cap (e.g. 2G; default: ${MAX_SIZE_ENV} or 5G).")
+    sub.add_parser("clear", help="Delete everything in the store.")
+    return ap.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    cache = ArtifactCache(args.store) if args.store else ArtifactCache.from_env()
+    if cache is None:
+        print(f"Error: artifact cache is turned off (${CACHE_ENV}); pass --store DIR")
+        sys.exit(1)
+    if args.store:
+        cache.max_bytes = parse_size(os.environ.get(MAX_SIZE_ENV, "") or str(DEFAULT_MAX_BYTES))
+
+    if args.command == "stats":
+        kinds: Dict[str, int] = {}
+        for _path, entry in cache.iter_entries():
+            kinds[entry.get("kind", "?")] = kinds.get(entry.get("kind", "?"), 0) + 1
+        objects = list(cache.iter_objects())
+        size = sum(p.stat().st_size for p in objects)
+        print(f"Store: {cache.root}")
+        print(f"Entries: {sum(kinds.values())} ({', '.join(f'{n} {k}' for k, n in sorted(kinds.items())) or 'none'})")
+        print(f"Objects: {len(objects)}, {fmt_size(size)} of {fmt_size(cache.max_bytes)}")
+
+    elif args.command == "export":
+        if args.dest.is_dir() or not args.dest.name.endswith((".tar", ".gz", ".tgz")):
+            target = ArtifactCache(args.dest, site_root=cache.site_root)
+            args.dest.mkdir(parents=True, exist_ok=True)
+            added, objects = target.merge_from(cache.root)
+            print(f"Merged {added} entries ({objects} new objects) into {args.dest}")
+        else:
+            count = cache.export_tar(args.dest)
+            print(f"Wrote {count} entries to {args.dest} ({fmt_size(args.dest.stat().st_size)})")
+
+    elif args.command == "import":
+        if not args.src.exists():
+            print(f"Error: {args.src} not found")
+            sys.exit(1)
+        added, objects = cache.merge_from(args.src) if args.src.is_dir() else cache.import_tar(args.src)
+        print(f"Imported {added} entries ({objects} new objects) into {cache.root}")
+        removed, freed = cache.evict()
+        if removed:
+            print(f"Evicted {removed} least recently used entries ({fmt_size(freed)})")
+
+    elif args.command == "evict":
+        limit = parse_size(args.max_size) if args.max_size else cache.max_bytes
+        removed, freed = cache.evict(limit)
+        print(f"Evicted {removed} entries, freed {fmt_size(freed)}; {fmt_size(cache.size())} left")
+
+    elif args.command == "clear":
+        for sub_dir in ("objects", "entries"):
+            shutil.rmtree(cache.root / sub_dir, ignore_errors=True)
+        print(f"Cleared {cache.root}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,215 @@
+"""
+Dist assembly: build the publishable tree (dist/, next to topdotSite/) from an allow-list.
+
+topdotSite/ also holds things that must never ship (data/sheets/*.csv, tools/, build state
+in data/_*.json, .DS_Store, blogImages.zip, Gallery/Obsolete/). dist/ gets only the files
+matched by ALLOW, minus DENY_PATHS/DENY_NAMES. Patterns match one path segment per "/"-part
+("**" spans any number of segments), so "data/*.json" never reaches into data/sheets/.
+Files are placed as:
+- reflink (FICLONE; copy-on-write clone on btrfs/XFS-style filesystems, Linux) when supported,
+- otherwise a plain copy.
+So on a reflink-capable filesystem a fresh bundle of the image tree costs almost no I/O or disk.
+
+Runs are incremental: entries whose source is unchanged (same inode for hardlinks, same size
+and mtime otherwise) are left alone, changed ones are relinked, and files that left the
+allow-list are removed (with any directories that become empty).
+
+--mode hardlink is faster still, but only safe if nothing rewrites a source in place: several
+pipeline scripts write their outputs in place, which would silently change the dist/ copy too.
+So auto never picks it.
+
+Run after the other pipeline scripts, then deploy dist/:
+  python topdotSite/tools/pipeline/assemble_dist.py [--dist PATH] [--mode auto|reflink|hardlink|copy] [--dry-run]
+  python topdotSite/tools/deploy/deploy_site.py --source dist --target ...
+"""
+
+from __future__ import annotations
+
+import argparse
+import fnmatch
+import os
+import shutil
+import sys
+from pathlib import Path
+from typing import Dict, List, Set
+
+from reflink import reflink
+
+
+SITE_ROOT = Path(__file__).resolve().parents[2]
+DIST_DIR = SITE_ROOT.parent / "dist"
+
+# Relative paths that ship (case-insensitive; fnmatch per segment, "**" = any number of segments).
+ALLOW = (
+    "*.html",
+    "send-email.php",
+    ".htaccess",
+    "robots.txt",
+    "sitemap.xml",
+    "sw.js",
+    "css/**/*.css",
+    "js/*.js",
+    "partials/*.php",
+    "data/*.json",
+    "data/*.php",
+    "data/projects/**/*.json",
+    "data/blog/*.json",
+    "images/**/*.jpg",
+    "images/**/*.jpeg",
+    "images/**/*.png",
+    "images/**/*.gif",
+    "images/**/*.webp",
+    "images/**/*.svg",
+    "images/**/*.ico",
+    "images/**/*.mp4",
+    "images/**/*.webm",
+)
+# Sheet exports/fetch state and generated build state (_*) anywhere under data/ never ship,
+# whatever ALLOW says. DENY_NAMES are matched against every path segment.
+DENY_PATHS = ("data/sheets/**", "data/**/_*")
+DENY_NAMES = (".DS_Store", "Obsolete", "*.zip", "__pycache__")
+
+MODES = ("auto", "reflink", "hardlink", "copy")
+
+
+def match_segments(parts: List[str], pats: List[str]) -> bool:
+    if not pats:
+        return not parts
+    if pats[0] == "**":
+        return any(match_segments(parts[i:], pats[1:]) for i in range(len(parts) + 1))
+    return bool(parts) and fnmatch.fnmatchcase(parts[0], pats[0]) and match_segments(parts[1:], pats[1:])
+
+
+def match_path(rel: str, pattern: str) -> bool:
+    """fnmatch per "/"-segment: "*" never crosses a "/", "**" matches zero or more segments."""
+    return match_segments(rel.split("/"), pattern.split("/"))
+
+
+def is_allowed(rel: str) -> bool:
+    if not any(match_path(rel.lower(), pat) for pat in ALLOW):
+        return False
+    if any(match_path(rel, pat) for pat in DENY_PATHS):
+        return False
+    return not any(fnmatch.fnmatchcase(p, pat) for p in rel.split("/") for pat in DENY_NAMES)
+
+
+def allowed_files(site_root: Path) -> Dict[str, Path]:
+    """{relative path: source path} for every file that ships."""
+    found: Dict[str, Path] = {}
+    for dirpath, dirnames, filenames in os.walk(site_root):
+        rel_dir = Path(dirpath).relative_to(site_root).as_posix()
+        prefix = "" if rel_dir == "." else rel_dir + "/"
+        dirnames[:] = sorted(d for d in dirnames if not any(fnmatch.fnmatchcase(d, pat) for pat in DENY_NAMES))
+        for name in filenames:
+            if is_allowed(prefix + name):
+                found[prefix + name] = Path(dirpath) / name
+    return found
+
+
+class Linker:
+    """Places one file with the best available method, falling back as they fail."""
+
+    def __init__(self, mode: str) -> None:
+        order = {"auto": ["reflink", "copy"]}.get(mode, [mode])
+        self.methods = order
+        self.counts: Dict[str, int] = {m: 0 for m in ("reflink", "hardlink", "copy")}
+
+    def place(self, src: Path, dest: Path) -> None:
+        dest.parent.mkdir(parents=True, exist_ok=True)
+        tmp = dest.with_name(dest.name + ".dist-tmp")
+        tmp.unlink(missing_ok=True)
+        for method in list(self.methods):
+            try:
+                if method == "reflink":
+                    reflink(src, tmp)
+                elif method == "hardlink":
+                    os.link(src, tmp)
+                else:
+                    shutil.copy2(src, tmp)
+            except OSError as e:
+                if len(self.methods) == 1:
+                    raise
+                # Not supported here (filesystem, cross-device): don't try it again this run.
+                print(f"[WARN] {method} unavailable ({e.strerror or e}); falling back")
+                self.methods.remove(method)
+                continue
+            os.replace(tmp, dest)
+            self.counts[method] += 1
+            return
+        raise OSError(f"no link method left for {src}")
+
+
+def is_current(src: Path, dest: Path) -> bool:
+    """True if dest already mirrors src (same inode, or same size and mtime)."""
+    try:
+        d = dest.stat()
+    except FileNotFoundError:
+        return False
+    s = src.stat()
+    if (s.st_dev, s.st_ino) == (d.st_dev, d.st_ino):
+        return True
+    return s.st_size == d.st_size and s.st_mtime_ns == d.st_mtime_ns
+
+
+def existing_files(dist: Path) -> Set[str]:
+    out: Set[str] = set()
+    for dirpath, _dirnames, filenames in os.walk(dist):
+        rel_dir = Path(dirpath).relative_to(dist).as_posix()
+        prefix = "" if rel_dir == "." else rel_dir + "/"
+        out.update(prefix + name for name in filenames)
+    return out
+
+
+def remove_empty_dirs(dist: Path) -> None:
+    for dirpath, _dirnames, _filenames in os.walk(dist, topdown=False):
+        path = Path(dirpath)
+        if path != dist and not any(path.iterdir()):
+            path.rmdir()
+
+
+def parse_args() -> argparse.Namespace:
+    ap = argparse.ArgumentParser(description="Assemble the publishable site tree with links instead of copies.")
+    ap.add_argument("--dist", type=Path, default=DIST_DIR, help="Output directory (default: dist/ next to topdotSite/).")
+    ap.add_argument("--mode", choices=MODES, default="auto", help="How files are placed (auto tries reflink, then copy; hardlink only when asked).")
+    ap.add_argument("--dry-run", action="store_true", help="Report what would change; write nothing.")
+    return ap.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    dist = args.dist.resolve()
+    if dist == SITE_ROOT or SITE_ROOT in dist.parents:
+        print(f"Error: {dist} is inside the site tree")
+        sys.exit(1)
+
+    wanted = allowed_files(SITE_ROOT)
+    present = existing_files(dist) if dist.exists() else set()
+
+    to_place: List[str] = sorted(rel for rel, src in wanted.items() if not is_current(src, dist / rel))
+    to_remove: List[str] = sorted(present - set(wanted))
+    total = sum(src.stat().st_size for src in wanted.values())
+    print(f"Allow-list: {len(wanted)} files ({total / 1024 / 1024:.1f} MB)")
+    print(f"Changes: {len(to_place)} to link, {len(to_remove)} to remove, {len(wanted) - len(to_place)} unchanged")
+
+    if args.dry_run:
+        for rel in to_place:
+            print(f"  + {rel}")
+        for rel in to_remove:
+            print(f"  - {rel}")
+        print("\nDry run: nothing written.")
+        return
+
+    linker = Linker(args.mode)
+    for rel in to_place:
+        linker.place(wanted[rel], dist / rel)
+    for rel in to_remove:
+        (dist / rel).unlink()
+    if dist.exists():
+        remove_empty_dirs(dist)
+
+    used = ", ".join(f"{n} {m}" for m, n in linker.counts.items() if n) or "nothing to link"
+    print(f"\nWrote: {dist} ({used})")
+
+
+if __name__ == "__main__":
+    main()
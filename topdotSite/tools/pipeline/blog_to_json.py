@@ -0,0 +1,408 @@
+"""
+Blog compiler: Markdown posts -> blog JSON.
+
+Reads topdotSite/content/blog/<id>.md (the post id is the file name) and generates:
+- topdotSite/data/blog/<id>.json (detail, read by blog-post.js)
+- topdotSite/data/blog.json (listing, with excerpt and reading time, newest first)
+- topdotSite/data/blog.php (PHP mirror for partials/blog-grid.php)
+
+Posts are compiled incrementally: a post whose source hash is unchanged (state in
+data/_blog-build.json) is not re-parsed, and its detail JSON is left alone. Fields added by
+build_blog_media.py (image sizes/srcset, embed posters) are carried over when a post is
+recompiled. Detail JSON of deleted or draft posts is removed.
+
+Source format: front matter, then the body.
+
+  ---
+  title: Building a House
+  date: 2024-05-01
+  tags: ["permits", "planning"]
+  featuredImage: images/blogImages/building-a-house/Featured.jpg
+  description: Meta description for search results.
+  ---
+
+  Intro paragraphs, until the first section heading.
+
+  ## Finding the Right Location {#optional-anchor-id}
+
+  A paragraph with **bold** and [a link](best-location-for-building-a-house.html).
+
+  ![Alt text](images/blogImages/building-a-house/Gallery/01.jpg)
+
+  <iframe src="https://..." height="500px" title="Map"></iframe>
+
+Front matter values are plain text, or JSON ("[...]", "null", numbers, quoted strings).
+Optional keys: date (YYYY-MM-DD), tags, thumbnail (listing image; defaults to featuredImage),
+excerpt (defaults to the start of the first paragraph), slug, legacyHtml, draft (true = skip).
+
+The body is a small Markdown subset, matching what blog-post.js renders: blank lines separate
+blocks; "## " starts a section; a block that is only an image or an <iframe> becomes that
+block; anything else is a paragraph. Inline, **bold** and [text](url) links are converted
+(links open in a new tab, as the legacy posts did); other inline HTML is kept as written.
+A paragraph ending in {indent=30} is indented by that many px. \\*, \\[, \\], \\{, \\}, \\# and
+\\\\ escape those characters.
+
+Run:
+  python topdotSite/tools/pipeline/blog_to_json.py [--force] [--dry-run]
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import html
+import json
+import math
+import re
+import sys
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from change_report import write_section
+from sheets_to_projects_json import slugify, write_php_data
+
+
+SITE_ROOT = Path(__file__).resolve().parents[2]
+CONTENT_DIR = SITE_ROOT / "content" / "blog"
+DATA_DIR = SITE_ROOT / "data"
+BLOG_DIR = DATA_DIR / "blog"
+BLOG_JSON = DATA_DIR / "blog.json"
+BLOG_PHP = DATA_DIR / "blog.php"
+STATE_PATH = DATA_DIR / "_blog-build.json"
+
+# Bump when the output format changes, so every post is recompiled once.
+COMPILER_VERSION = 1
+
+WORDS_PER_MINUTE = 230
+EXCERPT_CHARS = 180
+
+# Written into the detail JSON by build_blog_media.py; kept when a post is recompiled.
+MEDIA_FIELDS = ("featuredImageMeta",)
+MEDIA_BLOCK_FIELDS = ("width", "height", "srcset", "sizes", "poster", "provider")
+
+DATE_RE = re.compile(r"^\d{4}-\d{2}-\d{2}$")
+HEADING_RE = re.compile(r"^##\s+(.+?)(?:\s+\{#([\w-]+)\})?\s*$")
+IMAGE_RE = re.compile(r"^!\[([^\]]*)\]\(([^)\s]+)\)$")
+IFRAME_RE = re.compile(r"^<iframe\b([^>]*)>\s*</iframe>$", re.IGNORECASE)
+ATTR_RE = re.compile(r'(\w+)=["\']([^"\']*)["\']')
+INDENT_RE = re.compile(r"\s*\{indent=(\d+(?:\.\d+)?)\}\s*$")
+ESCAPE_RE = re.compile(r"\\([\\*\[\]{}#])")
+INLINE_RE = re.compile(r"\\([\\*\[\]{}#])|(<[^>]+>)|(\*\*)|(\[)|\]\(([^)\s]*)\)")
+
+
+class PostError(ValueError):
+    pass
+
+
+def source_hash(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()[:16]
+
+
+def split_front_matter(text: str) -> Tuple[Dict[str, Any], str]:
+    lines = text.lstrip("﻿").splitlines()
+    if not lines or lines[0].strip() != "---":
+        raise PostError("missing front matter (a '---' line first)")
+    try:
+        end = next(i for i in range(1, len(lines)) if lines[i].strip() == "---")
+    except StopIteration:
+        raise PostError("front matter is not closed with '---'") from None
+
+    meta: Dict[str, Any] = {}
+    for n, line in enumerate(lines[1:end], start=2):
+        if not line.strip() or line.lstrip().startswith("#"):
+            continue
+        key, sep, value = line.partition(":")
+        if not sep:
+            raise PostError(f"line {n}: expected 'key: value'")
+        meta[key.strip()] = parse_value(value.strip())
+    return meta, "\n".join(lines[end + 1 :])
+
+
+def parse_value(value: str) -> Any:
+    if not value:
+        return None
+    if value[0] in '["{' or value in {"null", "true", "false"} or re.fullmatch(r"-?\d+(\.\d+)?", value):
+        try:
+            return json.loads(value)
+        except ValueError:
+            pass
+    return value
+
+
+def render_inline(text: str) -> str:
+    """The inline Markdown subset -> HTML (raw HTML passes through)."""
+    out: List[str] = []
+    links: List[int] = []
+    strong = False
+    pos = 0
+    for m in INLINE_RE.finditer(text):
+        out.append(text[pos : m.start()])
+        pos = m.end()
+        escaped, raw, bold, open_link, href = m.groups()
+        if escaped is not None:
+            out.append(escaped)
+        elif raw is not None:
+            out.append(raw)
+        elif bold is not None:
+            out.append("</strong>" if strong else "<strong>")
+            strong = not strong
+        elif open_link is not None:
+            links.append(len(out))
+            out.append("[")
+        elif links:
+            out[links.pop()] = f'<a href="{href}" target="_blank">'
+            out.append("</a>")
+        else:
+            out.append(m.group(0))
+    out.append(text[pos:])
+    if strong:
+        out.append("</strong>")
+    return "".join(out)
+
+
+def plain_text(fragment: str) -> str:
+    text = re.sub(r"<br\s*/?>", " ", fragment, flags=re.IGNORECASE)
+    text = re.sub(r"<[^>]+>", "", text)
+    return re.sub(r"\s+", " ", html.unescape(text)).strip()
+
+
+def parse_block(chunk: str) -> Dict[str, Any]:
+    one_line = chunk.strip()
+    m = IMAGE_RE.match(one_line)
+    if m:
+        return {"type": "img", "src": m.group(2), "alt": m.group(1)}
+    m = IFRAME_RE.match(one_line)
+    if m:
+        attrs = dict(ATTR_RE.findall(m.group(1)))
+        if not attrs.get("src"):
+            raise PostError(f"<iframe> without src: {one_line[:60]}")
+        return {"type": "iframe", "src": attrs["src"], "height": attrs.get("height", ""), "title": attrs.get("title", "")}
+
+    indent: Optional[float] = None
+    m = INDENT_RE.search(chunk)
+    if m:
+        indent = float(m.group(1))
+        chunk = chunk[: m.start()]
+    return {"type": "p", "html": render_inline(chunk.strip()), "indent": indent}
+
+
+def parse_body(body: str) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+    """(intro blocks, sections) from the Markdown body."""
+    intro: List[Dict[str, Any]] = []
+    sections: List[Dict[str, Any]] = []
+    blocks = intro
+    chunk: List[str] = []
+
+    def flush() -> None:
+        if chunk:
+            blocks.append(parse_block("\n".join(chunk)))
+            chunk.clear()
+
+    for line in body.splitlines():
+        heading = HEADING_RE.match(line)
+        if heading:
+            flush()
+            title = ESCAPE_RE.sub(r"\1", heading.group(1))
+            sections.append({"id": heading.group(2) or slugify(title), "title": title, "blocks": []})
+            blocks = sections[-1]["blocks"]
+        elif not line.strip():
+            flush()
+        else:
+            chunk.append(line)
+    flush()
+    return intro, sections
+
+
+def paragraphs(intro: List[Dict[str, Any]], sections: List[Dict[str, Any]]) -> List[str]:
+    out = [b["html"] for b in intro if b["type"] == "p"]
+    for s in sections:
+        out.append(s["title"])
+        out.extend(b["html"] for b in s["blocks"] if b["type"] == "p")
+    return out
+
+
+def make_excerpt(intro: List[Dict[str, Any]], sections: List[Dict[str, Any]]) -> str:
+    first = next((b["html"] for b in intro + [b for s in sections for b in s["blocks"]] if b["type"] == "p"), "")
+    text = plain_text(first)
+    if len(text) <= EXCERPT_CHARS:
+        return text
+    cut = text[:EXCERPT_CHARS].rsplit(" ", 1)[0]
+    return cut.rstrip(" ,;:.-–—") + "…"
+
+
+def compile_post(post_id: str, text: str) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """(detail, listing entry) for one post source."""
+    meta, body = split_front_matter(text)
+    title = str(meta.get("title") or "").strip()
+    if not title:
+        raise PostError("front matter has no title")
+    date = meta.get("date")
+    if date is not None and not DATE_RE.match(str(date)):
+        raise PostError(f"date must be YYYY-MM-DD, got {date!r}")
+    tags = meta.get("tags") or []
+    if isinstance(tags, str):
+        tags = [t.strip() for t in tags.split(",") if t.strip()]
+
+    intro, sections = parse_body(body)
+    words = sum(len(plain_text(p).split()) for p in paragraphs(intro, sections))
+    reading_minutes = max(1, math.ceil(words / WORDS_PER_MINUTE))
+    slug = meta.get("slug") or slugify(title)
+    featured = meta.get("featuredImage") or ""
+
+    detail: Dict[str, Any] = {
+        "id": post_id,
+        "title": title,
+        "slug": slug,
+        "date": date,
+        "featuredImage": featured,
+        "meta": {"description": meta.get("description") or ""},
+        "intro": intro,
+        "sections": sections,
+    }
+    entry: Dict[str, Any] = {
+        "id": post_id,
+        "title": title,
+        "slug": slug,
+        "date": date,
+        "tags": tags,
+        "thumbnail": meta.get("thumbnail") or featured,
+        "href": f"blog-post.html?id={post_id}",
+        "detailJson": f"data/blog/{post_id}.json",
+    }
+    if meta.get("legacyHtml"):
+        detail["legacyHtml"] = entry["legacyHtml"] = meta["legacyHtml"]
+    detail["wordCount"] = entry["wordCount"] = words
+    detail["readingMinutes"] = entry["readingMinutes"] = reading_minutes
+    entry["excerpt"] = str(meta.get("excerpt") or make_excerpt(intro, sections))
+    return detail, entry
+
+
+def carry_media_fields(detail: Dict[str, Any], old: Dict[str, Any]) -> None:
+    """Copy build_blog_media.py's fields from the previous detail JSON (matched by block type + src)."""
+    for key in MEDIA_FIELDS:
+        if key in old and old.get("featuredImage") == detail.get("featuredImage"):
+            detail[key] = old[key]
+
+    def blocks(post: Dict[str, Any]) -> List[Dict[str, Any]]:
+        return list(post.get("intro") or []) + [b for s in post.get("sections") or [] for b in s.get("blocks") or []]
+
+    previous = {(b.get("type"), b.get("src")): b for b in blocks(old) if b.get("src")}
+    for block in blocks(detail):
+        prev = previous.get((block.get("type"), block.get("src")))
+        if prev:
+            block.update({k: prev[k] for k in MEDIA_BLOCK_FIELDS if k in prev})
+
+
+def listing_sort_key(entry: Dict[str, Any]) -> tuple:
+    # Newest first; undated posts after dated ones, by id.
+    date = entry.get("date") or ""
+    return (date == "", [-ord(c) for c in date], entry["id"])
+
+
+def load_state() -> Dict[str, Any]:
+    if STATE_PATH.exists():
+        try:
+            state = json.loads(STATE_PATH.read_text(encoding="utf-8"))
+            if state.get("compiler") == COMPILER_VERSION:
+                return state
+        except ValueError:
+            pass
+    return {"compiler": COMPILER_VERSION, "posts": {}}
+
+
+def write_if_changed(path: Path, text: str) -> bool:
+    if path.exists() and path.read_text(encoding="utf-8") == text:
+        return False
+    path.write_text(text, encoding="utf-8")
+    return True
+
+
+def parse_args() -> argparse.Namespace:
+    ap = argparse.ArgumentParser(description="Compile Markdown blog posts into the blog JSON.")
+    ap.add_argument("--force", action="store_true", help="Recompile every post, even if unchanged.")
+    ap.add_argument("--dry-run", action="store_true", help="Report what would change; write nothing.")
+    return ap.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    if not CONTENT_DIR.exists():
+        print(f"Error: {CONTENT_DIR} not found")
+        sys.exit(1)
+
+    state = load_state()
+    old_posts: Dict[str, Any] = state["posts"]
+    new_posts: Dict[str, Any] = {}
+    details: Dict[str, Dict[str, Any]] = {}
+    errors = 0
+    drafts: List[str] = []
+
+    for path in sorted(CONTENT_DIR.glob("*.md")):
+        post_id = path.stem
+        raw = path.read_bytes()
+        digest = source_hash(raw)
+        prev = old_posts.get(post_id)
+        if not args.force and prev and prev["source"] == digest and (BLOG_DIR / f"{post_id}.json").exists():
+            new_posts[post_id] = prev
+            continue
+        try:
+            text = raw.decode("utf-8")
+            if split_front_matter(text)[0].get("draft") is True:
+                drafts.append(post_id)
+                continue
+            detail, entry = compile_post(post_id, text)
+        except (PostError, UnicodeDecodeError) as e:
+            print(f"[ERROR] {path.relative_to(SITE_ROOT)}: {e}")
+            errors += 1
+            continue
+        details[post_id] = detail
+        new_posts[post_id] = {"source": digest, "entry": entry}
+
+    if errors:
+        print(f"\n[ERROR] {errors} post(s) failed; nothing written.")
+        sys.exit(1)
+
+    removed = sorted(set(old_posts) - set(new_posts))
+    added = sorted(p for p in details if p not in old_posts)
+    updated = sorted(p for p in details if p in old_posts)
+    for pid in added:
+        print(f"  + {pid}")
+    for pid in updated:
+        print(f"  ~ {pid}")
+    for pid in removed:
+        print(f"  - {pid}" + (" (draft)" if pid in drafts else ""))
+
+    listing = sorted((p["entry"] for p in new_posts.values()), key=listing_sort_key)
+    if args.dry_run:
+        print(f"\nDry run: {len(details)} to compile, {len(new_posts) - len(details)} unchanged, {len(removed)} to remove.")
+        return
+
+    BLOG_DIR.mkdir(parents=True, exist_ok=True)
+    for pid, detail in details.items():
+        out = BLOG_DIR / f"{pid}.json"
+        if out.exists():
+            try:
+                carry_media_fields(detail, json.loads(out.read_text(encoding="utf-8")))
+            except ValueError:
+                pass
+        write_if_changed(out, json.dumps(detail, indent=2) + "\n")
+    for pid in removed:
+        (BLOG_DIR / f"{pid}.json").unlink(missing_ok=True)
+
+    listing_changed = write_if_changed(BLOG_JSON, json.dumps(listing, indent=2) + "\n")
+    if listing_changed or not BLOG_PHP.exists():
+        write_php_data(BLOG_PHP, listing, generator="tools/pipeline/blog_to_json.py")
+
+    state["posts"] = new_posts
+    STATE_PATH.write_text(json.dumps(state, indent=2) + "\n", encoding="utf-8")
+
+    report = [f"{len(listing)} posts: {len(added)} added, {len(updated)} updated, {len(removed)} removed"]
+    report += [f"  + {p}" for p in added] + [f"  ~ {p}" for p in updated] + [f"  - {p}" for p in removed]
+    write_section("Blog", report)
+
+    print(f"\nCompiled {len(details)} posts ({len(new_posts) - len(details)} unchanged) -> data/blog/")
+    print(f"Wrote {len(listing)} posts -> data/blog.json" + ("" if listing_changed else " (unchanged)"))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,266 @@
+"""
+Blog media: responsive image variants and click-to-load embed facades for blog posts.
+
+Walks every data/blog/<id>.json (intro + section blocks) and updates it in place:
+- img blocks (and the post's featuredImage): records the intrinsic width/height and writes
+  resized JPEG variants under images/_derived/blog/<id>/ (BLOG_WIDTHS, never upscaled).
+  Blocks get width/height/srcset/sizes so blog-post.js reserves layout space and the browser
+  picks the smallest file that fits. Needs Pillow; without it, images are left as they are.
+- iframe blocks: writes a small SVG poster (provider + title, no network access) under the
+  same folder and records facade metadata, so the post renders a static placeholder and only
+  loads the third-party embed when the reader clicks it.
+
+Variants are rebuilt only when the source image hash changes (or with --force); state is
+kept in data/_blog-media.json. Built variants go through the shared artifact cache
+(artifact_cache.py) unless --no-cache is given.
+
+Run:
+  python topdotSite/tools/pipeline/build_blog_media.py [--dry-run] [--force] [--no-cache]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from urllib.parse import urlparse
+from xml.sax.saxutils import escape
+
+try:
+    from PIL import Image, ImageOps
+except ImportError:  # Optional dependency; checked in main().
+    Image = None
+
+from artifact_cache import ArtifactCache, open_cache
+from build_image_derivatives import restore_or_build, save_image
+from project_store import content_hash
+
+
+SITE_ROOT = Path(__file__).resolve().parents[2]
+DATA_DIR = SITE_ROOT / "data"
+BLOG_DIR = DATA_DIR / "blog"
+BLOG_DERIVED_DIR = SITE_ROOT / "images" / "_derived" / "blog"
+MEDIA_STATE_PATH = DATA_DIR / "_blog-media.json"
+
+BLOG_WIDTHS = (480, 960, 1600)
+BLOG_QUALITY = 80
+# The post column is roughly two thirds of the viewport on desktop, full width on phones.
+BLOG_SIZES = "(max-width: 767px) 100vw, 66vw"
+
+POSTER_WIDTH = 1200
+POSTER_HEIGHT = 500
+
+# Friendly names for embed hosts we know about; anything else shows the hostname.
+EMBED_PROVIDERS = {
+    "storymaps.arcgis.com": "ArcGIS StoryMaps",
+    "www.arcgis.com": "ArcGIS",
+    "www.youtube.com": "YouTube",
+    "www.youtube-nocookie.com": "YouTube",
+    "player.vimeo.com": "Vimeo",
+    "www.google.com": "Google Maps",
+}
+
+
+def rel_path(p: Path) -> str:
+    return p.relative_to(SITE_ROOT).as_posix()
+
+
+def iter_blocks(post: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+    """Yield intro and section blocks in document order."""
+    for b in post.get("intro") or []:
+        if isinstance(b, dict):
+            yield b
+    for s in post.get("sections") or []:
+        for b in (s or {}).get("blocks") or []:
+            if isinstance(b, dict):
+                yield b
+
+
+def variant_path(post_id: str, src: Path, width: int) -> Path:
+    return BLOG_DERIVED_DIR / post_id / f"{src.stem}-{width}.jpg"
+
+
+def variant_widths(width: int) -> List[int]:
+    """Widths to generate for a source of the given width (no upscaling, always at least one)."""
+    widths = [w for w in BLOG_WIDTHS if w < width]
+    if width <= BLOG_WIDTHS[-1]:
+        widths.append(width)
+    return widths
+
+
+def sync_image(
+    post_id: str,
+    src_rel: str,
+    state: Dict[str, Any],
+    force: bool,
+    dry_run: bool,
+    sizes: str = BLOG_SIZES,
+    cache: Optional[ArtifactCache] = None,
+) -> Dict[str, Any]:
+    """
+    Build variants for one image and return its media fields (width/height/srcset/sizes).
+
+    Returns {} if the source is missing or unreadable.
+    """
+    src = SITE_ROOT / src_rel
+    if not src.exists():
+        print(f"  [WARN] {post_id}: image not found: {src_rel}")
+        return {}
+
+    key = f"{post_id}:{src_rel}"
+    digest = content_hash(src)
+    entry = state.get(key)
+    fresh = (
+        not force
+        and entry
+        and entry.get("source") == digest
+        and all(variant_path(post_id, src, w).exists() for w in entry.get("widths", []))
+    )
+
+    if not fresh:
+        print(f"  {post_id}: variants for {src_rel}")
+        if dry_run:
+            return {}
+
+        def build() -> Tuple[Dict[str, Any], List[Path]]:
+            with Image.open(src) as opened:
+                img = ImageOps.exif_transpose(opened)
+                if img.mode not in {"RGB", "L"}:
+                    img = img.convert("RGB")
+                width, height = img.size
+                widths = variant_widths(width)
+                for w in widths:
+                    out = variant_path(post_id, src, w)
+                    out.parent.mkdir(parents=True, exist_ok=True)
+                    save_image(img.resize((w, round(height * w / width)), Image.LANCZOS), out, "jpg", BLOG_QUALITY)
+            return {"width": width, "height": height, "widths": widths}, [variant_path(post_id, src, w) for w in widths]
+
+        params = {"out": rel_path(BLOG_DERIVED_DIR / post_id / src.stem), "widths": list(BLOG_WIDTHS), "quality": BLOG_QUALITY}
+        try:
+            built = restore_or_build(cache, "blog", digest, params, build, force)
+        except OSError as e:
+            print(f"  [WARN] {post_id}: cannot read {src_rel} ({e})")
+            return {}
+        entry = {"source": digest, **built}
+        state[key] = entry
+
+    return {
+        "width": entry["width"],
+        "height": entry["height"],
+        "srcset": ", ".join(f"{rel_path(variant_path(post_id, src, w))} {w}w" for w in entry["widths"]),
+        "sizes": sizes,
+    }
+
+
+def embed_provider(url: str) -> str:
+    host = urlparse(url).netloc.lower()
+    return EMBED_PROVIDERS.get(host, host or "External content")
+
+
+def poster_svg(provider: str, title: str) -> str:
+    """A neutral placeholder: provider name, optional title and a play mark."""
+    cx, cy = POSTER_WIDTH // 2, POSTER_HEIGHT // 2 - 30
+    lines = [
+        f'<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 {POSTER_WIDTH} {POSTER_HEIGHT}" '
+        f'width="{POSTER_WIDTH}" height="{POSTER_HEIGHT}">',
+        f'<rect width="{POSTER_WIDTH}" height="{POSTER_HEIGHT}" fill="#eceae6"/>',
+        f'<circle cx="{cx}" cy="{cy}" r="44" fill="#1f1f1f" fill-opacity="0.85"/>',
+        f'<path d="M{cx - 14} {cy - 22} L{cx + 24} {cy} L{cx - 14} {cy + 22} Z" fill="#ffffff"/>',
+        f'<text x="{cx}" y="{cy + 90}" text-anchor="middle" font-family="Helvetica, Arial, sans-serif" '
+        f'font-size="30" fill="#1f1f1f">{escape(provider)}</text>',
+    ]
+    if title:
+        lines.append(
+            f'<text x="{cx}" y="{cy + 130}" text-anchor="middle" font-family="Helvetica, Arial, sans-serif" '
+            f'font-size="22" fill="#555555">{escape(title[:80])}</text>'
+        )
+    lines.append("</svg>")
+    return "\n".join(lines) + "\n"
+
+
+def sync_embed(post_id: str, index: int, block: Dict[str, Any], dry_run: bool) -> Dict[str, Any]:
+    """Write the poster for one iframe block and return its facade fields."""
+    src = block.get("src") or ""
+    if not src:
+        return {}
+    provider = embed_provider(src)
+    out = BLOG_DERIVED_DIR / post_id / f"embed-{index:02d}.svg"
+    svg = poster_svg(provider, block.get("title") or "")
+    if not out.exists() or out.read_text(encoding="utf-8") != svg:
+        print(f"  {post_id}: embed poster {rel_path(out)}")
+        if not dry_run:
+            out.parent.mkdir(parents=True, exist_ok=True)
+            out.write_text(svg, encoding="utf-8")
+    return {"poster": rel_path(out), "provider": provider}
+
+
+def process_post(path: Path, state: Dict[str, Any], args: argparse.Namespace) -> bool:
+    """Update one post JSON in place. Returns True if it changed."""
+    post = json.loads(path.read_text(encoding="utf-8"))
+    post_id = post.get("id") or path.stem
+    before = json.dumps(post, sort_keys=True)
+
+    if Image is not None:
+        featured = post.get("featuredImage")
+        if featured:
+            fields = sync_image(post_id, featured, state, args.force, args.dry_run, "100vw", args.cache)
+            if fields:
+                post["featuredImageMeta"] = fields
+
+    embed_index = 0
+    for block in iter_blocks(post):
+        if block.get("type") == "img" and block.get("src") and Image is not None:
+            block.update(sync_image(post_id, block["src"], state, args.force, args.dry_run, cache=args.cache))
+        elif block.get("type") == "iframe":
+            embed_index += 1
+            block.update(sync_embed(post_id, embed_index, block, args.dry_run))
+
+    if json.dumps(post, sort_keys=True) == before:
+        return False
+    if not args.dry_run:
+        path.write_text(json.dumps(post, indent=2) + "\n", encoding="utf-8")
+    return True
+
+
+def parse_args() -> argparse.Namespace:
+    ap = argparse.ArgumentParser(description="Build blog image variants and embed facades.")
+    ap.add_argument("--dry-run", action="store_true", help="Report work without writing files.")
+    ap.add_argument("--force", action="store_true", help="Rebuild variants even if sources are unchanged.")
+    ap.add_argument("--no-cache", action="store_true", help="Do not use the shared artifact cache.")
+    return ap.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+
+    if not BLOG_DIR.exists():
+        print(f"Error: {BLOG_DIR} not found")
+        sys.exit(1)
+
+    if Image is None:
+        print("[WARN] Pillow is not installed (pip install Pillow); only embed facades will be built.")
+
+    args.cache = None if args.dry_run or Image is None else open_cache(args.no_cache)
+
+    state: Dict[str, Any] = {}
+    if MEDIA_STATE_PATH.exists():
+        state = json.loads(MEDIA_STATE_PATH.read_text(encoding="utf-8"))
+
+    for path in sorted(BLOG_DIR.glob("*.json")):
+        if process_post(path, state, args):
+            print(f"  Updated {rel_path(path)}")
+
+    if not args.dry_run and Image is not None:
+        MEDIA_STATE_PATH.write_text(json.dumps(state, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+
+    if args.cache:
+        print(args.cache.report())
+        args.cache.evict()
+
+    print("\nBlog media complete." + (" (dry-run)" if args.dry_run else ""))
+
+
+if __name__ == "__main__":
+    main()
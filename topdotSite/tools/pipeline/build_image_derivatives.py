@@ -0,0 +1,915 @@
+"""
+Image derivatives: build derived image assets after the assets sync.
+
+Stages (in order):
+- optimize: lossless recompression of the originals in place: jpegtran (optimized Huffman
+  tables + progressive scans, metadata kept) for JPEGs and a max-compression re-deflate for PNGs.
+  A result is kept only if it is smaller and decodes to bit-identical pixels. Results are cached
+  by content hash (data/_image-optim-cache.json) so each image is optimized once, and bytes
+  saved per project go into data/_change-report.txt.
+- cards: listing card thumbnails at the grid's aspect ratio and DPR steps. The crop is
+  centred on an entropy x edge-strength saliency estimate of Featured.<ext>, or on the
+  focal_point column from Projects.csv (detail focalPoint) when set. projects.json (and
+  its shards/PHP mirror) then point thumbnail/thumbnailSrcset at the cards.
+- tiles: DZI-style tile pyramids (256px tiles per zoom level) for large gallery images,
+  plus a single-file preview. Recorded in detail JSON as galleryMeta[<image>].tiles so the
+  lightbox can show the preview instantly and stream only the visible tiles when zooming
+  (each click steps one pyramid level closer to full resolution). Pyramids of images that
+  left a gallery, or of projects that left the listing, are deleted on each run.
+- animations: animated gallery images (GIF, APNG, animated WebP) are transcoded to an
+  animated WebP, plus an H.264 MP4 loop when ffmpeg is on PATH (kept only if smaller), and
+  a static poster (first frame). Recorded as galleryMeta[<image>].animation; the gallery
+  grid shows the poster and only the lightbox loads the animation. Animated images are
+  never tiled.
+
+Outputs go under topdotSite/images/_derived/ (generated; safe to delete and rebuild).
+Derivatives are rebuilt only when the source image hash changes (or with --force). Cards,
+tiles and animations also go through the shared artifact cache (artifact_cache.py), so a
+clean checkout restores what any machine already built; --no-cache bypasses it.
+Source hashes come from the project store (data/_project-store.sqlite), so an original is
+only re-read when its size or mtime changed, and every variant built is recorded there.
+
+Requires Pillow (pip install Pillow). Without it the script reports and exits without changes.
+JPEG optimization also needs jpegtran (libjpeg-turbo) on PATH; it is skipped otherwise.
+Video loops need ffmpeg with libx264; without it animations get the WebP only (rerun with
+--force after installing it to add the videos).
+
+Run:
+  python topdotSite/tools/pipeline/build_image_derivatives.py [--dry-run] [--force]
+      [--stages optimize,cards,tiles,animations]
+      [--tile-format jpg|webp] [--no-cache]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import math
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+try:
+    from PIL import Image, ImageFilter, ImageOps, ImageSequence, ImageStat
+    from PIL import __version__ as PILLOW_VERSION
+except ImportError:  # Optional dependency; checked in main().
+    Image = None
+    PILLOW_VERSION = ""
+
+from artifact_cache import ArtifactCache, open_cache
+from change_report import write_section
+from project_store import ProjectStore, content_hash, open_store
+from sheets_to_projects_json import (
+    CARD_ASPECT,
+    CARD_WIDTHS,
+    card_thumbnail_fields,
+    card_thumbnail_path,
+    write_listing_outputs,
+)
+
+
+SITE_ROOT = Path(__file__).resolve().parents[2]
+DATA_DIR = SITE_ROOT / "data"
+PROJECTS_JSON = DATA_DIR / "projects.json"
+PROJECTS_DIR = DATA_DIR / "projects"
+DERIVED_DIR = SITE_ROOT / "images" / "_derived"
+TILES_DIR = DERIVED_DIR / "tiles"
+ANIMATIONS_DIR = DERIVED_DIR / "animations"
+OPTIM_CACHE_PATH = DATA_DIR / "_image-optim-cache.json"
+CARDS_STATE_PATH = DATA_DIR / "_card-thumbnails.json"
+
+STAGES = ("optimize", "cards", "tiles", "animations")
+
+ALLOWED_EXTENSIONS = {".jpg", ".jpeg", ".png", ".gif", ".webp"}
+
+# Tile pyramids are only worth it for big images.
+TILE_MIN_BYTES = 1_500_000
+TILE_MIN_EDGE = 2500
+TILE_SIZE = 256
+TILE_OVERLAP = 1
+TILE_QUALITY = 82
+PREVIEW_MAX_EDGE = 1600
+
+CARD_QUALITY = 80
+# Saliency is estimated on a downscaled copy split into roughly this many cells per side.
+SALIENCY_EDGE = 256
+SALIENCY_CELLS = 32
+
+# Animations are shown in the lightbox only, so they are capped at a lightbox-friendly size.
+ANIMATION_MAX_EDGE = 2560
+ANIMATION_QUALITY = 80
+POSTER_QUALITY = 82
+VIDEO_CRF = 28
+DEFAULT_FRAME_MS = 100
+ANIMATED_FORMATS = {"GIF", "PNG", "WEBP"}  # PNG covers APNG
+
+
+def is_image(p: Path) -> bool:
+    return p.suffix.lower() in ALLOWED_EXTENSIONS
+
+
+def rel_path(p: Path) -> str:
+    return str(p.relative_to(SITE_ROOT)).replace("\\", "/")
+
+
+def stored_hash(path: Path, store: Optional[ProjectStore]) -> str:
+    """content_hash(), reused from the project store while the file's size + mtime are unchanged."""
+    return store.file_hash(path) if store else content_hash(path)
+
+
+def save_image(img: "Image.Image", path: Path, fmt: str, quality: int) -> None:
+    """Save an RGB derivative as JPEG or WebP."""
+    if img.mode not in {"RGB", "L"}:
+        img = img.convert("RGB")
+    if fmt == "webp":
+        img.save(path, "WEBP", quality=quality, method=4)
+    else:
+        img.save(path, "JPEG", quality=quality, optimize=True, progressive=True)
+
+
+def restore_or_build(
+    cache: Optional[ArtifactCache],
+    kind: str,
+    source_hash: str,
+    params: Dict[str, Any],
+    build: Callable[[], Tuple[Dict[str, Any], List[Path]]],
+    force: bool,
+) -> Dict[str, Any]:
+    """
+    Metadata of a derivative, restoring its files from the artifact cache when it has them.
+
+    build() writes the files and returns (metadata, files written); its result is stored.
+    The key covers the source hash, the params and the Pillow version.
+    """
+    if cache is None:
+        return build()[0]
+    key = cache.key(kind, source_hash, params, f"Pillow {PILLOW_VERSION}")
+    if not force:
+        meta = cache.fetch(key)
+        if meta is not None:
+            print("    restored from artifact cache")
+            return meta
+    meta, files = build()
+    cache.store(key, kind, files, meta)
+    return meta
+
+
+def load_optim_cache() -> Dict[str, Any]:
+    """
+    Load the optimization cache.
+
+    files: rel path -> [size, mtime_ns, hash] (skip re-hashing unchanged files)
+    optimized: hash -> bytes saved (hashes already known to be optimal)
+    """
+    if OPTIM_CACHE_PATH.exists():
+        try:
+            cache = json.loads(OPTIM_CACHE_PATH.read_text(encoding="utf-8"))
+            return {"files": cache.get("files", {}), "optimized": cache.get("optimized", {})}
+        except ValueError:
+            pass
+    return {"files": {}, "optimized": {}}
+
+
+def save_optim_cache(cache: Dict[str, Any]) -> None:
+    OPTIM_CACHE_PATH.write_text(json.dumps(cache, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+
+
+def cached_hash(path: Path, cache: Dict[str, Any]) -> str:
+    """File hash, reusing the cached value while size + mtime are unchanged."""
+    st = path.stat()
+    rel = rel_path(path)
+    entry = cache["files"].get(rel)
+    if entry and entry[0] == st.st_size and entry[1] == st.st_mtime_ns:
+        return entry[2]
+    h = content_hash(path)
+    cache["files"][rel] = [st.st_size, st.st_mtime_ns, h]
+    return h
+
+
+def pixels_identical(a: Path, b: Path) -> bool:
+    """True if both files decode to the same mode, size, transparency and pixel bytes."""
+    with Image.open(a) as ia, Image.open(b) as ib:
+        if ia.size != ib.size or ia.mode != ib.mode:
+            return False
+        if ia.info.get("transparency") != ib.info.get("transparency"):
+            return False
+        return ia.tobytes() == ib.tobytes()
+
+
+def recompress(src: Path, tmp: Path, jpegtran: Optional[str]) -> bool:
+    """Write a losslessly recompressed copy of src to tmp. Returns False if not applicable."""
+    ext = src.suffix.lower()
+    if ext in {".jpg", ".jpeg"}:
+        if not jpegtran:
+            return False
+        subprocess.run(
+            [jpegtran, "-copy", "all", "-optimize", "-progressive", "-outfile", str(tmp), str(src)],
+            check=True,
+            capture_output=True,
+        )
+        return True
+    if ext == ".png":
+        with Image.open(src) as im:
+            if getattr(im, "is_animated", False):
+                return False
+            params: Dict[str, Any] = {"optimize": True, "compress_level": 9}
+            for key in ("icc_profile", "transparency", "dpi", "gamma"):
+                if key in im.info:
+                    params[key] = im.info[key]
+            im.save(tmp, "PNG", **params)
+        return True
+    return False
+
+
+def optimize_image(
+    path: Path,
+    cache: Dict[str, Any],
+    jpegtran: Optional[str],
+    dry_run: bool,
+) -> int:
+    """Losslessly optimize one original in place; returns bytes saved."""
+    h = cached_hash(path, cache)
+    if h in cache["optimized"]:
+        return 0
+
+    tmp = path.with_name(f".{path.name}.optim")
+    try:
+        if not recompress(path, tmp, jpegtran):
+            return 0
+        before = path.stat().st_size
+        after = tmp.stat().st_size
+        if after >= before or not pixels_identical(path, tmp):
+            cache["optimized"][h] = 0
+            return 0
+        if dry_run:
+            return before - after
+        os.replace(tmp, path)
+    except (OSError, subprocess.CalledProcessError) as e:
+        print(f"  [WARN] cannot optimize {rel_path(path)} ({e})")
+        return 0
+    finally:
+        if tmp.exists():
+            tmp.unlink()
+
+    saved = before - after
+    new_hash = cached_hash(path, cache)
+    cache["optimized"][new_hash] = saved
+    return saved
+
+
+def project_originals(detail: Dict[str, Any]) -> List[Path]:
+    """Featured + gallery originals of a project that exist on disk."""
+    rels = [detail.get("featuredImage", "")] + list(detail.get("gallery", []))
+    out = []
+    for rel in rels:
+        if not rel:
+            continue
+        p = SITE_ROOT / rel
+        if p.exists() and is_image(p) and p not in out:
+            out.append(p)
+    return out
+
+
+def saliency_profile(img: "Image.Image", axis: str) -> List[float]:
+    """
+    Saliency per column band (axis="x") or row band (axis="y").
+
+    Each cell of a downscaled grayscale copy scores local entropy x mean edge strength;
+    cells are summed across the other axis.
+    """
+    small = img.convert("L")
+    small.thumbnail((SALIENCY_EDGE, SALIENCY_EDGE))
+    edges = small.filter(ImageFilter.FIND_EDGES)
+    w, h = small.size
+    cell = max(4, max(w, h) // SALIENCY_CELLS)
+    cols, rows = math.ceil(w / cell), math.ceil(h / cell)
+    profile = [0.0] * (cols if axis == "x" else rows)
+    for cx in range(cols):
+        for cy in range(rows):
+            box = (cx * cell, cy * cell, min(w, (cx + 1) * cell), min(h, (cy + 1) * cell))
+            score = ImageStat.Stat(edges.crop(box)).mean[0] * small.crop(box).entropy()
+            profile[cx if axis == "x" else cy] += score
+    return profile
+
+
+def choose_crop(
+    img: "Image.Image",
+    aspect: float,
+    focal: Optional[List[float]] = None,
+) -> tuple[int, int, int, int]:
+    """
+    Largest crop box with the given aspect (width / height).
+
+    The box slides along the long axis: centred on the focal point if given, otherwise on
+    the window with the highest saliency (ties go to the most central window).
+    """
+    width, height = img.size
+    if width / height > aspect:
+        axis, span, win = "x", width, round(height * aspect)
+    else:
+        axis, span, win = "y", height, round(width / aspect)
+    if win >= span:
+        return (0, 0, width, height)
+
+    if focal:
+        center = (focal[0] if axis == "x" else focal[1]) * span
+    else:
+        profile = saliency_profile(img, axis)
+        n = len(profile)
+        k = max(1, min(n, round(win / span * n)))
+        prefix = [0.0]
+        for v in profile:
+            prefix.append(prefix[-1] + v)
+        mid = (n - k) / 2
+        best = max(range(n - k + 1), key=lambda i: (prefix[i + k] - prefix[i], -abs(i - mid)))
+        center = (best + k / 2) / n * span
+
+    start = int(round(min(max(center - win / 2, 0), span - win)))
+    if axis == "x":
+        return (start, 0, start + win, height)
+    return (0, start, width, start + win)
+
+
+def build_card_thumbnails(project_id: str, featured: Path, focal: Optional[List[float]]) -> None:
+    """Write the card crops for one project at every CARD_WIDTHS step."""
+    with Image.open(featured) as opened:
+        img = ImageOps.exif_transpose(opened).convert("RGB")
+    crop = img.crop(choose_crop(img, CARD_ASPECT, focal))
+    for w in CARD_WIDTHS:
+        out = SITE_ROOT / card_thumbnail_path(project_id, w)
+        out.parent.mkdir(parents=True, exist_ok=True)
+        save_image(crop.resize((w, round(w / CARD_ASPECT)), Image.LANCZOS), out, "jpg", CARD_QUALITY)
+
+
+def sync_card_thumbnails(
+    project_id: str,
+    detail: Dict[str, Any],
+    state: Dict[str, Any],
+    force: bool,
+    dry_run: bool,
+    cache: Optional[ArtifactCache] = None,
+    store: Optional[ProjectStore] = None,
+) -> None:
+    """Build card thumbnails if the featured image, focal point or card settings changed."""
+    featured_rel = detail.get("featuredImage", "")
+    featured = SITE_ROOT / featured_rel if featured_rel else None
+    if not featured or not featured.exists():
+        return
+
+    wanted = {
+        "source": stored_hash(featured, store),
+        "focal": detail.get("focalPoint"),
+        "aspect": CARD_ASPECT,
+        "widths": list(CARD_WIDTHS),
+    }
+    built = all((SITE_ROOT / card_thumbnail_path(project_id, w)).exists() for w in CARD_WIDTHS)
+    if not force and built and state.get(project_id) == wanted:
+        return
+
+    print(f"  {project_id}: card thumbnails from {featured_rel}")
+    if dry_run:
+        return
+
+    def build() -> Tuple[Dict[str, Any], List[Path]]:
+        build_card_thumbnails(project_id, featured, wanted["focal"])
+        return {}, [SITE_ROOT / card_thumbnail_path(project_id, w) for w in CARD_WIDTHS]
+
+    params = {
+        "project": project_id,
+        "focal": wanted["focal"],
+        "aspect": CARD_ASPECT,
+        "widths": list(CARD_WIDTHS),
+        "quality": CARD_QUALITY,
+    }
+    restore_or_build(cache, "cards", wanted["source"], params, build, force)
+    state[project_id] = wanted
+
+
+def refresh_listing_thumbnails(listing: List[Dict[str, Any]]) -> bool:
+    """Point listing entries at their card thumbnails; rewrites listing outputs if anything changed."""
+    changed = False
+    for entry in listing:
+        fields = card_thumbnail_fields(entry.get("id", ""))
+        if fields and any(entry.get(k) != v for k, v in fields.items()):
+            entry.update(fields)
+            changed = True
+    if changed:
+        write_listing_outputs(listing)
+    return changed
+
+
+def needs_tiles(path: Path, width: int, height: int) -> bool:
+    return path.stat().st_size >= TILE_MIN_BYTES or max(width, height) >= TILE_MIN_EDGE
+
+
+def dzi_xml(width: int, height: int, fmt: str) -> str:
+    return (
+        '<?xml version="1.0" encoding="UTF-8"?>\n'
+        f'<Image xmlns="http://schemas.microsoft.com/deepzoom/2008" Format="{fmt}" '
+        f'Overlap="{TILE_OVERLAP}" TileSize="{TILE_SIZE}">\n'
+        f'  <Size Width="{width}" Height="{height}"/>\n'
+        "</Image>\n"
+    )
+
+
+def build_tile_pyramid(src: Path, out_base: Path, fmt: str) -> Dict[str, Any]:
+    """
+    Write <out_base>.dzi, <out_base>_files/<level>/<col>_<row>.<fmt> and <out_base>_preview.<fmt>.
+
+    Level maxLevel is full resolution; each lower level halves the previous one (DZI layout).
+    """
+    files_dir = out_base.parent / f"{out_base.name}_files"
+    if files_dir.exists():
+        shutil.rmtree(files_dir)
+
+    with Image.open(src) as opened:
+        img = opened.convert("RGB")
+    width, height = img.size
+    max_level = math.ceil(math.log2(max(width, height)))
+
+    level_img = img
+    for level in range(max_level, -1, -1):
+        scale = 2 ** (level - max_level)
+        lw = max(1, math.ceil(width * scale))
+        lh = max(1, math.ceil(height * scale))
+        if level_img.size != (lw, lh):
+            level_img = level_img.resize((lw, lh), Image.LANCZOS)
+
+        level_dir = files_dir / str(level)
+        level_dir.mkdir(parents=True, exist_ok=True)
+        cols = math.ceil(lw / TILE_SIZE)
+        rows = math.ceil(lh / TILE_SIZE)
+        for col in range(cols):
+            for row in range(rows):
+                x0 = col * TILE_SIZE - (TILE_OVERLAP if col > 0 else 0)
+                y0 = row * TILE_SIZE - (TILE_OVERLAP if row > 0 else 0)
+                x1 = min(lw, (col + 1) * TILE_SIZE + TILE_OVERLAP)
+                y1 = min(lh, (row + 1) * TILE_SIZE + TILE_OVERLAP)
+                save_image(level_img.crop((x0, y0, x1, y1)), level_dir / f"{col}_{row}.{fmt}", fmt, TILE_QUALITY)
+
+    preview = img.copy()
+    preview.thumbnail((PREVIEW_MAX_EDGE, PREVIEW_MAX_EDGE), Image.LANCZOS)
+    preview_path = out_base.parent / f"{out_base.name}_preview.{fmt}"
+    save_image(preview, preview_path, fmt, TILE_QUALITY)
+
+    dzi_path = out_base.parent / f"{out_base.name}.dzi"
+    dzi_path.write_text(dzi_xml(width, height, fmt), encoding="utf-8")
+
+    return {
+        "dzi": rel_path(dzi_path),
+        "preview": rel_path(preview_path),
+        "width": width,
+        "height": height,
+        "tileSize": TILE_SIZE,
+        "overlap": TILE_OVERLAP,
+        "format": fmt,
+        "maxLevel": max_level,
+    }
+
+
+def sync_tiles(
+    project_id: str,
+    image_rel: str,
+    meta: Dict[str, Any],
+    fmt: str,
+    force: bool,
+    dry_run: bool,
+    cache: Optional[ArtifactCache] = None,
+    store: Optional[ProjectStore] = None,
+) -> Optional[Dict[str, Any]]:
+    """Return updated tiles metadata for one gallery image (None if it doesn't need tiles)."""
+    src = SITE_ROOT / image_rel
+    with Image.open(src) as im:
+        width, height = im.size
+    if not needs_tiles(src, width, height):
+        return None
+
+    source_hash = stored_hash(src, store)
+    # Keyed on the full file name: 01.jpg and 01.png in one gallery get separate pyramids.
+    out_base = TILES_DIR / project_id / src.name
+    current = meta.get("tiles")
+    if (
+        not force
+        and current
+        and current.get("source") == source_hash
+        and current.get("format") == fmt
+        and current.get("dzi") == rel_path(out_base.with_name(f"{out_base.name}.dzi"))
+        and (SITE_ROOT / current["dzi"]).exists()
+    ):
+        return current
+
+    print(f"  {project_id}: tiling {image_rel} ({width}x{height})")
+    if dry_run:
+        return current
+    out_base.parent.mkdir(parents=True, exist_ok=True)
+    files_dir = out_base.parent / f"{out_base.name}_files"
+    if files_dir.exists():
+        shutil.rmtree(files_dir)
+
+    def build() -> Tuple[Dict[str, Any], List[Path]]:
+        tiles = build_tile_pyramid(src, out_base, fmt)
+        files = [SITE_ROOT / tiles["dzi"], SITE_ROOT / tiles["preview"]]
+        return tiles, files + sorted(p for p in files_dir.rglob("*") if p.is_file())
+
+    params = {
+        "out": rel_path(out_base),
+        "format": fmt,
+        "tileSize": TILE_SIZE,
+        "overlap": TILE_OVERLAP,
+        "quality": TILE_QUALITY,
+        "preview": PREVIEW_MAX_EDGE,
+    }
+    tiles = dict(restore_or_build(cache, "tiles", source_hash, params, build, force))
+    tiles["source"] = source_hash
+    return tiles
+
+
+def prune_tiles(pid: str, detail: Dict[str, Any]) -> int:
+    """
+    Delete tile pyramids under images/_derived/tiles/<pid>/ that no gallery image uses any more
+    (the image was removed or renamed, became animated, or shrank below the tiling threshold).
+    Returns how many pyramids were removed.
+    """
+    project_dir = TILES_DIR / pid
+    if not project_dir.is_dir():
+        return 0
+    keep = set()
+    for meta in detail.get("galleryMeta", {}).values():
+        tiles = meta.get("tiles") or {}
+        if tiles.get("dzi"):
+            base = Path(tiles["dzi"]).stem  # the image's file name, e.g. "01.jpg"
+            keep |= {f"{base}.dzi", f"{base}_files", Path(tiles.get("preview", "")).name}
+    removed = 0
+    for entry in sorted(project_dir.iterdir()):
+        if entry.name in keep:
+            continue
+        if entry.is_dir():
+            shutil.rmtree(entry)
+        else:
+            entry.unlink()
+        if entry.suffix == ".dzi":
+            removed += 1
+    if not keep:
+        project_dir.rmdir()
+    return removed
+
+
+def is_animated(path: Path) -> bool:
+    # Not every multi-frame image is an animation: camera JPEGs (MPO) carry a second frame too.
+    with Image.open(path) as im:
+        return im.format in ANIMATED_FORMATS and getattr(im, "n_frames", 1) > 1
+
+
+def flatten(frame: "Image.Image") -> "Image.Image":
+    """RGB copy of a frame with any transparency composited onto white (the lightbox background)."""
+    if frame.mode != "RGBA":
+        return frame.convert("RGB")
+    bg = Image.new("RGB", frame.size, (255, 255, 255))
+    bg.paste(frame, mask=frame.getchannel("A"))
+    return bg
+
+
+def read_frames(src: Path) -> tuple[List["Image.Image"], List[int], int]:
+    """Composited RGBA frames (scaled to ANIMATION_MAX_EDGE), per-frame durations in ms, loop count."""
+    frames: List["Image.Image"] = []
+    durations: List[int] = []
+    with Image.open(src) as im:
+        loop = int(im.info.get("loop", 0))
+        scale = min(1.0, ANIMATION_MAX_EDGE / max(im.size))
+        size = (max(1, round(im.width * scale)), max(1, round(im.height * scale)))
+        for frame in ImageSequence.Iterator(im):
+            rgba = frame.convert("RGBA")
+            if rgba.size != size:
+                rgba = rgba.resize(size, Image.LANCZOS)
+            frames.append(rgba)
+            durations.append(int(frame.info.get("duration") or DEFAULT_FRAME_MS))
+    return frames, durations, loop
+
+
+def encode_video(frames: List["Image.Image"], durations: List[int], out: Path, ffmpeg: str) -> None:
+    """H.264 MP4 of the frames (variable frame durations via the concat demuxer)."""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        tmp = Path(tmp_dir)
+        lines = []
+        for i, (frame, ms) in enumerate(zip(frames, durations)):
+            name = f"{i:05d}.png"
+            flatten(frame).save(tmp / name, "PNG", compress_level=1)
+            lines += [f"file '{name}'", f"duration {ms / 1000:.3f}"]
+        # The concat demuxer ignores the last duration unless the last file is listed again.
+        lines.append(f"file '{len(frames) - 1:05d}.png'")
+        (tmp / "frames.txt").write_text("\n".join(lines) + "\n", encoding="utf-8")
+        subprocess.run(
+            [
+                ffmpeg, "-y", "-loglevel", "error",
+                "-f", "concat", "-safe", "0", "-i", str(tmp / "frames.txt"),
+                "-vf", "scale=trunc(iw/2)*2:trunc(ih/2)*2,format=yuv420p",
+                "-vsync", "vfr", "-c:v", "libx264", "-crf", str(VIDEO_CRF), "-preset", "slow",
+                "-movflags", "+faststart", "-an", str(out),
+            ],
+            check=True,
+            capture_output=True,
+        )
+
+
+def ffmpeg_version(ffmpeg: Optional[str]) -> str:
+    """First line of `ffmpeg -version` ("" without ffmpeg); part of the animation cache key."""
+    if not ffmpeg:
+        return ""
+    try:
+        out = subprocess.run([ffmpeg, "-version"], check=True, capture_output=True, text=True).stdout
+    except (OSError, subprocess.CalledProcessError):
+        return ""
+    return out.splitlines()[0] if out else ""
+
+
+def build_animation(src: Path, out_base: Path, ffmpeg: Optional[str]) -> Dict[str, Any]:
+    """
+    Write <out_base>.webp (animated), <out_base>_poster.jpg and, with ffmpeg, <out_base>.mp4.
+
+    The MP4 is dropped if it is not smaller than the WebP.
+    """
+    frames, durations, loop = read_frames(src)
+    width, height = frames[0].size
+
+    webp_path = out_base.parent / f"{out_base.name}.webp"
+    frames[0].save(
+        webp_path,
+        "WEBP",
+        save_all=True,
+        append_images=frames[1:],
+        duration=durations,
+        loop=loop,
+        quality=ANIMATION_QUALITY,
+        method=4,
+    )
+
+    poster = flatten(frames[0])
+    poster.thumbnail((PREVIEW_MAX_EDGE, PREVIEW_MAX_EDGE), Image.LANCZOS)
+    poster_path = out_base.parent / f"{out_base.name}_poster.jpg"
+    save_image(poster, poster_path, "jpg", POSTER_QUALITY)
+
+    out: Dict[str, Any] = {
+        "poster": rel_path(poster_path),
+        "webp": rel_path(webp_path),
+        "width": width,
+        "height": height,
+        "frames": len(frames),
+        "duration": sum(durations),
+    }
+
+    video_path = out_base.parent / f"{out_base.name}.mp4"
+    if ffmpeg:
+        try:
+            encode_video(frames, durations, video_path, ffmpeg)
+        except (OSError, subprocess.CalledProcessError) as e:
+            print(f"  [WARN] cannot encode video loop for {rel_path(src)} ({e})")
+        if video_path.exists() and video_path.stat().st_size >= webp_path.stat().st_size:
+            video_path.unlink()
+        if video_path.exists():
+            out["video"] = rel_path(video_path)
+            out["videoType"] = "video/mp4"
+    return out
+
+
+def sync_animation(
+    project_id: str,
+    image_rel: str,
+    meta: Dict[str, Any],
+    ffmpeg: Optional[str],
+    force: bool,
+    dry_run: bool,
+    cache: Optional[ArtifactCache] = None,
+    store: Optional[ProjectStore] = None,
+) -> Optional[Dict[str, Any]]:
+    """Return updated animation metadata for one animated gallery image."""
+    src = SITE_ROOT / image_rel
+    source_hash = stored_hash(src, store)
+    current = meta.get("animation")
+    if (
+        not force
+        and current
+        and current.get("source") == source_hash
+        and all((SITE_ROOT / current[k]).exists() for k in ("poster", "webp", "video") if k in current)
+    ):
+        return current
+
+    print(f"  {project_id}: transcoding animation {image_rel}")
+    if dry_run:
+        return current
+    out_base = ANIMATIONS_DIR / project_id / src.stem
+    out_base.parent.mkdir(parents=True, exist_ok=True)
+    (out_base.parent / f"{out_base.name}.mp4").unlink(missing_ok=True)
+
+    def build() -> Tuple[Dict[str, Any], List[Path]]:
+        animation = build_animation(src, out_base, ffmpeg)
+        return animation, [SITE_ROOT / animation[k] for k in ("poster", "webp", "video") if k in animation]
+
+    params = {
+        "out": rel_path(out_base),
+        "maxEdge": ANIMATION_MAX_EDGE,
+        "quality": ANIMATION_QUALITY,
+        "posterQuality": POSTER_QUALITY,
+        "crf": VIDEO_CRF,
+        "ffmpeg": ffmpeg_version(ffmpeg),
+    }
+    animation = dict(restore_or_build(cache, "animations", source_hash, params, build, force))
+    animation["source"] = source_hash
+    saved = src.stat().st_size - (SITE_ROOT / animation.get("video", animation["webp"])).stat().st_size
+    print(f"    {animation['frames']} frames, lightbox saves {saved / 1024:.0f} KB")
+    return animation
+
+
+def process_project(pid: str, detail: Dict[str, Any], args: argparse.Namespace) -> bool:
+    """Build gallery derivatives for one project; returns True if the detail JSON changed."""
+    gallery: List[str] = detail.get("gallery", [])
+    old_meta: Dict[str, Any] = detail.get("galleryMeta", {})
+    # Drop entries for images that left the gallery (renamed or removed).
+    new_meta: Dict[str, Any] = {g: dict(old_meta.get(g, {})) for g in gallery}
+
+    for g in gallery:
+        src = SITE_ROOT / g
+        if not src.exists() or not is_image(src):
+            continue
+        meta = new_meta[g]
+        try:
+            animated = is_animated(src)
+        except OSError as e:
+            print(f"  [WARN] {pid}: cannot read {g} ({e})")
+            continue
+
+        if animated:
+            # Tiling would freeze the animation on its first frame.
+            meta.pop("tiles", None)
+            if "animations" not in args.stages:
+                continue
+            try:
+                animation = sync_animation(pid, g, meta, args.ffmpeg, args.force, args.dry_run, args.cache, args.store)
+            except OSError as e:
+                print(f"  [WARN] {pid}: cannot transcode {g} ({e})")
+                continue
+            if animation:
+                meta["animation"] = animation
+            continue
+
+        meta.pop("animation", None)
+        if "tiles" not in args.stages:
+            continue
+        try:
+            tiles = sync_tiles(pid, g, meta, args.tile_format, args.force, args.dry_run, args.cache, args.store)
+        except OSError as e:
+            print(f"  [WARN] {pid}: cannot tile {g} ({e})")
+            continue
+        if tiles:
+            meta["tiles"] = tiles
+        else:
+            meta.pop("tiles", None)
+
+    new_meta = {g: m for g, m in new_meta.items() if m}
+    if new_meta == old_meta:
+        return False
+    if new_meta:
+        detail["galleryMeta"] = new_meta
+    else:
+        detail.pop("galleryMeta", None)
+    return True
+
+
+def record_variants(store: ProjectStore, pid: str, detail: Dict[str, Any]) -> None:
+    """Record the project's derived files (cards, tiles, animations) in the project store."""
+    featured = SITE_ROOT / detail.get("featuredImage", "") if detail.get("featuredImage") else None
+    if featured and featured.exists():
+        cards = [(card_thumbnail_path(pid, w), w, round(w / CARD_ASPECT)) for w in CARD_WIDTHS]
+        store.set_variants(featured, "card", [c for c in cards if (SITE_ROOT / c[0]).exists()])
+
+    for g in detail.get("gallery", []):
+        src = SITE_ROOT / g
+        if not src.exists():
+            continue
+        meta = detail.get("galleryMeta", {}).get(g, {})
+        tiles = meta.get("tiles") or {}
+        animation = meta.get("animation") or {}
+        size = (animation.get("width"), animation.get("height"))
+        store.set_variants(src, "tiles", [(tiles["dzi"], tiles.get("width"), tiles.get("height"))] if tiles else [])
+        store.set_variants(src, "preview", [(tiles["preview"], None, None)] if tiles else [])
+        for kind in ("poster", "webp", "video"):
+            store.set_variants(src, kind, [(animation[kind], *size)] if kind in animation else [])
+
+
+def optimization_report_lines(saved_by_project: Dict[str, int]) -> List[str]:
+    """Change-report lines: bytes saved per project by the lossless pass."""
+    if not saved_by_project:
+        return ["No originals optimized this run."]
+    total = sum(saved_by_project.values())
+    lines = [f"Saved {total:,} bytes across {len(saved_by_project)} projects"]
+    for pid in sorted(saved_by_project):
+        lines.append(f"  {pid}: {saved_by_project[pid]:,} bytes")
+    return lines
+
+
+def parse_args() -> argparse.Namespace:
+    ap = argparse.ArgumentParser(description="Optimize originals and build derived image assets.")
+    ap.add_argument("--dry-run", action="store_true", help="Report what would be built; write nothing.")
+    ap.add_argument("--force", action="store_true", help="Rebuild derivatives even if the source is unchanged.")
+    ap.add_argument("--stages", default=",".join(STAGES), help=f"Comma-separated stages to run ({', '.join(STAGES)}).")
+    ap.add_argument("--tile-format", choices=["jpg", "webp"], default="jpg", help="Tile image format.")
+    ap.add_argument("--no-cache", action="store_true", help="Do not use the shared artifact cache.")
+    args = ap.parse_args()
+    args.stages = [s.strip() for s in args.stages.split(",") if s.strip()]
+    unknown = set(args.stages) - set(STAGES)
+    if unknown:
+        ap.error(f"unknown stages: {', '.join(sorted(unknown))}")
+    return args
+
+
+def main() -> None:
+    args = parse_args()
+
+    if Image is None:
+        print("[WARN] Pillow is not installed (pip install Pillow); skipping image derivatives.")
+        sys.exit(0)
+
+    if not PROJECTS_JSON.exists():
+        print(f"Error: {PROJECTS_JSON} not found")
+        sys.exit(1)
+
+    listing = json.loads(PROJECTS_JSON.read_text(encoding="utf-8"))
+
+    cards_state: Dict[str, Any] = {}
+    if CARDS_STATE_PATH.exists():
+        cards_state = json.loads(CARDS_STATE_PATH.read_text(encoding="utf-8"))
+
+    jpegtran = shutil.which("jpegtran")
+    args.cache = None if args.dry_run else open_cache(args.no_cache)
+    args.store = None if args.dry_run else open_store(stage="build_image_derivatives")
+    args.ffmpeg = shutil.which("ffmpeg")
+    if "animations" in args.stages and not args.ffmpeg:
+        print("[WARN] ffmpeg not found on PATH; animations get animated WebP only (no video loops).")
+    optim_cache = load_optim_cache()
+    saved_by_project: Dict[str, int] = {}
+    if "optimize" in args.stages and not jpegtran:
+        print("[WARN] jpegtran not found on PATH; JPEGs will not be recompressed.")
+
+    for item in listing:
+        pid = item.get("id")
+        if not pid:
+            continue
+        detail_path = PROJECTS_DIR / f"{pid}.json"
+        if not detail_path.exists():
+            print(f"[WARN] {pid}: detail JSON not found, skipping")
+            continue
+
+        detail = json.loads(detail_path.read_text(encoding="utf-8"))
+
+        if "optimize" in args.stages:
+            saved = sum(optimize_image(p, optim_cache, jpegtran, args.dry_run) for p in project_originals(detail))
+            if saved:
+                saved_by_project[pid] = saved
+                print(f"  {pid}: optimized originals, saved {saved / 1024:.0f} KB")
+
+        if "cards" in args.stages:
+            try:
+                sync_card_thumbnails(pid, detail, cards_state, args.force, args.dry_run, args.cache, args.store)
+            except OSError as e:
+                print(f"  [WARN] {pid}: cannot build card thumbnails ({e})")
+
+        if process_project(pid, detail, args) and not args.dry_run:
+            detail_path.write_text(json.dumps(detail, indent=2) + "\n", encoding="utf-8")
+            print(f"  Updated galleryMeta for {pid}")
+        if args.store:
+            record_variants(args.store, pid, detail)
+        if "tiles" in args.stages and not args.dry_run:
+            pruned = prune_tiles(pid, detail)
+            if pruned:
+                print(f"  {pid}: removed {pruned} stale tile pyramid(s)")
+
+    # Projects that left the listing take their tiles with them.
+    if "tiles" in args.stages and not args.dry_run and TILES_DIR.is_dir():
+        listed = {item.get("id") for item in listing}
+        for project_dir in sorted(p for p in TILES_DIR.iterdir() if p.is_dir() and p.name not in listed):
+            shutil.rmtree(project_dir)
+            print(f"  {project_dir.name}: removed tiles (no longer listed)")
+
+    if "cards" in args.stages and not args.dry_run:
+        CARDS_STATE_PATH.write_text(json.dumps(cards_state, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+        if refresh_listing_thumbnails(listing):
+            print("  Updated listing thumbnails -> data/projects.json")
+
+    if "optimize" in args.stages and not args.dry_run:
+        save_optim_cache(optim_cache)
+        write_section("Image Optimization", optimization_report_lines(saved_by_project))
+
+    if args.cache:
+        print(args.cache.report())
+        args.cache.evict()
+    if args.store:
+        args.store.close()
+
+    print("\nImage derivatives complete." + (" (dry-run)" if args.dry_run else ""))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,161 @@
+"""
+Resource hints: per-page preload/preconnect map for the detail pages.
+
+project.html and blog-post.html only discover their detail JSON and hero image after JS runs
+(HTML -> JS -> JSON -> image). This script precomputes, per project and blog post:
+- preload for the detail JSON (as=fetch) and the hero image (with srcset when a derivative
+  set exists, see build_blog_media.py),
+and per page template:
+- preconnect for every third-party origin the page and its CSS pull from,
+- preload for web-font stylesheets that are only reached through a CSS @import.
+
+Output: topdotSite/data/resource-hints.php, read by partials/resource-hints.php. The pages
+include that partial above the doctype, so it sends the hints as Link headers (which hosts that
+support Early Hints turn into a 103 response) before any output; the pages then print the same
+hints as <link> tags in <head>.
+
+Run after build_image_derivatives.py / build_blog_media.py:
+  python topdotSite/tools/pipeline/build_resource_hints.py
+"""
+
+from __future__ import annotations
+
+import json
+import re
+import sys
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+from urllib.parse import urlparse
+
+from sheets_to_projects_json import write_php_data
+
+
+SITE_ROOT = Path(__file__).resolve().parents[2]
+DATA_DIR = SITE_ROOT / "data"
+PROJECTS_JSON = DATA_DIR / "projects.json"
+PROJECTS_DIR = DATA_DIR / "projects"
+BLOG_JSON = DATA_DIR / "blog.json"
+BLOG_DIR = DATA_DIR / "blog"
+HINTS_PHP = DATA_DIR / "resource-hints.php"
+
+# Page template -> HTML file whose head/CSS determine the shared hints.
+PAGES = {
+    "project": "project.html",
+    "blog-post": "blog-post.html",
+}
+
+# Font CSS hosts whose font files come from a different origin.
+FONT_FILE_ORIGINS = {
+    "fonts.googleapis.com": "https://fonts.gstatic.com",
+}
+
+_HEAD_URL_RE = re.compile(r"""<(?:link|script)\b[^>]*?\b(?:href|src)=["'](https://[^"']+)["']""", re.I)
+_LOCAL_CSS_RE = re.compile(r"""<link\b[^>]*?\bhref=["']([^"':]+\.css)["']""", re.I)
+_CSS_IMPORT_RE = re.compile(r"""@import\s+url\(\s*["']?([^"')]+)["']?\s*\)""", re.I)
+
+
+def origin(url: str) -> str:
+    u = urlparse(url)
+    return f"{u.scheme}://{u.netloc}"
+
+
+def css_imports(css_path: Path, seen: Optional[set] = None) -> List[str]:
+    """Absolute (https) URLs imported by a local stylesheet, following local @imports."""
+    seen = seen if seen is not None else set()
+    if css_path in seen or not css_path.exists():
+        return []
+    seen.add(css_path)
+    out: List[str] = []
+    for url in _CSS_IMPORT_RE.findall(css_path.read_text(encoding="utf-8", errors="replace")):
+        if url.startswith("https://"):
+            out.append(url)
+        elif ":" not in url:
+            out.extend(css_imports((css_path.parent / url).resolve(), seen))
+    return out
+
+
+def page_hints(html_name: str) -> List[Dict[str, str]]:
+    """Preconnects for third-party origins and preloads for @import-ed web-font CSS."""
+    html_path = SITE_ROOT / html_name
+    if not html_path.exists():
+        print(f"[WARN] {html_name} not found; no shared hints for it")
+        return []
+    html = html_path.read_text(encoding="utf-8", errors="replace")
+    head = html.split("</head>", 1)[0]
+
+    imported: List[str] = []
+    for css in _LOCAL_CSS_RE.findall(head):
+        imported.extend(css_imports((SITE_ROOT / css).resolve()))
+
+    origins: List[str] = []
+    for url in _HEAD_URL_RE.findall(head) + imported:
+        o = origin(url)
+        if o not in origins:
+            origins.append(o)
+
+    hints: List[Dict[str, str]] = []
+    for o in origins:
+        hints.append({"rel": "preconnect", "href": o})
+        font_origin = FONT_FILE_ORIGINS.get(urlparse(o).netloc)
+        if font_origin and font_origin not in origins:
+            hints.append({"rel": "preconnect", "href": font_origin, "crossorigin": "anonymous"})
+    for url in imported:
+        if urlparse(url).netloc in FONT_FILE_ORIGINS:
+            hints.append({"rel": "preload", "href": url, "as": "style"})
+    return hints
+
+
+def detail_hints(json_rel: str, hero: str, hero_meta: Optional[Dict[str, Any]] = None) -> List[Dict[str, str]]:
+    """Preload the detail JSON (as fetch, matching the page's fetch()) and the hero image."""
+    hints = [{"rel": "preload", "href": json_rel, "as": "fetch", "crossorigin": "anonymous"}]
+    if hero:
+        h = {"rel": "preload", "href": hero, "as": "image", "fetchpriority": "high"}
+        if hero_meta and hero_meta.get("srcset"):
+            h["imagesrcset"] = hero_meta["srcset"]
+            h["imagesizes"] = hero_meta.get("sizes", "100vw")
+        hints.append(h)
+    return hints
+
+
+def project_hints() -> Dict[str, List[Dict[str, str]]]:
+    out: Dict[str, List[Dict[str, str]]] = {}
+    listing = json.loads(PROJECTS_JSON.read_text(encoding="utf-8")) if PROJECTS_JSON.exists() else []
+    for item in listing:
+        pid = item.get("id")
+        path = PROJECTS_DIR / f"{pid}.json"
+        if not pid or not path.exists():
+            continue
+        detail = json.loads(path.read_text(encoding="utf-8"))
+        out[pid] = detail_hints(f"data/projects/{pid}.json", detail.get("featuredImage", ""))
+    return out
+
+
+def blog_hints() -> Dict[str, List[Dict[str, str]]]:
+    out: Dict[str, List[Dict[str, str]]] = {}
+    listing = json.loads(BLOG_JSON.read_text(encoding="utf-8")) if BLOG_JSON.exists() else []
+    for item in listing:
+        bid = item.get("id")
+        path = BLOG_DIR / f"{bid}.json"
+        if not bid or not path.exists():
+            continue
+        post = json.loads(path.read_text(encoding="utf-8"))
+        out[bid] = detail_hints(f"data/blog/{bid}.json", post.get("featuredImage", ""), post.get("featuredImageMeta"))
+    return out
+
+
+def main() -> None:
+    if not PROJECTS_JSON.exists():
+        print(f"Error: {PROJECTS_JSON} not found")
+        sys.exit(1)
+
+    by_id = {"project": project_hints(), "blog-post": blog_hints()}
+    hints = {page: {"common": page_hints(html), "byId": by_id.get(page, {})} for page, html in PAGES.items()}
+
+    write_php_data(HINTS_PHP, hints, generator="tools/pipeline/build_resource_hints.py")
+    for page, data in hints.items():
+        print(f"  {page}: {len(data['common'])} shared hints, {len(data['byId'])} pages")
+    print(f"Wrote: {HINTS_PHP.relative_to(SITE_ROOT).as_posix()}")
+
+
+if __name__ == "__main__":
+    main()
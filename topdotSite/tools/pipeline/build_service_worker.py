@@ -0,0 +1,254 @@
+"""
+Service worker: generate topdotSite/sw.js with a precache manifest of the site shell.
+
+HTML/CSS are served no-store and JSON is refetched by the page scripts, so repeat visitors
+re-download the whole shell on every visit. The generated worker:
+- precaches the shell: CSS, JS, listing JSON (projects.json, facets, tag shards, spec index,
+  blog.json), the images used by the header/footer partials and the listing card thumbnails.
+  Thumbnails are only included when projects.json points them at images/_derived/cards/, i.e.
+  after build_image_derivatives.py has run; the original featured images they otherwise fall
+  back to are full-size and are not precached.
+  Each entry carries its own content-hash revision; on install only entries whose revision
+  changed are fetched again and entries that left the manifest are dropped on activate.
+- serves detail JSON (data/projects/<id>.json, data/blog/<id>.json) stale-while-revalidate.
+- leaves page navigations and third-party requests to the network.
+
+The worker's VERSION is a hash of the build manifest (data/_build-manifest.json) plus every
+revision, so sw.js only changes (and browsers only update it) when something it serves changed.
+
+Run after the other pipeline scripts (it hashes their outputs):
+  python topdotSite/tools/pipeline/build_service_worker.py [--check]
+
+--check writes nothing and exits 1 if sw.js differs from what would be generated (validate_site.py
+runs the same check).
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import re
+import sys
+from pathlib import Path
+from typing import Dict, List
+
+
+SITE_ROOT = Path(__file__).resolve().parents[2]
+DATA_DIR = SITE_ROOT / "data"
+PROJECTS_JSON = DATA_DIR / "projects.json"
+MANIFEST_PATH = DATA_DIR / "_build-manifest.json"
+SW_PATH = SITE_ROOT / "sw.js"
+
+# Shell files, as globs relative to the site root.
+SHELL_GLOBS = (
+    "css/**/*.css",
+    "js/*.js",
+    "data/projects.json",
+    "data/projects-facets.json",
+    "data/projects-spec-index.json",
+    "data/projects/by-tag/*.json",
+    "data/blog.json",
+    "images/favicon.ico",
+)
+# Partials whose <img src="images/..."> show on every page.
+SHELL_PARTIALS = ("partials/header.php", "partials/footer.php")
+
+_PRECACHE_ROW_RE = re.compile(r'^  (\["[^"]+", "[0-9a-f]+"\]),?$', re.M)
+_PARTIAL_IMG_RE = re.compile(r"""["'/](images/[^"'?<>]+\.(?:png|jpe?g|gif|svg|webp|ico))["']""", re.I)
+
+SW_TEMPLATE = """// sw.js
+// Generated by tools/pipeline/build_service_worker.py. Do not edit.
+/**
+ * Precache the site shell (per-entry revisions) and serve detail JSON stale-while-revalidate.
+ */
+// Changes whenever a precached file or the build manifest changes, so browsers install the update.
+const VERSION = "__VERSION__";
+const PRECACHE = __PRECACHE__;
+
+const PRECACHE_CACHE = "topdot-precache";
+const RUNTIME_CACHE = "topdot-runtime";
+const REVISIONS_KEY = "__sw-revisions";
+const DETAIL_RE = /^data\\/(projects|blog)\\/[^/]+\\.json$/;
+
+const scoped = (path) => new URL(path, self.registration.scope).href;
+const revisions = new Map(PRECACHE);
+
+const readRevisions = async (cache) => {
+  const res = await cache.match(scoped(REVISIONS_KEY));
+  return res ? await res.json() : {};
+};
+
+self.addEventListener("install", (event) => {
+  event.waitUntil(
+    (async () => {
+      const cache = await caches.open(PRECACHE_CACHE);
+      const cached = await readRevisions(cache);
+      // Only entries whose content changed since the last install are fetched again.
+      const changed = PRECACHE.filter(([path, rev]) => cached[path] !== rev);
+      await Promise.all(
+        changed.map(async ([path]) => {
+          const res = await fetch(scoped(path), { cache: "no-cache" });
+          if (!res.ok) throw new Error(`${path}: ${res.status}`);
+          await cache.put(scoped(path), res);
+        })
+      );
+      await self.skipWaiting();
+    })()
+  );
+});
+
+self.addEventListener("activate", (event) => {
+  event.waitUntil(
+    (async () => {
+      const cache = await caches.open(PRECACHE_CACHE);
+      const keep = new Set(PRECACHE.map(([path]) => scoped(path)));
+      keep.add(scoped(REVISIONS_KEY));
+      const keys = await cache.keys();
+      await Promise.all(keys.filter((req) => !keep.has(req.url)).map((req) => cache.delete(req)));
+      await cache.put(scoped(REVISIONS_KEY), new Response(JSON.stringify(Object.fromEntries(revisions))));
+
+      const names = await caches.keys();
+      await Promise.all(
+        names.filter((n) => n !== PRECACHE_CACHE && n !== RUNTIME_CACHE).map((n) => caches.delete(n))
+      );
+      await self.clients.claim();
+    })()
+  );
+});
+
+const staleWhileRevalidate = async (event, url) => {
+  const cache = await caches.open(RUNTIME_CACHE);
+  const cached = await cache.match(url);
+  const network = fetch(url, { cache: "no-cache" }).then(async (res) => {
+    if (res.ok) await cache.put(url, res.clone());
+    return res;
+  });
+  if (cached) {
+    event.waitUntil(network.catch(() => {}));
+    return cached;
+  }
+  return network;
+};
+
+self.addEventListener("fetch", (event) => {
+  const req = event.request;
+  if (req.method !== "GET" || req.mode === "navigate") return;
+
+  const url = new URL(req.url);
+  const scope = self.registration.scope;
+  if (url.origin !== self.location.origin || url.search || !url.href.startsWith(scope)) return;
+  const path = url.href.slice(scope.length);
+
+  if (revisions.has(path)) {
+    event.respondWith(
+      caches.match(url.href, { cacheName: PRECACHE_CACHE }).then((res) => res || fetch(req))
+    );
+  } else if (DETAIL_RE.test(path)) {
+    event.respondWith(staleWhileRevalidate(event, url.href));
+  }
+});
+"""
+
+
+def file_hash(path: Path) -> str:
+    return hashlib.sha256(path.read_bytes()).hexdigest()[:16]
+
+
+def shell_files() -> List[Path]:
+    """Shell files that exist, in a stable order."""
+    found: Dict[str, Path] = {}
+    for pattern in SHELL_GLOBS:
+        for p in SITE_ROOT.glob(pattern):
+            if p.is_file():
+                found[p.relative_to(SITE_ROOT).as_posix()] = p
+
+    for partial in SHELL_PARTIALS:
+        path = SITE_ROOT / partial
+        if not path.exists():
+            continue
+        for rel in _PARTIAL_IMG_RE.findall(path.read_text(encoding="utf-8", errors="replace")):
+            if (SITE_ROOT / rel).is_file():
+                found[rel] = SITE_ROOT / rel
+
+    # Card thumbnails referenced by the listing (the src the grid requests by default).
+    if PROJECTS_JSON.exists():
+        for item in json.loads(PROJECTS_JSON.read_text(encoding="utf-8")):
+            thumb = item.get("thumbnail") or ""
+            if thumb.startswith("images/_derived/cards/") and (SITE_ROOT / thumb).is_file():
+                found[thumb] = SITE_ROOT / thumb
+
+    return [found[k] for k in sorted(found)]
+
+
+def build_precache() -> List[List[str]]:
+    return [[p.relative_to(SITE_ROOT).as_posix(), file_hash(p)] for p in shell_files()]
+
+
+def sw_version(precache: List[List[str]]) -> str:
+    h = hashlib.sha256()
+    if MANIFEST_PATH.exists():
+        h.update(MANIFEST_PATH.read_bytes())
+    h.update(json.dumps(precache).encode("utf-8"))
+    return h.hexdigest()[:16]
+
+
+def render_sw(precache: List[List[str]]) -> str:
+    rows = ",\n".join(f"  {json.dumps(entry)}" for entry in precache)
+    return (
+        SW_TEMPLATE.replace("__VERSION__", sw_version(precache))
+        .replace("__PRECACHE__", f"[\n{rows}\n]")
+    )
+
+
+def drift() -> List[str]:
+    """Why sw.js differs from what would be generated now; empty when it is up to date."""
+    if not SW_PATH.exists():
+        return ["sw.js not found"]
+    current = SW_PATH.read_text(encoding="utf-8")
+    precache = build_precache()
+    if current == render_sw(precache):
+        return []
+    old = dict(json.loads(row) for row in _PRECACHE_ROW_RE.findall(current))
+    new = dict(precache)
+    reasons = [
+        f"{path}: {'added' if path not in old else 'removed' if path not in new else 'changed'}"
+        for path in sorted(old.keys() | new.keys())
+        if old.get(path) != new.get(path)
+    ]
+    return reasons or ["sw.js differs from the generated worker (build manifest or template changed)"]
+
+
+def parse_args() -> argparse.Namespace:
+    ap = argparse.ArgumentParser(description="Generate sw.js with the site-shell precache manifest.")
+    ap.add_argument("--check", action="store_true", help="Write nothing; exit 1 if sw.js is out of date.")
+    return ap.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    if not PROJECTS_JSON.exists():
+        print(f"Error: {PROJECTS_JSON} not found")
+        sys.exit(1)
+
+    if args.check:
+        reasons = drift()
+        for reason in reasons:
+            print(f"[ERROR] sw.js is out of date: {reason}")
+        if reasons:
+            print("Run tools/pipeline/build_service_worker.py to regenerate it.")
+            sys.exit(1)
+        print("sw.js is up to date.")
+        return
+
+    precache = build_precache()
+    text = render_sw(precache)
+    if SW_PATH.exists() and SW_PATH.read_text(encoding="utf-8") == text:
+        print(f"sw.js unchanged ({len(precache)} precached files).")
+        return
+    SW_PATH.write_text(text, encoding="utf-8")
+    print(f"Wrote: {SW_PATH.relative_to(SITE_ROOT).as_posix()} ({len(precache)} precached files)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,33 @@
+"""
+Change report sections.
+
+sheets_to_projects_json.py rewrites data/_change-report.txt on every build; later
+stages add their own "=== <title> ===" section (replacing it if already present).
+"""
+
+from __future__ import annotations
+
+import re
+from pathlib import Path
+from typing import List
+
+
+SITE_ROOT = Path(__file__).resolve().parents[2]
+REPORT_PATH = SITE_ROOT / "data" / "_change-report.txt"
+
+
+def has_section(title: str) -> bool:
+    """True if the current report already has a section with this title."""
+    if not REPORT_PATH.exists():
+        return False
+    return f"=== {title} ===" in REPORT_PATH.read_text(encoding="utf-8").splitlines()
+
+
+def write_section(title: str, lines: List[str]) -> None:
+    """Add or replace one section of the change report."""
+    header = f"=== {title} ==="
+    text = REPORT_PATH.read_text(encoding="utf-8") if REPORT_PATH.exists() else ""
+    sections = [s for s in re.split(r"(?m)^(?==== )", text) if s.strip()]
+    sections = [s.rstrip("\n") + "\n" for s in sections if not s.startswith(header)]
+    sections.append("\n".join([header, ""] + lines).rstrip("\n") + "\n")
+    REPORT_PATH.write_text("\n".join(sections), encoding="utf-8")
@@ -0,0 +1,256 @@
+"""
+Sheets fetcher: download the CSV tabs into data/sheets/ and compile only if one changed.
+
+Replaces the manual export step. The tabs to fetch are listed in data/sheets/sources.json
+(not committed), one CSV export URL per file name:
+
+  {
+    "Projects.csv": "https://docs.google.com/spreadsheets/d/e/<published-id>/pub?gid=0&single=true&output=csv",
+    "ProjectDescriptions.csv": "...",
+    "ProjectSpecs.csv": "...",
+    "SpecDefinitions.csv": "..."
+  }
+
+(File > Share > Publish to web > <tab> > CSV gives such a URL.)
+
+- All tabs are fetched concurrently (asyncio; urllib runs in worker threads).
+- Requests are conditional: the ETag / Last-Modified of the last download (kept in
+  data/sheets/_fetch-state.json) are sent back, so an unchanged tab costs a 304 and
+  nothing is written. (Not if the CSV on disk was edited or removed since; it is then
+  fetched in full.) A 200 whose body matches the file on disk is also left alone.
+- Downloads are checked before anything is written (not an HTML sign-in page, header row
+  has the tab's id column). If any tab fails, no file is touched.
+- Changed tabs are written atomically (temp file + rename), then sheets_to_projects_json.py
+  is run. When no tab changed the compile is skipped.
+
+Run:
+  python topdotSite/tools/pipeline/fetch_sheets.py [--sources PATH] [--dest DIR] [--no-compile] [--force]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import gzip
+import hashlib
+import json
+import os
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+
+SITE_ROOT = Path(__file__).resolve().parents[2]
+SHEETS_DIR = SITE_ROOT / "data" / "sheets"
+SOURCES_NAME = "sources.json"
+STATE_NAME = "_fetch-state.json"
+COMPILER = Path(__file__).resolve().parent / "sheets_to_projects_json.py"
+
+# First-column header each tab must have (guards against sign-in pages and wrong gids).
+ID_COLUMNS = {
+    "Projects.csv": "id",
+    "ProjectDescriptions.csv": "project_id",
+    "ProjectSpecs.csv": "project_id",
+    "SpecDefinitions.csv": "key",
+}
+
+TIMEOUT = 30
+RETRIES = 2
+USER_AGENT = "topdot-fetch-sheets/1"
+
+
+@dataclass
+class Fetched:
+    name: str
+    status: int  # 200 or 304
+    body: bytes = b""
+    etag: str = ""
+    last_modified: str = ""
+    elapsed: float = 0.0
+
+
+def content_hash(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()[:16]
+
+
+def http_get(url: str, etag: str, last_modified: str) -> Fetched:
+    """Blocking conditional GET (run in a worker thread)."""
+    headers = {"User-Agent": USER_AGENT, "Accept": "text/csv", "Accept-Encoding": "gzip"}
+    if etag:
+        headers["If-None-Match"] = etag
+    if last_modified:
+        headers["If-Modified-Since"] = last_modified
+
+    started = time.perf_counter()
+    req = urllib.request.Request(url, headers=headers)
+    try:
+        with urllib.request.urlopen(req, timeout=TIMEOUT) as res:
+            body = res.read()
+            if res.headers.get("Content-Encoding", "").lower() == "gzip":
+                body = gzip.decompress(body)
+            return Fetched(
+                name="",
+                status=res.status,
+                body=body,
+                etag=res.headers.get("ETag", ""),
+                last_modified=res.headers.get("Last-Modified", ""),
+                elapsed=time.perf_counter() - started,
+            )
+    except urllib.error.HTTPError as e:
+        if e.code != 304:
+            raise
+        return Fetched(
+            name="",
+            status=304,
+            etag=e.headers.get("ETag", "") or etag,
+            last_modified=e.headers.get("Last-Modified", "") or last_modified,
+            elapsed=time.perf_counter() - started,
+        )
+
+
+async def fetch_tab(name: str, url: str, prev: Dict[str, str]) -> Fetched:
+    for attempt in range(1, RETRIES + 2):
+        try:
+            result = await asyncio.to_thread(http_get, url, prev.get("etag", ""), prev.get("lastModified", ""))
+            result.name = name
+            return result
+        except urllib.error.HTTPError:
+            raise
+        except (urllib.error.URLError, TimeoutError, ConnectionError):
+            if attempt > RETRIES:
+                raise
+            await asyncio.sleep(attempt)
+    raise RuntimeError("unreachable")
+
+
+def validators(path: Path, prev: Dict[str, str]) -> Dict[str, str]:
+    """ETag/Last-Modified to send, only if the file on disk is still what was downloaded."""
+    if not prev.get("hash") or not path.exists() or content_hash(path.read_bytes()) != prev["hash"]:
+        return {}
+    return prev
+
+
+async def fetch_all(sources: Dict[str, str], state: Dict[str, Dict[str, str]], dest: Path, force: bool) -> List[Any]:
+    tasks = [
+        fetch_tab(name, url, {} if force else validators(dest / name, state.get(name, {})))
+        for name, url in sources.items()
+    ]
+    return await asyncio.gather(*tasks, return_exceptions=True)
+
+
+def check_csv(name: str, body: bytes) -> Optional[str]:
+    """Why a downloaded body is not a usable export of this tab (None if it is)."""
+    head = body[:2048].lstrip(b"\xef\xbb\xbf").lstrip()
+    if head[:1] == b"<":
+        return "got HTML instead of CSV (is the sheet published / the URL an export link?)"
+    id_col = ID_COLUMNS.get(name)
+    first = head.split(b"\n", 1)[0].decode("utf-8", errors="replace").strip()
+    if id_col and first.split(",", 1)[0].strip().strip('"') != id_col:
+        return f"header does not start with {id_col!r}: {first[:80]!r}"
+    return None
+
+
+def write_atomic(path: Path, data: bytes) -> None:
+    tmp = path.with_name(path.name + ".tmp")
+    with tmp.open("wb") as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+def load_json(path: Path) -> Dict[str, Any]:
+    if not path.exists():
+        return {}
+    try:
+        return json.loads(path.read_text(encoding="utf-8"))
+    except ValueError:
+        print(f"[WARN] {path.name} unreadable; ignoring")
+        return {}
+
+
+def parse_args() -> argparse.Namespace:
+    ap = argparse.ArgumentParser(description="Fetch the Sheets CSV exports and compile if anything changed.")
+    ap.add_argument("--sources", type=Path, help=f"Tab URLs (default: <dest>/{SOURCES_NAME}).")
+    ap.add_argument("--dest", type=Path, default=SHEETS_DIR, help="Directory for the CSVs (default: data/sheets/).")
+    ap.add_argument("--no-compile", action="store_true", help="Only fetch; do not run the compiler.")
+    ap.add_argument("--force", action="store_true", help="Unconditional requests; compile even if nothing changed.")
+    return ap.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    dest: Path = args.dest
+    sources_path = args.sources or dest / SOURCES_NAME
+    state_path = dest / STATE_NAME
+
+    sources = load_json(sources_path)
+    if not sources:
+        print(f"[ERROR] No tab URLs in {sources_path} (see the docstring of this script for the format)")
+        sys.exit(1)
+    unknown = set(sources) - set(ID_COLUMNS)
+    if unknown:
+        print(f"[WARN] Not a tab the compiler reads: {', '.join(sorted(unknown))}")
+
+    state = load_json(state_path)
+    started = time.perf_counter()
+    results = asyncio.run(fetch_all(sources, state, dest, args.force))
+
+    failed = 0
+    changed: Dict[str, bytes] = {}
+    for name, result in zip(sources, results):
+        if isinstance(result, BaseException):
+            print(f"[ERROR] {name}: {result}")
+            failed += 1
+            continue
+        entry = {"etag": result.etag, "lastModified": result.last_modified}
+        if result.status == 304:
+            print(f"  {name}: not modified ({result.elapsed * 1000:.0f} ms)")
+            state[name] = {**state.get(name, {}), **entry}
+            continue
+        problem = check_csv(name, result.body)
+        if problem:
+            print(f"[ERROR] {name}: {problem}")
+            failed += 1
+            continue
+        digest = content_hash(result.body)
+        path = dest / name
+        if path.exists() and content_hash(path.read_bytes()) == digest:
+            print(f"  {name}: unchanged ({len(result.body):,} bytes, {result.elapsed * 1000:.0f} ms)")
+        else:
+            print(f"  {name}: changed ({len(result.body):,} bytes, {result.elapsed * 1000:.0f} ms)")
+            changed[name] = result.body
+        state[name] = {**entry, "hash": digest}
+
+    if failed:
+        print(f"\n[ERROR] {failed} tab(s) failed; no files written.")
+        sys.exit(1)
+
+    dest.mkdir(parents=True, exist_ok=True)
+    for name, body in changed.items():
+        write_atomic(dest / name, body)
+    # All-304 runs normally leave the validators as they were; don't touch the disk then.
+    state_bytes = (json.dumps(state, indent=2, sort_keys=True) + "\n").encode("utf-8")
+    if not state_path.exists() or state_path.read_bytes() != state_bytes:
+        write_atomic(state_path, state_bytes)
+    print(f"\nFetched {len(sources)} tabs in {time.perf_counter() - started:.2f} s; {len(changed)} changed.")
+
+    if args.no_compile:
+        return
+    if not changed and not args.force:
+        print("No tab changed; skipping compile.")
+        return
+    if dest.resolve() != SHEETS_DIR.resolve():
+        print("--dest is not data/sheets/; skipping compile.")
+        return
+    print(f"\nCompiling ({COMPILER.name})...\n")
+    sys.exit(subprocess.run([sys.executable, str(COMPILER)]).returncode)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,261 @@
+"""
+Pipeline tracing: stage/project spans with timings, bytes and file-op counts.
+
+Scripts wrap their work in spans:
+
+    import pipeline_trace as trace
+
+    trace.start("sync_project_assets")        # reads --trace PATH / --profile / --timings from argv
+    with trace.span("load listing"):
+        ...
+    with trace.span(pid, cat="project"):
+        ...
+    trace.finish()                             # summary + trace file
+
+Tracing is off unless one of the flags is given, and then costs nothing beyond a context manager
+per span. When on:
+- every span records its duration and, for its lifetime, bytes read/written and file operations
+  (open, rename, delete, stat, scan, fsync) made through pathlib / os.replace / os.rename / os.fsync
+- --timings prints a per-stage summary at the end
+- --trace PATH also writes a Chrome trace-event JSON (open in chrome://tracing or ui.perfetto.dev)
+- --profile wraps each top-level stage span in cProfile and prints its hottest functions
+"""
+
+from __future__ import annotations
+
+import contextlib
+import cProfile
+import io
+import json
+import os
+import pstats
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+
+FILE_OPS = ("open", "rename", "delete", "stat", "scan", "fsync")
+PROFILE_TOP = 15
+
+_enabled = False
+_script = ""
+_trace_path: Optional[Path] = None
+_profile = False
+_started_ns = 0
+_events: List[Dict[str, Any]] = []
+_depth = 0
+_counters: Dict[str, int] = {"bytes_read": 0, "bytes_written": 0, **{op: 0 for op in FILE_OPS}}
+_originals: Dict[str, Any] = {}
+
+
+class _CountingWriter:
+    """Proxy for a file opened for writing that counts bytes written."""
+
+    def __init__(self, f: Any) -> None:
+        self._f = f
+
+    def write(self, data: Any) -> int:
+        n = self._f.write(data)
+        _counters["bytes_written"] += len(data.encode("utf-8")) if isinstance(data, str) else len(data)
+        return n
+
+    def writelines(self, lines: Any) -> None:
+        for line in lines:
+            self.write(line)
+
+    def __enter__(self) -> "_CountingWriter":
+        self._f.__enter__()
+        return self
+
+    def __exit__(self, *exc: Any) -> Any:
+        return self._f.__exit__(*exc)
+
+    def __iter__(self) -> Iterator[Any]:
+        return iter(self._f)
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._f, name)
+
+
+def _count(op: str, original: Any) -> Any:
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        _counters[op] += 1
+        return original(*args, **kwargs)
+
+    return wrapper
+
+
+def _install() -> None:
+    """Patch pathlib/os entry points the pipeline uses for I/O."""
+    path_open = Path.open
+
+    def counted_open(self: Path, mode: str = "r", *args: Any, **kwargs: Any) -> Any:
+        _counters["open"] += 1
+        f = path_open(self, mode, *args, **kwargs)
+        if any(c in mode for c in "wax+"):
+            return _CountingWriter(f)
+        with contextlib.suppress(OSError, ValueError):
+            _counters["bytes_read"] += os.fstat(f.fileno()).st_size
+        return f
+
+    _originals.update(
+        {
+            "Path.open": Path.open,
+            "Path.rename": Path.rename,
+            "Path.replace": Path.replace,
+            "Path.unlink": Path.unlink,
+            "Path.stat": Path.stat,
+            "Path.iterdir": Path.iterdir,
+            "Path.glob": Path.glob,
+            "os.replace": os.replace,
+            "os.rename": os.rename,
+            "os.fsync": os.fsync,
+        }
+    )
+    Path.open = counted_open  # type: ignore[method-assign]
+    Path.rename = _count("rename", Path.rename)  # type: ignore[method-assign]
+    Path.replace = _count("rename", Path.replace)  # type: ignore[method-assign]
+    Path.unlink = _count("delete", Path.unlink)  # type: ignore[method-assign]
+    Path.stat = _count("stat", Path.stat)  # type: ignore[method-assign]
+    Path.iterdir = _count("scan", Path.iterdir)  # type: ignore[method-assign]
+    Path.glob = _count("scan", Path.glob)  # type: ignore[method-assign]
+    os.replace = _count("rename", os.replace)
+    os.rename = _count("rename", os.rename)
+    os.fsync = _count("fsync", os.fsync)
+
+
+def _uninstall() -> None:
+    for name, original in _originals.items():
+        owner, attr = name.split(".")
+        setattr(Path if owner == "Path" else os, attr, original)
+    _originals.clear()
+
+
+def _pop_flag_value(argv: List[str], flag: str) -> Optional[str]:
+    for i, arg in enumerate(argv):
+        if arg == flag and i + 1 < len(argv):
+            return argv[i + 1]
+        if arg.startswith(flag + "="):
+            return arg.split("=", 1)[1]
+    return None
+
+
+def start(script: str, argv: Optional[List[str]] = None) -> None:
+    """Enable tracing if --trace PATH, --profile or --timings is in argv."""
+    global _enabled, _script, _trace_path, _profile, _started_ns
+    argv = sys.argv if argv is None else argv
+    trace = _pop_flag_value(argv, "--trace")
+    _trace_path = Path(trace) if trace else None
+    _profile = "--profile" in argv
+    _enabled = bool(_trace_path or _profile or "--timings" in argv)
+    _script = script
+    _events.clear()
+    for k in _counters:
+        _counters[k] = 0
+    _started_ns = time.perf_counter_ns()
+    if _enabled and not _originals:
+        _install()
+
+
+@contextlib.contextmanager
+def span(name: str, cat: str = "stage", **args: Any) -> Iterator[None]:
+    """Record a span (no-op unless tracing is enabled)."""
+    global _depth
+    if not _enabled:
+        yield
+        return
+
+    before = dict(_counters)
+    profiler = cProfile.Profile() if _profile and _depth == 0 and cat == "stage" else None
+    begin = time.perf_counter_ns()
+    _depth += 1
+    if profiler:
+        profiler.enable()
+    try:
+        yield
+    finally:
+        if profiler:
+            profiler.disable()
+        _depth -= 1
+        end = time.perf_counter_ns()
+        delta = {k: v - before[k] for k, v in _counters.items() if v - before[k]}
+        _events.append(
+            {
+                "name": name,
+                "cat": cat,
+                "ph": "X",
+                "ts": (begin - _started_ns) / 1000,
+                "dur": (end - begin) / 1000,
+                "pid": os.getpid(),
+                "tid": 1,
+                "args": {**args, **delta},
+                "depth": _depth,
+            }
+        )
+        if profiler:
+            _print_profile(name, profiler)
+
+
+def _print_profile(name: str, profiler: cProfile.Profile) -> None:
+    out = io.StringIO()
+    pstats.Stats(profiler, stream=out).sort_stats("cumulative").print_stats(PROFILE_TOP)
+    print(f"\n--- profile: {name} ---")
+    print("\n".join(line for line in out.getvalue().splitlines() if line.strip()))
+
+
+def _row_key(e: Dict[str, Any]) -> str:
+    """Stages by name (nested ones indented); other categories rolled up into one row each."""
+    if e["cat"] != "stage":
+        return f"[{e['cat']} x{{n}}]"
+    return "  " * e["depth"] + e["name"]
+
+
+def summary_lines() -> List[str]:
+    """Per-span summary rows, in start order."""
+    rows: Dict[str, Dict[str, float]] = {}
+    first_ts: Dict[str, float] = {}
+    for e in _events:
+        key = _row_key(e)
+        r = rows.setdefault(key, {"n": 0, "dur": 0.0, **{k: 0 for k in _counters}})
+        first_ts[key] = min(first_ts.get(key, e["ts"]), e["ts"])
+        r["n"] += 1
+        r["dur"] += e["dur"]
+        for k in _counters:
+            r[k] += e["args"].get(k, 0)
+
+    lines = [f"{'span':<28} {'ms':>9} {'read KB':>9} {'write KB':>9}  file ops"]
+    for key in sorted(rows, key=lambda k: first_ts[k]):
+        r = rows[key]
+        ops = ", ".join(f"{op} {int(r[op])}" for op in FILE_OPS if r[op])
+        label = key.replace("{n}", str(int(r["n"])))
+        lines.append(
+            f"{label:<28} {r['dur'] / 1000:>9.1f} {r['bytes_read'] / 1024:>9.1f} "
+            f"{r['bytes_written'] / 1024:>9.1f}  {ops or '-'}"
+        )
+    return lines
+
+
+def write_trace(path: Path) -> None:
+    """Write collected spans as Chrome trace-event JSON."""
+    events = [{k: v for k, v in e.items() if k != "depth"} for e in _events]
+    events.append(
+        {"name": "process_name", "ph": "M", "pid": os.getpid(), "tid": 1, "args": {"name": _script}}
+    )
+    path.write_text(json.dumps({"traceEvents": events, "displayTimeUnit": "ms"}) + "\n", encoding="utf-8")
+
+
+def finish() -> None:
+    """Print the summary and write the trace file (if requested); restore patched I/O."""
+    global _enabled
+    if not _enabled:
+        return
+    total_ms = (time.perf_counter_ns() - _started_ns) / 1e6
+    _uninstall()
+    _enabled = False
+    print(f"\n=== Timings: {_script} ({total_ms:.1f} ms) ===")
+    for line in summary_lines():
+        print(line)
+    if _trace_path:
+        write_trace(_trace_path)
+        print(f"Trace written: {_trace_path}")
@@ -0,0 +1,499 @@
+"""
+Project store: the pipeline's working model, in one indexed SQLite file.
+
+data/_project-store.sqlite (generated state; never deployed, safe to delete) holds:
+- projects      one row per Projects.csv row: sheet fields, listing position, the hash of the
+                sheet data it was compiled from, and the detail JSON last written for it
+- descriptions  ProjectDescriptions rows, in order
+- spec_values   ProjectSpecs values, in sheet order (indexed by key)
+- images        featured + gallery images: size, mtime, content hash, width x height
+- variants      derived files per image (card crops, tile pyramids, animation transcodes)
+- builds        one row per stage run, with how many rows it changed
+
+Each stage reads and updates it:
+- sheets_to_projects_json.py compiles only projects whose sheet rows changed (or whose detail
+  JSON was rewritten by another stage since); the rest are skipped without being read.
+- sync_project_assets.py records each project's images. A file is hashed only when its size
+  or mtime changed, and build_image_derivatives.py reuses those hashes instead of re-reading
+  every original.
+- build_image_derivatives.py records the variants it built; validate_site.py reads image
+  dimensions from the store.
+
+Every row touched by a run carries that run's build id (changed_build), so "what changed" is
+an indexed lookup. The store is rebuilt from scratch when SCHEMA_VERSION changes.
+
+Run (ad-hoc questions; add --json for machine-readable output):
+  python topdotSite/tools/pipeline/project_store.py stats
+  python topdotSite/tools/pipeline/project_store.py builds
+  python topdotSite/tools/pipeline/project_store.py changed [--since BUILD]
+  python topdotSite/tools/pipeline/project_store.py missing-cards
+  python topdotSite/tools/pipeline/project_store.py sql "SELECT id, year FROM projects WHERE published ORDER BY year"
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import sqlite3
+import struct
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+
+SITE_ROOT = Path(__file__).resolve().parents[2]
+STORE_PATH = SITE_ROOT / "data" / "_project-store.sqlite"
+
+SCHEMA_VERSION = 1
+
+SCHEMA = """
+CREATE TABLE builds (
+    id INTEGER PRIMARY KEY,
+    stage TEXT NOT NULL,
+    started TEXT NOT NULL,
+    finished TEXT,
+    changed INTEGER NOT NULL DEFAULT 0
+);
+
+CREATE TABLE projects (
+    id TEXT PRIMARY KEY,
+    name TEXT NOT NULL,
+    type TEXT NOT NULL,
+    tags TEXT NOT NULL,             -- JSON array
+    status TEXT NOT NULL,
+    published INTEGER NOT NULL,
+    position INTEGER,               -- listing position; NULL when not published
+    year INTEGER,
+    location TEXT NOT NULL,
+    image_dir TEXT NOT NULL,
+    featured TEXT NOT NULL,
+    focal_point TEXT,               -- JSON [x, y]
+    source_hash TEXT NOT NULL,      -- sheet rows + spec definitions it was compiled from
+    detail_hash TEXT,               -- detail JSON as last written by the compiler
+    detail_size INTEGER,
+    detail_mtime_ns INTEGER,
+    changed_build INTEGER NOT NULL REFERENCES builds(id)
+);
+CREATE INDEX projects_position ON projects(position) WHERE published;
+CREATE INDEX projects_changed ON projects(changed_build);
+
+CREATE TABLE descriptions (
+    project_id TEXT NOT NULL REFERENCES projects(id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    text TEXT NOT NULL,
+    PRIMARY KEY (project_id, position)
+) WITHOUT ROWID;
+
+CREATE TABLE spec_values (
+    project_id TEXT NOT NULL REFERENCES projects(id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    key TEXT NOT NULL,
+    value TEXT NOT NULL,
+    PRIMARY KEY (project_id, position)
+) WITHOUT ROWID;
+CREATE INDEX spec_values_key ON spec_values(key, value);
+
+CREATE TABLE images (
+    path TEXT PRIMARY KEY,          -- site-relative
+    project_id TEXT,
+    role TEXT,                      -- 'featured' | 'gallery'
+    position INTEGER,
+    bytes INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    hash TEXT,                      -- 16-hex sha256 prefix, as in the build manifest
+    width INTEGER,
+    height INTEGER,
+    changed_build INTEGER REFERENCES builds(id)
+);
+CREATE INDEX images_project ON images(project_id, role, position);
+CREATE INDEX images_hash ON images(hash);
+CREATE INDEX images_changed ON images(changed_build);
+
+CREATE TABLE variants (
+    image_path TEXT NOT NULL REFERENCES images(path) ON DELETE CASCADE,
+    kind TEXT NOT NULL,             -- 'card' | 'tiles' | 'preview' | 'poster' | 'webp' | 'video'
+    path TEXT NOT NULL,
+    width INTEGER,
+    height INTEGER,
+    PRIMARY KEY (image_path, kind, path)
+) WITHOUT ROWID;
+CREATE INDEX variants_kind ON variants(kind);
+"""
+
+# Named queries for the CLI.
+QUERIES: Dict[str, str] = {
+    "builds": "SELECT id, stage, started, finished, changed FROM builds ORDER BY id DESC LIMIT 20",
+    "missing-cards": """
+        SELECT p.id, p.featured FROM projects p
+        WHERE p.published AND NOT EXISTS (
+            SELECT 1 FROM variants v WHERE v.image_path = p.featured AND v.kind = 'card')
+        ORDER BY p.position""",
+}
+
+_JPEG_SOF = {0xC0, 0xC1, 0xC2, 0xC3, 0xC5, 0xC6, 0xC7, 0xC9, 0xCA, 0xCB, 0xCD, 0xCE, 0xCF}
+
+
+def image_dimensions(path: Path) -> Optional[Tuple[int, int]]:
+    """(width, height) from the file header, or None if the format is not recognised."""
+    with path.open("rb") as f:
+        head = f.read(32)
+        if head.startswith(b"\x89PNG\r\n\x1a\n"):
+            return struct.unpack(">II", head[16:24])
+        if head[:6] in (b"GIF87a", b"GIF89a"):
+            return struct.unpack("<HH", head[6:10])
+        if head[:4] == b"RIFF" and head[8:12] == b"WEBP":
+            chunk = head[12:16]
+            if chunk == b"VP8 ":
+                w, h = struct.unpack("<HH", head[26:30])
+                return w & 0x3FFF, h & 0x3FFF
+            if chunk == b"VP8L":
+                bits = int.from_bytes(head[21:25], "little")
+                return (bits & 0x3FFF) + 1, ((bits >> 14) & 0x3FFF) + 1
+            if chunk == b"VP8X":
+                return int.from_bytes(head[24:27], "little") + 1, int.from_bytes(head[27:30], "little") + 1
+            return None
+        if not head.startswith(b"\xff\xd8"):
+            return None
+
+        # JPEG: walk the segments up to the first start-of-frame.
+        f.seek(2)
+        while True:
+            byte = f.read(1)
+            if not byte:
+                return None
+            if byte != b"\xff":
+                continue
+            marker = f.read(1)
+            while marker == b"\xff":
+                marker = f.read(1)
+            if not marker:
+                return None
+            code = marker[0]
+            if code == 0xD8 or code == 0x01 or 0xD0 <= code <= 0xD7:
+                continue
+            length_bytes = f.read(2)
+            if len(length_bytes) < 2:
+                return None
+            if code in _JPEG_SOF:
+                frame = f.read(5)
+                if len(frame) < 5:
+                    return None
+                h, w = struct.unpack(">HH", frame[1:5])
+                return w, h
+            f.seek(struct.unpack(">H", length_bytes)[0] - 2, 1)
+
+
+def content_hash(path: Path) -> str:
+    """16-hex sha256 prefix of a file (the form used by the build manifest and derivative state)."""
+    h = hashlib.sha256()
+    with path.open("rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()[:16]
+
+
+def now() -> str:
+    return time.strftime("%Y-%m-%dT%H:%M:%S")
+
+
+class ProjectStore:
+    """One connection to the store; changes are committed by finish() / close()."""
+
+    def __init__(self, path: Optional[Path] = None, readonly: bool = False) -> None:
+        path = path or STORE_PATH
+        self.path = path
+        self.build_id: Optional[int] = None
+        self.changed = 0
+        if readonly:
+            self.db = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+        else:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            self.db = sqlite3.connect(path)
+            self.db.execute("PRAGMA foreign_keys = ON")
+            self.db.execute("PRAGMA synchronous = NORMAL")
+            self._migrate()
+        self.db.row_factory = sqlite3.Row
+
+    def _migrate(self) -> None:
+        version = self.db.execute("PRAGMA user_version").fetchone()[0]
+        if version == SCHEMA_VERSION:
+            return
+        if version:
+            print(f"[WARN] {self.path.name}: schema {version} -> {SCHEMA_VERSION}, rebuilding the store")
+        tables = [r[0] for r in self.db.execute("SELECT name FROM sqlite_master WHERE type = 'table'")]
+        self.db.execute("PRAGMA foreign_keys = OFF")
+        for table in tables:
+            self.db.execute(f"DROP TABLE IF EXISTS {table}")
+        self.db.executescript(SCHEMA)
+        self.db.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+        self.db.execute("PRAGMA foreign_keys = ON")
+        self.db.commit()
+
+    # -- builds --
+
+    def begin(self, stage: str) -> int:
+        """Start a build row; rows this run touches are stamped with its id."""
+        cur = self.db.execute("INSERT INTO builds (stage, started) VALUES (?, ?)", (stage, now()))
+        self.build_id = cur.lastrowid
+        self.changed = 0
+        return self.build_id
+
+    def finish(self) -> None:
+        if self.build_id is not None:
+            self.db.execute(
+                "UPDATE builds SET finished = ?, changed = ? WHERE id = ?", (now(), self.changed, self.build_id)
+            )
+        self.db.commit()
+
+    def close(self) -> None:
+        self.finish()
+        self.db.close()
+
+    def __enter__(self) -> "ProjectStore":
+        return self
+
+    def __exit__(self, exc_type: Any, *_: Any) -> None:
+        if exc_type is None:
+            self.close()
+        else:
+            self.db.rollback()
+            self.db.close()
+
+    # -- projects --
+
+    def put_project(
+        self,
+        row: Dict[str, Any],
+        descriptions: Sequence[str],
+        specs: Iterable[Tuple[str, str]],
+        source_hash: str,
+    ) -> bool:
+        """
+        Upsert one project. Returns True if its sheet data changed (descriptions and spec values
+        are only rewritten then); listing position and publish state are always refreshed.
+        """
+        pid = row["id"]
+        old = self.db.execute("SELECT source_hash FROM projects WHERE id = ?", (pid,)).fetchone()
+        if old and old[0] == source_hash:
+            self.db.execute(
+                "UPDATE projects SET published = ?, position = ? WHERE id = ?", (row["published"], row["position"], pid)
+            )
+            return False
+
+        values = dict(row, source_hash=source_hash, changed_build=self.build_id)
+        values["tags"] = json.dumps(row["tags"], ensure_ascii=False)
+        values["focal_point"] = json.dumps(list(row["focal_point"])) if row.get("focal_point") else None
+        columns = ", ".join(values)
+        self.db.execute(
+            f"INSERT INTO projects ({columns}) VALUES ({', '.join('?' * len(values))}) "
+            f"ON CONFLICT(id) DO UPDATE SET {', '.join(f'{c} = excluded.{c}' for c in values if c != 'id')}",
+            list(values.values()),
+        )
+        self.db.execute("DELETE FROM descriptions WHERE project_id = ?", (pid,))
+        self.db.executemany(
+            "INSERT INTO descriptions VALUES (?, ?, ?)", [(pid, i, text) for i, text in enumerate(descriptions)]
+        )
+        self.db.execute("DELETE FROM spec_values WHERE project_id = ?", (pid,))
+        self.db.executemany(
+            "INSERT INTO spec_values VALUES (?, ?, ?, ?)", [(pid, i, k, v) for i, (k, v) in enumerate(specs)]
+        )
+        self.changed += 1
+        return True
+
+    def retain_projects(self, ids: Iterable[str]) -> List[str]:
+        """Delete projects not in ids (rows removed from the sheet); returns the deleted ids."""
+        keep = set(ids)
+        gone = [r[0] for r in self.db.execute("SELECT id FROM projects") if r[0] not in keep]
+        self.db.executemany("DELETE FROM projects WHERE id = ?", [(pid,) for pid in gone])
+        self.changed += len(gone)
+        return gone
+
+    def note_detail(self, pid: str, detail_path: Path, detail_hash: str) -> None:
+        """Record the detail JSON just written for pid."""
+        st = detail_path.stat()
+        self.db.execute(
+            "UPDATE projects SET detail_hash = ?, detail_size = ?, detail_mtime_ns = ? WHERE id = ?",
+            (detail_hash, st.st_size, st.st_mtime_ns, pid),
+        )
+
+    def current_detail_hash(self, pid: str, detail_path: Path) -> Optional[str]:
+        """Hash of pid's detail JSON if the file is still the one the compiler last wrote."""
+        row = self.db.execute(
+            "SELECT detail_hash, detail_size, detail_mtime_ns FROM projects WHERE id = ?", (pid,)
+        ).fetchone()
+        if not row or not row[0]:
+            return None
+        try:
+            st = detail_path.stat()
+        except FileNotFoundError:
+            return None
+        return row[0] if (st.st_size, st.st_mtime_ns) == (row[1], row[2]) else None
+
+    def changed_projects(self, since: Optional[int] = None) -> List[str]:
+        """Projects changed by the given build and later (default: the last compiler run)."""
+        if since is None:
+            row = self.db.execute(
+                "SELECT max(id) FROM builds WHERE stage = 'sheets_to_projects_json'"
+            ).fetchone()
+            since = row[0] or 0
+        rows = self.db.execute("SELECT id FROM projects WHERE changed_build >= ? ORDER BY id", (since,))
+        return [r[0] for r in rows]
+
+    # -- images --
+
+    def _image(self, path: Path, want_hash: bool = False, want_size: bool = False) -> sqlite3.Row:
+        """
+        Image row for path. The hash and dimensions are kept while the file's size + mtime are
+        unchanged; when the file changes, whatever was known about it is recomputed.
+        """
+        rel = str(path.relative_to(SITE_ROOT)).replace("\\", "/")
+        st = path.stat()
+        row = self.db.execute("SELECT * FROM images WHERE path = ?", (rel,)).fetchone()
+        fresh = row is not None and (row["bytes"], row["mtime_ns"]) == (st.st_size, st.st_mtime_ns)
+        if fresh and (row["hash"] or not want_hash) and (row["width"] is not None or not want_size):
+            return row
+
+        digest = row["hash"] if fresh else None
+        if digest is None and (want_hash or (row is not None and row["hash"])):
+            digest = content_hash(path)
+        dims = (row["width"], row["height"]) if fresh and row["width"] is not None else None
+        if dims is None and (want_size or (row is not None and row["width"] is not None)):
+            dims = image_dimensions(path)
+        changed = row is None or digest != row["hash"]
+        self.db.execute(
+            "INSERT INTO images (path, bytes, mtime_ns, hash, width, height, changed_build)"
+            " VALUES (?, ?, ?, ?, ?, ?, ?) ON CONFLICT(path) DO UPDATE SET"
+            " bytes = excluded.bytes, mtime_ns = excluded.mtime_ns, hash = excluded.hash,"
+            " width = excluded.width, height = excluded.height,"
+            " changed_build = CASE WHEN ? THEN excluded.changed_build ELSE images.changed_build END",
+            (rel, st.st_size, st.st_mtime_ns, digest, *(dims or (None, None)), self.build_id, changed),
+        )
+        return self.db.execute("SELECT * FROM images WHERE path = ?", (rel,)).fetchone()
+
+    def file_hash(self, path: Path) -> str:
+        """content_hash(path), computed only when the file changed since it was last hashed."""
+        return self._image(path, want_hash=True)["hash"]
+
+    def dimensions(self, path: Path) -> Optional[Tuple[int, int]]:
+        row = self._image(path, want_size=True)
+        return (row["width"], row["height"]) if row["width"] is not None else None
+
+    def set_project_images(self, pid: str, images: Sequence[Tuple[str, Path]]) -> int:
+        """
+        Record a project's images as (role, path), in order: hashes and dimensions are refreshed
+        for files that changed, and images no longer listed are dropped. Returns how many changed.
+        """
+        before = self.changed
+        keep = []
+        position: Dict[str, int] = {}
+        for role, path in images:
+            if not path.exists():
+                continue
+            row = self._image(path, want_hash=True, want_size=True)
+            keep.append(row["path"])
+            position[role] = position.get(role, -1) + 1
+            if (row["project_id"], row["role"], row["position"]) != (pid, role, position[role]):
+                self.db.execute(
+                    "UPDATE images SET project_id = ?, role = ?, position = ?, changed_build = ? WHERE path = ?",
+                    (pid, role, position[role], self.build_id, row["path"]),
+                )
+            if row["changed_build"] == self.build_id or row["project_id"] != pid:
+                self.changed += 1
+        stale = [r[0] for r in self.db.execute("SELECT path FROM images WHERE project_id = ?", (pid,)) if r[0] not in keep]
+        self.db.executemany("DELETE FROM images WHERE path = ?", [(p,) for p in stale])
+        self.changed += len(stale)
+        return self.changed - before
+
+    def set_variants(self, image: Path, kind: str, variants: Sequence[Tuple[str, Optional[int], Optional[int]]]) -> None:
+        """Replace the variants of one kind for an image with (path, width, height) rows."""
+        rel = self._image(image)["path"]
+        old = {tuple(r) for r in self.db.execute(
+            "SELECT path, width, height FROM variants WHERE image_path = ? AND kind = ?", (rel, kind))}
+        if old == set(variants):
+            return
+        self.db.execute("DELETE FROM variants WHERE image_path = ? AND kind = ?", (rel, kind))
+        self.db.executemany(
+            "INSERT INTO variants VALUES (?, ?, ?, ?, ?)", [(rel, kind, p, w, h) for p, w, h in variants]
+        )
+        self.changed += 1
+
+    # -- queries --
+
+    def query(self, sql: str, params: Sequence[Any] = ()) -> List[sqlite3.Row]:
+        return self.db.execute(sql, params).fetchall()
+
+    def stats(self) -> Dict[str, int]:
+        tables = ("projects", "descriptions", "spec_values", "images", "variants", "builds")
+        return {t: self.db.execute(f"SELECT count(*) FROM {t}").fetchone()[0] for t in tables}
+
+
+def open_store(path: Optional[Path] = None, stage: Optional[str] = None) -> ProjectStore:
+    """Open the store for a pipeline stage (starting a build row when stage is given)."""
+    store = ProjectStore(path)
+    if stage:
+        store.begin(stage)
+    return store
+
+
+def print_rows(rows: List[sqlite3.Row], as_json: bool) -> None:
+    if as_json:
+        print(json.dumps([dict(r) for r in rows], indent=2, ensure_ascii=False))
+        return
+    if not rows:
+        print("(no rows)")
+        return
+    columns = list(rows[0].keys())
+    cells = [[("" if r[c] is None else str(r[c])) for c in columns] for r in rows]
+    widths = [max(len(c), *(len(row[i]) for row in cells)) for i, c in enumerate(columns)]
+    print("  ".join(c.ljust(w) for c, w in zip(columns, widths)).rstrip())
+    for row in cells:
+        print("  ".join(v.ljust(w) for v, w in zip(row, widths)).rstrip())
+
+
+def parse_args() -> argparse.Namespace:
+    ap = argparse.ArgumentParser(description="Query the pipeline's project store.")
+    ap.add_argument("--store", type=Path, default=STORE_PATH, help="Store file (default: data/_project-store.sqlite).")
+    ap.add_argument("--json", action="store_true", help="Print rows as JSON.")
+    sub = ap.add_subparsers(dest="command", required=True)
+    sub.add_parser("stats", help="Row counts per table.")
+    sub.add_parser("builds", help="The last 20 stage runs.")
+    changed = sub.add_parser("changed", help="Projects changed by the last compiler run (or since a build id).")
+    changed.add_argument("--since", type=int, help="Build id.")
+    sub.add_parser("missing-cards", help="Published projects with no card crop of their featured image.")
+    sql = sub.add_parser("sql", help="Run a read-only SQL query.")
+    sql.add_argument("query")
+    return ap.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    if not args.store.exists():
+        print(f"Error: {args.store} not found (run sheets_to_projects_json.py first)")
+        sys.exit(1)
+    store = ProjectStore(args.store, readonly=True)
+    try:
+        if args.command == "stats":
+            counts = store.stats()
+            if args.json:
+                print(json.dumps(counts, indent=2))
+            else:
+                for table, n in counts.items():
+                    print(f"{table:<13} {n:>7,}")
+        elif args.command == "changed":
+            ids = store.changed_projects(args.since)
+            print(json.dumps(ids, indent=2) if args.json else "\n".join(ids) or "(no changes)")
+        elif args.command == "sql":
+            print_rows(store.query(args.query), args.json)
+        else:
+            print_rows(store.query(QUERIES[args.command]), args.json)
+    except sqlite3.Error as e:
+        print(f"[ERROR] {e}")
+        sys.exit(1)
+    finally:
+        store.db.close()
+
+
+if __name__ == "__main__":
+    main()
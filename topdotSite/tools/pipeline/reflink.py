@@ -0,0 +1,31 @@
+"""
+Copy-on-write file clones.
+
+Shared by assemble_dist.py and artifact_cache.py. Uses the Linux FICLONE ioctl
+(btrfs, XFS and similar); anywhere else, including Windows where fcntl does not
+exist, reflink() raises OSError and callers fall back to a plain copy.
+"""
+
+from __future__ import annotations
+
+import shutil
+from pathlib import Path
+
+
+FICLONE = 0x40049409  # _IOW(0x94, 9, int), Linux
+
+
+def reflink(src: Path, dest: Path) -> None:
+    """Clone src to dest (with its mtime/mode); OSError if the platform or filesystem can't."""
+    try:
+        import fcntl  # POSIX only
+    except ImportError:
+        raise OSError("reflink is not supported on this platform") from None
+    with src.open("rb") as s, dest.open("wb") as d:
+        try:
+            fcntl.ioctl(d.fileno(), FICLONE, s.fileno())
+        except OSError:
+            d.close()
+            dest.unlink()
+            raise
+    shutil.copystat(src, dest)
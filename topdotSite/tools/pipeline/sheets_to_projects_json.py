@@ -2,13 +2,23 @@
 Sheets → Projects JSON compiler.
 
 Reads CSV exports from Google Sheets and generates:
-- topdotSite/data/projects.json (listing)
+- topdotSite/data/projects.json (listing, in display order)
+- topdotSite/data/projects/by-tag/<tag>.json (listing shards per tag)
+- topdotSite/data/projects-facets.json (tag facet counts)
+- topdotSite/data/projects-spec-index.json (typed, columnar spec values for range filtering)
 - topdotSite/data/projects/<id>.json (detail)
+- topdotSite/data/projects.php (PHP array literal for partials/projects-grid.php)
 - topdotSite/data/_build-manifest.json (hashes for change detection)
 - topdotSite/data/_change-report.txt (human-readable diff)
 
+Projects, descriptions and spec values are also upserted into the project store
+(data/_project-store.sqlite, see project_store.py). A project whose sheet rows are unchanged
+and whose detail JSON is still the one written last time is not rebuilt; --force rebuilds all.
+Bumping COMPILER_VERSION rebuilds everything once, the same way as in blog_to_json.py.
+
 Run:
-  python topdotSite/tools/pipeline/sheets_to_projects_json.py
+  python topdotSite/tools/pipeline/sheets_to_projects_json.py [--force] [--timings] [--trace PATH] [--profile]
+  (see pipeline_trace.py for the timing/trace flags)
 """
 
 from __future__ import annotations
@@ -16,26 +26,80 @@ from __future__ import annotations
 import csv
 import hashlib
 import json
-from dataclasses import dataclass
+import os
+import re
+import sys
+from array import array
+from dataclasses import asdict, dataclass
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+import pipeline_trace as trace
+from project_store import ProjectStore, open_store
 
 
 SITE_ROOT = Path(__file__).resolve().parents[2]
 SHEETS_DIR = SITE_ROOT / "data" / "sheets"
 DATA_DIR = SITE_ROOT / "data"
 PROJECTS_DIR = DATA_DIR / "projects"
+TAG_SHARDS_DIR = PROJECTS_DIR / "by-tag"
+FACETS_PATH = DATA_DIR / "projects-facets.json"
+SPEC_INDEX_PATH = DATA_DIR / "projects-spec-index.json"
 MANIFEST_PATH = DATA_DIR / "_build-manifest.json"
 REPORT_PATH = DATA_DIR / "_change-report.txt"
 
-
-def read_csv(name: str) -> List[Dict[str, str]]:
-    """Read a CSV from the sheets directory."""
+# Detail JSON fields written by the asset stages; carried over as-is on rebuild.
+ASSET_OWNED_FIELDS = ("galleryMeta",)
+
+# Part of every project's source hash in the project store. Bump when the detail JSON
+# format changes, so unchanged rows are rebuilt once instead of being skipped.
+COMPILER_VERSION = 1
+
+# Listing card thumbnails (written by build_image_derivatives.py): one square crop per
+# project at 1x/2x/3x of the widest grid column.
+CARD_WIDTHS = (400, 800, 1200)
+CARD_ASPECT = 1.0
+CARD_SIZES = "(max-width: 600px) 100vw, (max-width: 1024px) 50vw, 33vw"
+
+# SpecDefinitions.value_type values that get a typed column in the spec index.
+NUMERIC_VALUE_TYPES = {"number", "area"}
+ENUM_VALUE_TYPE = "enum"
+
+# Square feet per unit, for area specs.
+AREA_UNITS = {
+    "sq ft": 1.0,
+    "sqft": 1.0,
+    "sf": 1.0,
+    "ft2": 1.0,
+    "ft²": 1.0,
+    "sq m": 10.7639,
+    "sqm": 10.7639,
+    "m2": 10.7639,
+    "m²": 10.7639,
+}
+
+
+def iter_csv(name: str) -> Iterator[List[str]]:
+    """Stream a CSV from the sheets directory as lists; the first list is the header."""
     path = SHEETS_DIR / name
     if not path.exists():
-        return []
-    with path.open(encoding="utf-8-sig") as f:
-        return list(csv.DictReader(f))
+        return
+    with path.open(encoding="utf-8-sig", newline="") as f:
+        yield from csv.reader(f)
+
+
+def column_index(header: List[str]) -> Dict[str, int]:
+    """Column name (stripped) -> position; the first column wins for duplicate names."""
+    out: Dict[str, int] = {}
+    for i, name in enumerate(header):
+        out.setdefault(name.strip(), i)
+    return out
+
+
+def cell(row: List[str], col: Dict[str, int], name: str) -> str:
+    """Stripped value of a named column ("" when the column or cell is missing)."""
+    i = col.get(name)
+    return row[i].strip() if i is not None and i < len(row) else ""
 
 
 def slugify(name: str) -> str:
@@ -78,6 +142,23 @@ def is_empty(val: str) -> bool:
     return not val or not str(val).strip()
 
 
+def parse_focal_point(val: str) -> Optional[tuple[float, float]]:
+    """Parse "x,y" (fractions 0-1 or percentages) into a clamped (x, y) pair."""
+    parts = [x.strip() for x in (val or "").split(",")]
+    if len(parts) != 2:
+        return None
+    out = []
+    for part in parts:
+        try:
+            n = float(part.rstrip("%"))
+        except ValueError:
+            return None
+        if part.endswith("%") or n > 1:
+            n /= 100
+        out.append(min(1.0, max(0.0, n)))
+    return (out[0], out[1])
+
+
 @dataclass
 class Project:
     id: str
@@ -90,6 +171,7 @@ class Project:
     image_dir: str
     featured_ext: str
     sort_priority: Optional[int]
+    focal_point: Optional[tuple[float, float]] = None
 
 
 @dataclass
@@ -100,28 +182,32 @@ class SpecDef:
     show_on: List[str]
     order: int
     required: bool
+    value_type: str = "text"
+    unit: str = ""
 
 
 def load_projects() -> List[Project]:
     """Load Projects tab."""
-    rows = read_csv("Projects.csv")
+    rows = iter_csv("Projects.csv")
+    col = column_index(next(rows, []))
     out: List[Project] = []
     for r in rows:
-        pid = r.get("id", "").strip()
+        pid = cell(r, col, "id")
         if not pid:
             continue
-        name = r.get("name", "").strip() or pid
-        ptype = r.get("type", "").strip()
-        tags_raw = r.get("tags", "").strip()
+        name = cell(r, col, "name") or pid
+        ptype = cell(r, col, "type")
+        tags_raw = cell(r, col, "tags")
         tags = parse_tags(tags_raw) if tags_raw else ([ptype] if ptype else [])
-        status = r.get("status", "").strip() or "draft"
-        year_str = r.get("year", "").strip()
+        status = cell(r, col, "status") or "draft"
+        year_str = cell(r, col, "year")
         year = int(year_str) if year_str.isdigit() else None
-        location = r.get("location", "").strip()
-        image_dir = r.get("image_dir", "").strip()
-        featured_ext = r.get("featured_ext", "").strip() or "jpg"
-        sort_str = r.get("sort_priority", "").strip()
+        location = cell(r, col, "location")
+        image_dir = cell(r, col, "image_dir")
+        featured_ext = cell(r, col, "featured_ext") or "jpg"
+        sort_str = cell(r, col, "sort_priority")
         sort_priority = int(sort_str) if sort_str.isdigit() else None
+        focal_point = parse_focal_point(cell(r, col, "focal_point"))
 
         out.append(
             Project(
@@ -135,25 +221,29 @@ def load_projects() -> List[Project]:
                 image_dir=image_dir,
                 featured_ext=featured_ext,
                 sort_priority=sort_priority,
+                focal_point=focal_point,
             )
         )
     return out
 
 
 def load_spec_defs() -> Dict[str, SpecDef]:
-    """Load SpecDefinitions tab (global, no type column)."""
-    rows = read_csv("SpecDefinitions.csv")
+    """Load SpecDefinitions tab (global, no type column; value_type/unit are optional)."""
+    rows = iter_csv("SpecDefinitions.csv")
+    col = column_index(next(rows, []))
     out: Dict[str, SpecDef] = {}
     for r in rows:
-        key = r.get("key", "").strip()
+        key = sys.intern(cell(r, col, "key"))
         if not key:
             continue
-        label = r.get("label", "").strip() or key
-        emit = is_truthy(r.get("emit", ""))
-        show_on = parse_show_on(r.get("show_on", ""))
-        order_str = r.get("order", "").strip()
+        label = cell(r, col, "label") or key
+        emit = is_truthy(cell(r, col, "emit"))
+        show_on = parse_show_on(cell(r, col, "show_on"))
+        order_str = cell(r, col, "order")
         order = int(order_str) if order_str.isdigit() else 0
-        required = is_truthy(r.get("required", ""))
+        required = is_truthy(cell(r, col, "required"))
+        value_type = cell(r, col, "value_type").lower() or "text"
+        unit = cell(r, col, "unit")
         out[key] = SpecDef(
             key=key,
             label=label,
@@ -161,21 +251,24 @@ def load_spec_defs() -> Dict[str, SpecDef]:
             show_on=show_on,
             order=order,
             required=required,
+            value_type=value_type,
+            unit=unit,
         )
     return out
 
 
 def load_descriptions() -> Dict[str, List[str]]:
     """Load ProjectDescriptions tab (long format)."""
-    rows = read_csv("ProjectDescriptions.csv")
+    rows = iter_csv("ProjectDescriptions.csv")
+    col = column_index(next(rows, []))
     out: Dict[str, List[tuple[int, str]]] = {}
     for r in rows:
-        pid = r.get("project_id", "").strip()
+        pid = cell(r, col, "project_id")
         if not pid:
             continue
-        order_str = r.get("order", "").strip()
+        order_str = cell(r, col, "order")
         order = int(order_str) if order_str.isdigit() else 0
-        text = r.get("text", "").strip()
+        text = cell(r, col, "text")
         if not text:
             continue
         out.setdefault(pid, []).append((order, text))
@@ -184,57 +277,111 @@ def load_descriptions() -> Dict[str, List[str]]:
     return {pid: [t for _, t in sorted(items)] for pid, items in out.items()}
 
 
-def load_specs() -> Dict[str, List[tuple[str, str]]]:
+class ProjectSpecs:
     """
-    Load ProjectSpecs tab.
+    One project's spec values, in sheet order.
+
+    Keys are stored as positions in the shared key table (from SpecDefinitions) and values
+    are interned, so repeated values ("Toronto, ON", "Wood frame") are stored once.
+    Iterates as (key, value) pairs.
+    """
+
+    __slots__ = ("_table", "_keys", "_values")
+
+    def __init__(self, table: Tuple[str, ...]) -> None:
+        self._table = table
+        self._keys = array("H")
+        self._values: List[str] = []
+
+    def append(self, key_pos: int, value: str) -> None:
+        self._keys.append(key_pos)
+        self._values.append(sys.intern(value))
+
+    def get(self, key: str, default: str = "") -> str:
+        """Value for key (the last one, if the sheet repeats it)."""
+        found = default
+        for pos, value in zip(self._keys, self._values):
+            if self._table[pos] == key:
+                found = value
+        return found
+
+    def __iter__(self) -> Iterator[Tuple[str, str]]:
+        table = self._table
+        return ((table[pos], value) for pos, value in zip(self._keys, self._values))
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+
+def load_specs(spec_defs: Dict[str, SpecDef]) -> Dict[str, ProjectSpecs]:
+    """
+    Load ProjectSpecs tab, streaming.
 
     Supports TWO CSV shapes:
     - Long format (original): columns project_id,key,value
     - Wide format (recommended for humans): one row per project, with columns:
       project_id,<spec_key_1>,<spec_key_2>,...
+
+    Only keys defined in SpecDefinitions are kept (nothing else is emitted or indexed);
+    unknown keys are reported once.
     """
-    rows = read_csv("ProjectSpecs.csv")
-    out: Dict[str, List[tuple[str, str]]] = {}
-    if not rows:
-        return out
-
-    # Detect shape by presence of "key" + "value" columns.
-    # DictReader returns keys for all columns, even if empty per-row.
-    first_keys = {k.strip() for k in rows[0].keys() if k is not None}
-    is_long = "key" in first_keys and "value" in first_keys
-
-    if not is_long:
-        # Wide format: project_id + spec-key columns.
+    table = tuple(spec_defs)
+    key_pos = {key: i for i, key in enumerate(table)}
+    out: Dict[str, ProjectSpecs] = {}
+    unknown: Dict[str, None] = {}
+
+    rows = iter_csv("ProjectSpecs.csv")
+    col = column_index(next(rows, []))
+
+    def record(pid: str) -> ProjectSpecs:
+        specs = out.get(pid)
+        if specs is None:
+            specs = out[pid] = ProjectSpecs(table)
+        return specs
+
+    if not ("key" in col and "value" in col):
+        # Wide format: project_id + spec-key columns. Resolve the columns once.
+        pid_col = col.get("project_id", col.get("id"))
+        spec_cols: List[Tuple[int, int]] = []
+        for name, i in col.items():
+            if not name or name in {"project_id", "id"}:
+                continue
+            if name in key_pos:
+                spec_cols.append((i, key_pos[name]))
+            else:
+                unknown[name] = None
+        spec_cols.sort()
         for r in rows:
-            pid = (r.get("project_id") or r.get("id") or "").strip()
+            pid = r[pid_col].strip() if pid_col is not None and pid_col < len(r) else ""
             if not pid:
                 continue
-            for col, val in r.items():
-                if not col:
-                    continue
-                key = col.strip()
-                if key in {"project_id", "id"}:
-                    continue
-                value = (val or "").strip()
-                if is_empty(value):
-                    continue
-                out.setdefault(pid, []).append((key, value))
-        return out
+            specs = record(pid)
+            for i, pos in spec_cols:
+                if i < len(r):
+                    value = r[i].strip()
+                    if value:
+                        specs.append(pos, value)
+    else:
+        # Long format: project_id, key, value
+        for r in rows:
+            pid = cell(r, col, "project_id")
+            if not pid:
+                continue
+            key = cell(r, col, "key")
+            value = cell(r, col, "value")
+            if not key or is_empty(value):
+                continue
+            if key not in key_pos:
+                unknown[key] = None
+                continue
+            record(pid).append(key_pos[key], value)
 
-    # Long format: project_id, key, value
-    for r in rows:
-        pid = r.get("project_id", "").strip()
-        if not pid:
-            continue
-        key = r.get("key", "").strip()
-        value = r.get("value", "").strip()
-        if not key or is_empty(value):
-            continue
-        out.setdefault(pid, []).append((key, value))
-    return out
+    if unknown:
+        print(f"[WARN] ProjectSpecs.csv: keys not in SpecDefinitions ignored: {', '.join(unknown)}")
+    return {pid: specs for pid, specs in out.items() if len(specs)}
 
 
-def build_specs_array(project_specs: List[tuple[str, str]], spec_defs: Dict[str, SpecDef]) -> List[Dict[str, Any]]:
+def build_specs_array(project_specs: Iterable[Tuple[str, str]], spec_defs: Dict[str, SpecDef]) -> List[Dict[str, Any]]:
     """Build specs[] for a project by joining values with definitions."""
     specs = []
     for key, value in project_specs:
@@ -254,15 +401,145 @@ def build_specs_array(project_specs: List[tuple[str, str]], spec_defs: Dict[str,
     return specs
 
 
+_NUM = r"\d[\d,]*(?:\.\d+)?"
+_RANGE_RE = re.compile(rf"({_NUM})\s*(?:-|–|to)\s*({_NUM})", re.I)
+_DIMENSIONS_RE = re.compile(rf"({_NUM})\s*'?\s*[x×]\s*({_NUM})", re.I)
+_AREA_RE = re.compile(rf"({_NUM})\s*(sq\.?\s*ft|sqft|sf|ft2|ft²|sq\.?\s*m|sqm|m2|m²)\b", re.I)
+
+
+def _to_number(s: str) -> float:
+    n = float(s.replace(",", ""))
+    return int(n) if n.is_integer() else n
+
+
+def parse_number_range(value: str) -> Optional[tuple[float, float]]:
+    """Parse "12", "4-6" or "4 to 6" into (min, max)."""
+    m = _RANGE_RE.search(value)
+    if m:
+        lo, hi = _to_number(m.group(1)), _to_number(m.group(2))
+        return (min(lo, hi), max(lo, hi))
+    m = re.search(_NUM, value)
+    if m:
+        n = _to_number(m.group(0))
+        return (n, n)
+    return None
+
+
+def parse_area(value: str, unit: str) -> Optional[tuple[float, float]]:
+    """
+    Parse an area spec into (min, max) in `unit` (default sq ft).
+
+    Accepts lot dimensions ("35x135", "20' x 80'", taken as feet), explicit areas
+    ("3,500 sq ft (above grade) + 1,200 sq ft (basement)" sums the parts), or bare numbers/ranges.
+    """
+    per_unit = AREA_UNITS.get(unit.lower(), 1.0) if unit else 1.0
+    m = _DIMENSIONS_RE.search(value)
+    if m:
+        sq_ft = _to_number(m.group(1)) * _to_number(m.group(2))
+    else:
+        parts = _AREA_RE.findall(value)
+        if not parts:
+            return parse_number_range(value)
+        sq_ft = 0.0
+        for amount, u in parts:
+            key = re.sub(r"[.\s]+", " ", u.lower()).strip()
+            sq_ft += _to_number(amount) * AREA_UNITS.get(key, AREA_UNITS.get(key.replace(" ", ""), 1.0))
+    n = round(sq_ft / per_unit, 2)
+    n = int(n) if float(n).is_integer() else n
+    return (n, n)
+
+
+def parse_spec_value(value: str, spec_def: SpecDef) -> Optional[tuple[float, float]]:
+    """Parse a numeric spec value into (min, max) according to its SpecDefinitions value_type."""
+    if spec_def.value_type == "area":
+        return parse_area(value, spec_def.unit)
+    if spec_def.value_type == "number":
+        return parse_number_range(value)
+    return None
+
+
+def build_spec_index(
+    ids: List[str],
+    all_specs: Dict[str, ProjectSpecs],
+    spec_defs: Dict[str, SpecDef],
+) -> Dict[str, Any]:
+    """
+    Build a columnar spec index over the listing.
+
+    Columns are parallel to `ids` (listing order):
+    - number/area specs: {"type", "unit", "min": [...], "max": [...]} (null when missing/unparseable)
+    - enum specs: {"type": "enum", "values": [...], "codes": [...]} (code -1 when missing)
+    """
+    typed = [
+        d for d in sorted(spec_defs.values(), key=lambda d: d.order)
+        if d.value_type in NUMERIC_VALUE_TYPES or d.value_type == ENUM_VALUE_TYPE
+    ]
+    no_specs = ProjectSpecs(())
+    project_specs = [all_specs.get(pid, no_specs) for pid in ids]
+
+    columns: Dict[str, Any] = {}
+    for d in typed:
+        raw = [specs.get(d.key, "") for specs in project_specs]
+        if d.value_type == ENUM_VALUE_TYPE:
+            values: List[str] = []
+            codes: List[int] = []
+            for v in raw:
+                if is_empty(v):
+                    codes.append(-1)
+                    continue
+                if v not in values:
+                    values.append(v)
+                codes.append(values.index(v))
+            columns[d.key] = {"type": ENUM_VALUE_TYPE, "values": values, "codes": codes}
+        else:
+            parsed = [parse_spec_value(v, d) if not is_empty(v) else None for v in raw]
+            columns[d.key] = {
+                "type": d.value_type,
+                "unit": d.unit,
+                "min": [r[0] if r else None for r in parsed],
+                "max": [r[1] if r else None for r in parsed],
+            }
+    return {"ids": ids, "columns": columns}
+
+
 def should_publish(status: str) -> bool:
     """Determine if a project should appear on the public site."""
     return status.lower() in {"published", "coming-soon"}
 
 
+def listing_sort_key(p: Project) -> tuple:
+    """
+    Display order for the listing.
+
+    Projects with a sort_priority come first (lowest number first), then the rest
+    newest year first (missing years last), then by name.
+    """
+    pinned = (0, p.sort_priority) if p.sort_priority is not None else (1, 0)
+    year = (0, -p.year) if p.year is not None else (1, 0)
+    return (pinned, year, p.name.casefold())
+
+
+def card_thumbnail_path(project_id: str, width: int) -> str:
+    """Site-relative path of a listing card thumbnail."""
+    return f"images/_derived/cards/{project_id}-{width}.jpg"
+
+
+def card_thumbnail_fields(project_id: str) -> Dict[str, str]:
+    """thumbnail/thumbnailSrcset/thumbnailSizes for the card derivatives, if they have been built."""
+    paths = {w: card_thumbnail_path(project_id, w) for w in CARD_WIDTHS}
+    if not all((SITE_ROOT / path).exists() for path in paths.values()):
+        return {}
+    return {
+        "thumbnail": paths[CARD_WIDTHS[1] if len(CARD_WIDTHS) > 1 else CARD_WIDTHS[0]],
+        "thumbnailSrcset": ", ".join(f"{path} {w}w" for w, path in paths.items()),
+        "thumbnailSizes": CARD_SIZES,
+    }
+
+
 def build_listing_entry(p: Project) -> Dict[str, Any]:
     """Build a listing entry for projects.json."""
     thumbnail = f"{p.image_dir}Featured.{p.featured_ext}"
-    return {
+    entry = {
         "id": p.id,
         "name": p.name,
         "slug": slugify(p.name),
@@ -273,6 +550,57 @@ def build_listing_entry(p: Project) -> Dict[str, Any]:
         "href": f"project.html?id={p.id}",
         "detailJson": f"data/projects/{p.id}.json",
     }
+    # Prefer the cropped card derivatives over the full-size hero when present.
+    entry.update(card_thumbnail_fields(p.id))
+    return entry
+
+
+def build_tag_shards(listing: List[Dict[str, Any]]) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Group listing entries by tag, keeping display order (tags in first-seen order).
+
+    Exits with an error if two tags share a shard file (e.g. "Mixed Use" and "mixed-use"):
+    one shard would silently overwrite the other, so the tags must be unified in the sheet.
+    """
+    shards: Dict[str, List[Dict[str, Any]]] = {}
+    by_path: Dict[str, List[str]] = {}
+    for entry in listing:
+        for tag in entry["tags"]:
+            if tag not in shards:
+                by_path.setdefault(tag_shard_path(tag), []).append(tag)
+            shards.setdefault(tag, []).append(entry)
+    collisions = {path: tags for path, tags in by_path.items() if len(tags) > 1}
+    for path, tags in collisions.items():
+        print(f"[ERROR] Tags {', '.join(repr(t) for t in tags)} would all be written to {path}; use one spelling in Projects.csv")
+    if collisions:
+        sys.exit(1)
+    return shards
+
+
+def tag_shard_path(tag: str) -> str:
+    """Site-relative path of a tag shard."""
+    return f"data/projects/by-tag/{slugify(tag)}.json"
+
+
+def build_facets(listing: List[Dict[str, Any]], shards: Dict[str, List[Dict[str, Any]]]) -> Dict[str, Any]:
+    """Build the facet table consumed by the filter bar."""
+    return {
+        "total": len(listing),
+        "tags": [{"tag": tag, "count": len(entries), "shard": tag_shard_path(tag)} for tag, entries in shards.items()],
+    }
+
+
+def write_tag_shards(shards: Dict[str, List[Dict[str, Any]]]) -> None:
+    """Write per-tag listing shards and remove shards for tags that no longer exist."""
+    TAG_SHARDS_DIR.mkdir(parents=True, exist_ok=True)
+    keep = set()
+    for tag, entries in shards.items():
+        path = SITE_ROOT / tag_shard_path(tag)
+        keep.add(path.name)
+        path.write_text(json.dumps(entries, indent=2) + "\n", encoding="utf-8")
+    for stale in TAG_SHARDS_DIR.glob("*.json"):
+        if stale.name not in keep:
+            stale.unlink()
 
 
 def build_detail_json(
@@ -298,6 +626,68 @@ def build_detail_json(
     }
 
 
+def php_literal(value: Any, indent: int = 0) -> str:
+    """Render a JSON-compatible value as a PHP literal."""
+    pad = "    " * indent
+    inner = "    " * (indent + 1)
+    if value is None:
+        return "null"
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, (int, float)):
+        return repr(value)
+    if isinstance(value, str):
+        return "'" + value.replace("\\", "\\\\").replace("'", "\\'") + "'"
+    if isinstance(value, list):
+        if not value:
+            return "[]"
+        items = [f"{inner}{php_literal(v, indent + 1)}," for v in value]
+        return "[\n" + "\n".join(items) + f"\n{pad}]"
+    if isinstance(value, dict):
+        if not value:
+            return "[]"
+        items = [f"{inner}{php_literal(str(k))} => {php_literal(v, indent + 1)}," for k, v in value.items()]
+        return "[\n" + "\n".join(items) + f"\n{pad}]"
+    raise TypeError(f"Cannot render {type(value).__name__} as PHP")
+
+
+def write_php_data(path: Path, data: Any, generator: str = "tools/pipeline/sheets_to_projects_json.py") -> None:
+    """
+    Write data as a PHP file that returns an array literal.
+
+    Partials `require` these files; opcache keeps the compiled array in shared memory,
+    so pages render listings without a JSON parse or an extra request.
+    Written via a temp file + rename so PHP never sees a half-written file.
+    """
+    body = f"<?php\n// Generated by {generator}. Do not edit.\n"
+    body += f"return {php_literal(data)};\n"
+    tmp = path.with_name(f".{path.name}.tmp")
+    tmp.write_text(body, encoding="utf-8")
+    os.replace(tmp, path)
+
+
+def write_listing_outputs(listing: List[Dict[str, Any]]) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Write everything derived from the listing: projects.json, per-tag shards, facet counts
+    and the PHP mirror for partials/projects-grid.php. Returns the tag shards.
+
+    Also used by build_image_derivatives.py after it adds card thumbnails.
+    """
+    # Grouped first: a tag collision stops the build before any listing output is written.
+    shards = build_tag_shards(listing)
+
+    listing_path = DATA_DIR / "projects.json"
+    listing_path.write_text(json.dumps(listing, indent=2) + "\n", encoding="utf-8")
+
+    # Per-tag shards + facet counts for the filter bar
+    write_tag_shards(shards)
+    FACETS_PATH.write_text(json.dumps(build_facets(listing, shards), indent=2) + "\n", encoding="utf-8")
+
+    # PHP mirror for the server-rendered listing
+    write_php_data(DATA_DIR / "projects.php", listing)
+    return shards
+
+
 def load_manifest() -> Dict[str, Any]:
     """Load previous build manifest if exists."""
     if not MANIFEST_PATH.exists():
@@ -349,60 +739,127 @@ def generate_change_report(old_manifest: Dict[str, Any], new_manifest: Dict[str,
     return "\n".join(lines)
 
 
+def store_row(p: Project, position: Optional[int]) -> Dict[str, Any]:
+    """Project store columns for one sheet row."""
+    return {
+        "id": p.id,
+        "name": p.name,
+        "type": p.type,
+        "tags": p.tags,
+        "status": p.status,
+        "published": position is not None,
+        "position": position,
+        "year": p.year,
+        "location": p.location,
+        "image_dir": p.image_dir,
+        "featured": f"{p.image_dir}Featured.{p.featured_ext}",
+        "focal_point": p.focal_point,
+    }
+
+
+def update_store(
+    store: ProjectStore,
+    projects: List[Project],
+    publishable: List[Project],
+    all_descriptions: Dict[str, List[str]],
+    all_specs: Dict[str, ProjectSpecs],
+    specs_arrays: Dict[str, List[Dict[str, Any]]],
+) -> set[str]:
+    """Upsert every sheet row into the store; returns the ids whose sheet data changed."""
+    positions = {p.id: i for i, p in enumerate(publishable)}
+    changed: set[str] = set()
+    for p in projects:
+        descriptions = all_descriptions.get(p.id, [])
+        source = compute_hash([COMPILER_VERSION, asdict(p), descriptions, specs_arrays.get(p.id)])
+        if store.put_project(store_row(p, positions.get(p.id)), descriptions, all_specs.get(p.id, ()), source):
+            changed.add(p.id)
+    store.retain_projects(p.id for p in projects)
+    return changed
+
+
 def main() -> None:
-    projects = load_projects()
-    spec_defs = load_spec_defs()
-    all_descriptions = load_descriptions()
-    all_specs = load_specs()
+    force = "--force" in sys.argv
+    trace.start("sheets_to_projects_json")
+    with trace.span("load sheets"):
+        projects = load_projects()
+        spec_defs = load_spec_defs()
+        all_descriptions = load_descriptions()
+        all_specs = load_specs(spec_defs)
 
-    publishable = [p for p in projects if should_publish(p.status)]
+    publishable = sorted((p for p in projects if should_publish(p.status)), key=listing_sort_key)
 
-    # Build listing
+    # Build listing (already in display order)
     listing = [build_listing_entry(p) for p in publishable]
 
+    specs_arrays = {p.id: build_specs_array(all_specs.get(p.id, ()), spec_defs) for p in publishable}
+    store = open_store(stage="sheets_to_projects_json")
+    with trace.span("project store"):
+        changed = update_store(store, projects, publishable, all_descriptions, all_specs, specs_arrays)
+
     # Build details
     PROJECTS_DIR.mkdir(parents=True, exist_ok=True)
     project_hashes: Dict[str, str] = {}
-
-    for p in publishable:
-        descriptions = all_descriptions.get(p.id, [])
-        project_specs = all_specs.get(p.id, [])
-        specs_arr = build_specs_array(project_specs, spec_defs)
-
-        # Preserve existing gallery if present (assets sync updates it)
-        detail_path = PROJECTS_DIR / f"{p.id}.json"
-        existing_gallery = []
-        if detail_path.exists():
-            try:
-                existing = json.loads(detail_path.read_text(encoding="utf-8"))
-                existing_gallery = existing.get("gallery", [])
-            except:
-                pass
-
-        detail = build_detail_json(p, descriptions, specs_arr, existing_gallery)
-        project_hashes[p.id] = compute_hash(detail)
-        detail_path.write_text(json.dumps(detail, indent=2) + "\n", encoding="utf-8")
-
-    # Write listing
-    listing_path = DATA_DIR / "projects.json"
-    listing_path.write_text(json.dumps(listing, indent=2) + "\n", encoding="utf-8")
-
-    # Manifest
-    old_manifest = load_manifest()
-    new_manifest = {
-        "generated_at": "now",
-        "listing_hash": compute_hash(listing),
-        "projects": project_hashes,
-    }
-    save_manifest(new_manifest)
-
-    # Change report
-    report = generate_change_report(old_manifest, new_manifest)
-    REPORT_PATH.write_text(report, encoding="utf-8")
+    skipped = 0
+
+    with trace.span("build details"):
+        for p in publishable:
+            detail_path = PROJECTS_DIR / f"{p.id}.json"
+            current = None if force or p.id in changed else store.current_detail_hash(p.id, detail_path)
+            if current:
+                project_hashes[p.id] = current
+                skipped += 1
+                continue
+            with trace.span(p.id, cat="project"):
+                descriptions = all_descriptions.get(p.id, [])
+                specs_arr = specs_arrays[p.id]
+
+                # Preserve existing gallery if present (assets sync updates it)
+                existing: Dict[str, Any] = {}
+                existing_gallery = []
+                if detail_path.exists():
+                    try:
+                        existing = json.loads(detail_path.read_text(encoding="utf-8"))
+                        existing_gallery = existing.get("gallery", [])
+                    except:
+                        pass
+
+                detail = build_detail_json(p, descriptions, specs_arr, existing_gallery)
+                if p.focal_point:
+                    detail["focalPoint"] = list(p.focal_point)
+                for field in ASSET_OWNED_FIELDS:
+                    if field in existing:
+                        detail[field] = existing[field]
+                project_hashes[p.id] = compute_hash(detail)
+                detail_path.write_text(json.dumps(detail, indent=2) + "\n", encoding="utf-8")
+                store.note_detail(p.id, detail_path, project_hashes[p.id])
+    store.close()
+
+    with trace.span("write listing outputs"):
+        shards = write_listing_outputs(listing)
+
+    # Typed spec columns for client-side range filtering (no detail fetches needed)
+    with trace.span("spec index"):
+        spec_index = build_spec_index([p.id for p in publishable], all_specs, spec_defs)
+        SPEC_INDEX_PATH.write_text(json.dumps(spec_index, ensure_ascii=False, separators=(",", ":")) + "\n", encoding="utf-8")
+
+    # Manifest + change report
+    with trace.span("manifest + report"):
+        old_manifest = load_manifest()
+        new_manifest = {
+            "generated_at": "now",
+            "listing_hash": compute_hash(listing),
+            "projects": project_hashes,
+        }
+        save_manifest(new_manifest)
+        report = generate_change_report(old_manifest, new_manifest)
+        REPORT_PATH.write_text(report, encoding="utf-8")
     print(report)
 
     print(f"Wrote {len(publishable)} projects -> data/projects.json")
-    print(f"Wrote detail JSONs -> data/projects/")
+    print(f"Wrote {len(publishable) - skipped} detail JSONs -> data/projects/ ({skipped} unchanged)")
+    print(f"Wrote {len(shards)} tag shards -> data/projects/by-tag/ (+ data/projects-facets.json)")
+    print(f"Wrote PHP listing -> data/projects.php")
+    trace.finish()
 
 
 if __name__ == "__main__":
@@ -7,17 +7,36 @@ Responsibilities:
 - Collect images in Gallery/, sort deterministically, rename to 01..NN (keep ext).
 - Update gallery[] in data/projects/<id>.json.
 - For multi-unit projects, check Diagrams/ and warn if missing.
+- Record the featured + gallery images (hash, dimensions) in the project store
+  (data/_project-store.sqlite); only files whose size or mtime changed are re-read.
+
+Renames are journaled:
+- Moves are planned as a minimal permutation (only out-of-place files move; a cycle costs
+  one extra move through a `_temp_` name).
+- The plan is written to Gallery/_rename-journal.json before any move and progress is recorded
+  after each one. If a run dies mid-sync, the next run replays the journal (or rolls it back
+  with --rollback) without rescanning or hashing anything.
+
+Append-stable mode (--stable):
+- Existing gallery images keep their names; order is data, kept in Gallery/_order.txt
+  (one filename per line, edit to reorder) and mirrored into gallery[].
+- New images are appended and only they are renamed (to the next free number).
 
 Run:
-  python topdotSite/tools/pipeline/sync_project_assets.py [--dry-run]
+  python topdotSite/tools/pipeline/sync_project_assets.py [--dry-run] [--stable] [--rollback]
+      [--timings] [--trace PATH] [--profile]   (see pipeline_trace.py)
 """
 
 from __future__ import annotations
 
 import json
+import os
 import sys
 from pathlib import Path
-from typing import List
+from typing import Any, Dict, List, Tuple
+
+import pipeline_trace as trace
+from project_store import open_store
 
 
 SITE_ROOT = Path(__file__).resolve().parents[2]
@@ -26,6 +45,9 @@ PROJECTS_JSON = DATA_DIR / "projects.json"
 PROJECTS_DIR = DATA_DIR / "projects"
 
 ALLOWED_EXTENSIONS = {".jpg", ".jpeg", ".png", ".gif", ".webp"}
+ORDER_FILENAME = "_order.txt"
+JOURNAL_FILENAME = "_rename-journal.json"
+TEMP_PREFIX = "_temp_"
 
 
 def is_image(p: Path) -> bool:
@@ -33,17 +55,148 @@ def is_image(p: Path) -> bool:
     return p.suffix.lower() in ALLOWED_EXTENSIONS
 
 
+def list_gallery_images(gallery_path: Path) -> List[Path]:
+    """Images in a gallery folder, ignoring rename temp files."""
+    return [
+        f for f in gallery_path.iterdir()
+        if f.is_file() and is_image(f) and not f.name.startswith(TEMP_PREFIX)
+    ]
+
+
 def normalize_gallery_order(images: List[Path]) -> List[Path]:
     """Sort images deterministically (case-insensitive filename)."""
     return sorted(images, key=lambda p: p.name.lower())
 
 def build_gallery_list_from_disk(gallery_path: Path) -> List[str]:
     """Build gallery list from what's actually on disk (deterministic order)."""
-    images = [f for f in gallery_path.iterdir() if f.is_file() and is_image(f)]
-    ordered = normalize_gallery_order(images)
+    ordered = normalize_gallery_order(list_gallery_images(gallery_path))
     return [str(p.relative_to(SITE_ROOT)).replace("\\", "/") for p in ordered]
 
 
+def plan_renames(moves: List[Tuple[str, str]]) -> List[Tuple[str, str]]:
+    """
+    Order (src, dst) filename moves into executable steps.
+
+    Files already in place are skipped. Chains run in dependency order so each file moves
+    once; a cycle is broken by parking one file under a temp name.
+    """
+    pending: Dict[str, str] = {src: dst for src, dst in moves if src != dst}
+    steps: List[Tuple[str, str]] = []
+    while pending:
+        progressed = False
+        for src, dst in list(pending.items()):
+            # Case-insensitive: "01.JPG" -> "01.jpg" must not wait on itself.
+            busy = {other.lower() for other in pending if other != src}
+            if dst.lower() in busy:
+                continue
+            steps.append((src, dst))
+            del pending[src]
+            progressed = True
+        if not progressed:
+            src, dst = next(iter(pending.items()))
+            temp = TEMP_PREFIX + src
+            steps.append((src, temp))
+            del pending[src]
+            pending[temp] = dst
+    return steps
+
+
+def save_journal(journal_path: Path, journal: Dict[str, Any]) -> None:
+    """Durably write the rename journal (temp file + fsync + atomic replace)."""
+    tmp = journal_path.with_name(journal_path.name + ".tmp")
+    with tmp.open("w", encoding="utf-8") as f:
+        json.dump(journal, f, indent=2)
+        f.write("\n")
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, journal_path)
+
+
+def _rename_step(gallery_path: Path, src_name: str, dst_name: str) -> None:
+    """Execute one journal step; a step whose source is gone but target exists is already done."""
+    src = gallery_path / src_name
+    dst = gallery_path / dst_name
+    if not src.exists():
+        if dst.exists():
+            return
+        raise OSError(f"{src_name} is missing")
+    if dst.exists() and src_name.lower() != dst_name.lower():
+        raise OSError(f"{dst_name} already exists")
+    src.rename(dst)
+
+
+def run_journal(project_id: str, gallery_path: Path, journal: Dict[str, Any]) -> bool:
+    """
+    Drive a journal to completion (forward, or backward when journal["rollback"] is set).
+
+    Progress is saved after every move. If a forward step fails, the moves already made
+    are rolled back so the gallery is never left half-renamed. Returns True if the
+    forward plan completed.
+    """
+    journal_path = gallery_path / JOURNAL_FILENAME
+    steps = journal["steps"]
+
+    while not journal.get("rollback") and journal["done"] < len(steps):
+        src_name, dst_name = steps[journal["done"]]
+        try:
+            _rename_step(gallery_path, src_name, dst_name)
+        except OSError as e:
+            print(f"  [WARN] {project_id}: Cannot rename {src_name} -> {dst_name} ({e}). Rolling back.")
+            journal["rollback"] = True
+            save_journal(journal_path, journal)
+            break
+        journal["done"] += 1
+        save_journal(journal_path, journal)
+
+    while journal.get("rollback") and journal["done"] > 0:
+        src_name, dst_name = steps[journal["done"] - 1]
+        try:
+            _rename_step(gallery_path, dst_name, src_name)
+        except OSError as e:
+            print(f"  [ERROR] {project_id}: Rollback stuck at {dst_name} -> {src_name} ({e}). Journal kept.")
+            return False
+        journal["done"] -= 1
+        save_journal(journal_path, journal)
+
+    journal_path.unlink()
+    return not journal.get("rollback")
+
+
+def apply_renames(project_id: str, gallery_path: Path, moves: List[Tuple[str, str]]) -> int:
+    """Plan, journal and apply gallery renames. Returns the number of file moves made (0 on failure)."""
+    steps = plan_renames(moves)
+    if not steps:
+        return 0
+    journal = {"project": project_id, "steps": [list(s) for s in steps], "done": 0, "rollback": False}
+    save_journal(gallery_path / JOURNAL_FILENAME, journal)
+    return len(steps) if run_journal(project_id, gallery_path, journal) else 0
+
+
+def recover_gallery(project_id: str, gallery_path: Path, rollback: bool = False, dry_run: bool = False) -> None:
+    """Finish (or roll back) a sync that was interrupted, using only its journal."""
+    journal_path = gallery_path / JOURNAL_FILENAME
+    if journal_path.exists():
+        journal = json.loads(journal_path.read_text(encoding="utf-8"))
+        action = "rolling back" if rollback or journal.get("rollback") else "replaying"
+        print(f"  [INFO] {project_id}: interrupted gallery sync found ({journal['done']}/{len(journal['steps'])} moves); {action}.")
+        if dry_run:
+            return
+        if rollback:
+            journal["rollback"] = True
+        run_journal(project_id, gallery_path, journal)
+        return
+
+    # Leftovers from older, unjournaled runs: put them back under their original names.
+    for temp in gallery_path.glob(f"{TEMP_PREFIX}*"):
+        original = temp.with_name(temp.name[len(TEMP_PREFIX):])
+        if original.exists():
+            print(f"  [WARN] {project_id}: {temp.name} left over and {original.name} exists; leaving it.")
+            continue
+        print(f"  [INFO] {project_id}: restoring {temp.name} -> {original.name}")
+        if not dry_run:
+            temp.rename(original)
+
+
 def sync_gallery(
     project_id: str,
     gallery_path: Path,
@@ -56,7 +209,7 @@ def sync_gallery(
         print(f"  [WARN] {project_id}: Gallery/ not found at {gallery_path}")
         return []
 
-    images = [f for f in gallery_path.iterdir() if f.is_file() and is_image(f)]
+    images = list_gallery_images(gallery_path)
     if not images:
         print(f"  [WARN] {project_id}: Gallery/ is empty")
         return []
@@ -81,122 +234,183 @@ def sync_gallery(
     if dry_run:
         return planned_gallery_list
 
-    if renames and not dry_run:
-        # Rename in two passes to avoid collisions
-        temp_renames = []
-        failed = 0
-        staged = 0
-        finalized = 0
-        for old, new in renames:
-            temp = old.parent / f"_temp_{old.name}"
-            try:
-                old.rename(temp)
-                temp_renames.append((temp, new))
-                staged += 1
-            except PermissionError as e:
-                failed += 1
-                print(f"  [WARN] {project_id}: Cannot rename {old.name} (permission denied). Leaving as-is.")
-            except OSError as e:
-                failed += 1
-                print(f"  [WARN] {project_id}: Cannot rename {old.name} ({e}). Leaving as-is.")
-
-        for temp, new in temp_renames:
-            try:
-                temp.rename(new)
-                finalized += 1
-            except PermissionError:
-                failed += 1
-                # Best-effort revert so we don't leave temp files around.
-                try:
-                    original = temp.with_name(temp.name.replace("_temp_", "", 1))
-                    temp.rename(original)
-                except Exception:
-                    pass
-                print(f"  [WARN] {project_id}: Cannot finalize rename to {new.name} (permission denied).")
-            except OSError as e:
-                failed += 1
-                try:
-                    original = temp.with_name(temp.name.replace("_temp_", "", 1))
-                    temp.rename(original)
-                except Exception:
-                    pass
-                print(f"  [WARN] {project_id}: Cannot finalize rename to {new.name} ({e}).")
-
-        # Always return the *actual* state on disk (even if renames failed).
-    # Logging
     if renames:
-        # staged/finalized are only set in the rename branch above; fall back gracefully.
-        staged_n = locals().get("staged", 0)
-        finalized_n = locals().get("finalized", 0)
-        failed_n = locals().get("failed", 0)
-        if finalized_n > 0:
-            print(f"  Renamed {finalized_n}/{len(renames)} gallery images for {project_id}")
+        moves = [(old.name, new.name) for old, new in renames]
+        steps = apply_renames(project_id, gallery_path, moves)
+        if steps:
+            print(f"  Renamed {len(renames)} gallery images for {project_id} ({steps} file moves)")
         else:
-            print(f"  No gallery renames applied for {project_id} (permissions).")
-        if failed_n:
-            print(f"  [INFO] {project_id}: {failed_n} rename operations failed; gallery[] was updated from disk.")
+            print(f"  No gallery renames applied for {project_id}; gallery[] was updated from disk.")
 
     # In normal mode, always return what exists on disk (even when no renames were needed).
-    return build_gallery_list_from_disk(gallery_path)
+    gallery_list = build_gallery_list_from_disk(gallery_path)
+    if renames and (gallery_path / ORDER_FILENAME).exists():
+        # Keep a stable-mode order sidecar in step with the renumbered names.
+        write_gallery_order(gallery_path, [Path(g).name for g in gallery_list])
+    return gallery_list
 
 
-def check_diagrams(project_id: str, project_type: str, diagrams_path: Path) -> None:
-    """Warn if multi-unit project missing diagrams."""
-    if project_type not in {"multi-unit"}:
+def read_gallery_order(gallery_path: Path) -> List[str]:
+    """Read the explicit gallery order sidecar (filenames, one per line)."""
+    order_path = gallery_path / ORDER_FILENAME
+    if not order_path.exists():
+        return []
+    lines = order_path.read_text(encoding="utf-8").splitlines()
+    return [ln.strip() for ln in lines if ln.strip() and not ln.strip().startswith("#")]
+
+
+def write_gallery_order(gallery_path: Path, names: List[str]) -> None:
+    """Write the gallery order sidecar (only when it changed)."""
+    order_path = gallery_path / ORDER_FILENAME
+    body = "\n".join(names) + "\n"
+    if order_path.exists() and order_path.read_text(encoding="utf-8") == body:
         return
-    if not diagrams_path.exists() or not any(f.is_file() and is_image(f) for f in diagrams_path.iterdir()):
-        print(f"  [WARN] {project_id}: No diagrams found in Diagrams/ (recommended for multi-unit)")
+    order_path.write_text(body, encoding="utf-8")
 
 
-def main() -> None:
-    dry_run = "--dry-run" in sys.argv
+def next_gallery_number(names: List[str]) -> int:
+    """Next free NN after the highest numeric stem in use."""
+    numbers = [int(Path(n).stem) for n in names if Path(n).stem.isdigit()]
+    return max(numbers, default=0) + 1
 
-    if not PROJECTS_JSON.exists():
-        print(f"Error: {PROJECTS_JSON} not found")
-        sys.exit(1)
 
-    listing = json.loads(PROJECTS_JSON.read_text(encoding="utf-8"))
+def sync_gallery_stable(
+    project_id: str,
+    gallery_path: Path,
+    previous_gallery: List[str],
+    dry_run: bool = False,
+) -> List[str]:
+    """
+    Append-stable gallery sync: keep existing names, append new images, return relative paths.
 
-    for item in listing:
-        pid = item.get("id")
-        if not pid:
-            continue
+    Order comes from Gallery/_order.txt, else from the previous gallery[] in the detail JSON.
+    Only newly added images are renamed (to the next free NN), so adding one photo touches one file.
+    """
+    if not gallery_path.exists():
+        print(f"  [WARN] {project_id}: Gallery/ not found at {gallery_path}")
+        return []
 
-        detail_path = PROJECTS_DIR / f"{pid}.json"
-        if not detail_path.exists():
-            print(f"[WARN] {pid}: detail JSON not found, skipping")
-            continue
+    on_disk = {f.name: f for f in list_gallery_images(gallery_path)}
+    if not on_disk:
+        print(f"  [WARN] {project_id}: Gallery/ is empty")
+        return []
 
-        detail = json.loads(detail_path.read_text(encoding="utf-8"))
-        featured = detail.get("featuredImage", "")
-        if not featured:
-            print(f"[WARN] {pid}: no featuredImage")
+    known = read_gallery_order(gallery_path) or [Path(g).name for g in previous_gallery]
+    ordered: List[str] = []
+    for name in known:
+        if name in on_disk and name not in ordered:
+            ordered.append(name)
+
+    added = [p for p in normalize_gallery_order(list(on_disk.values())) if p.name not in ordered]
+    next_no = next_gallery_number(ordered)
+    taken = {n.lower() for n in on_disk}
+    moves: List[Tuple[str, str]] = []
+    for img in added:
+        if img.stem.isdigit() and int(img.stem) >= next_no:
+            # Already follows the NN convention past the kept images; leave it alone.
+            ordered.append(img.name)
+            next_no = int(img.stem) + 1
             continue
+        new_name = f"{next_no:02d}{img.suffix.lower()}"
+        while new_name.lower() in taken:
+            next_no += 1
+            new_name = f"{next_no:02d}{img.suffix.lower()}"
+        next_no += 1
+        taken.add(new_name.lower())
+        moves.append((img.name, new_name))
+        ordered.append(new_name)
 
-        # Infer image_dir from featuredImage
-        image_dir = SITE_ROOT / Path(featured).parent
+    if moves and not dry_run and not apply_renames(project_id, gallery_path, moves):
+        # Renames were rolled back; keep the uploaded names.
+        back = {new: old for old, new in moves}
+        ordered = [back.get(n, n) for n in ordered]
+        moves = []
 
-        # Check featured exists
-        featured_path = SITE_ROOT / featured
-        if not featured_path.exists():
-            print(f"[ERROR] {pid}: Featured image not found: {featured}")
+    if added:
+        print(f"  Appended {len(added)} gallery images for {project_id} ({len(moves)} renamed)")
+    if not dry_run:
+        write_gallery_order(gallery_path, ordered)
 
-        # Sync gallery
-        gallery_path = image_dir / "Gallery"
-        gallery_list = sync_gallery(pid, gallery_path, dry_run)
+    return [str((gallery_path / n).relative_to(SITE_ROOT)).replace("\\", "/") for n in ordered]
 
-        # Update detail JSON gallery[]
-        if not dry_run and gallery_list != detail.get("gallery", []):
-            detail["gallery"] = gallery_list
-            detail_path.write_text(json.dumps(detail, indent=2) + "\n", encoding="utf-8")
-            print(f"  Updated gallery[] for {pid}")
 
-        # Check diagrams (multi-unit only, warn)
-        project_type = detail.get("type") or (detail.get("tags", [""])[0])
-        diagrams_path = image_dir / "Diagrams"
-        check_diagrams(pid, project_type, diagrams_path)
+def check_diagrams(project_id: str, project_type: str, diagrams_path: Path) -> None:
+    """Warn if multi-unit project missing diagrams."""
+    if project_type not in {"multi-unit"}:
+        return
+    if not diagrams_path.exists() or not any(f.is_file() and is_image(f) for f in diagrams_path.iterdir()):
+        print(f"  [WARN] {project_id}: No diagrams found in Diagrams/ (recommended for multi-unit)")
+
+
+def main() -> None:
+    dry_run = "--dry-run" in sys.argv
+    stable = "--stable" in sys.argv
+    rollback = "--rollback" in sys.argv
+    trace.start("sync_project_assets")
+
+    if not PROJECTS_JSON.exists():
+        print(f"Error: {PROJECTS_JSON} not found")
+        sys.exit(1)
 
+    with trace.span("load listing"):
+        listing = json.loads(PROJECTS_JSON.read_text(encoding="utf-8"))
+    store = None if dry_run else open_store(stage="sync_project_assets")
+
+    with trace.span("sync galleries"):
+        for item in listing:
+            pid = item.get("id")
+            if not pid:
+                continue
+
+            with trace.span(pid, cat="project"):
+                detail_path = PROJECTS_DIR / f"{pid}.json"
+                if not detail_path.exists():
+                    print(f"[WARN] {pid}: detail JSON not found, skipping")
+                    continue
+
+                detail = json.loads(detail_path.read_text(encoding="utf-8"))
+                featured = detail.get("featuredImage", "")
+                if not featured:
+                    print(f"[WARN] {pid}: no featuredImage")
+                    continue
+
+                # Infer image_dir from featuredImage
+                image_dir = SITE_ROOT / Path(featured).parent
+
+                # Check featured exists
+                featured_path = SITE_ROOT / featured
+                if not featured_path.exists():
+                    print(f"[ERROR] {pid}: Featured image not found: {featured}")
+
+                # Sync gallery
+                gallery_path = image_dir / "Gallery"
+                if gallery_path.exists():
+                    recover_gallery(pid, gallery_path, rollback=rollback, dry_run=dry_run)
+                if stable:
+                    gallery_list = sync_gallery_stable(pid, gallery_path, detail.get("gallery", []), dry_run)
+                else:
+                    gallery_list = sync_gallery(pid, gallery_path, dry_run)
+
+                # Update detail JSON gallery[]
+                if not dry_run and gallery_list != detail.get("gallery", []):
+                    detail["gallery"] = gallery_list
+                    detail_path.write_text(json.dumps(detail, indent=2) + "\n", encoding="utf-8")
+                    print(f"  Updated gallery[] for {pid}")
+
+                if store:
+                    images = [("featured", featured_path)] + [("gallery", SITE_ROOT / g) for g in gallery_list]
+                    store.set_project_images(pid, images)
+
+                # Check diagrams (multi-unit only, warn)
+                project_type = detail.get("type") or (detail.get("tags", [""])[0])
+                diagrams_path = image_dir / "Diagrams"
+                check_diagrams(pid, project_type, diagrams_path)
+
+    if store:
+        print(f"\nProject store: {store.changed} image rows changed")
+        store.close()
     print("\nAssets sync complete." + (" (dry-run)" if dry_run else ""))
+    trace.finish()
 
 
 if __name__ == "__main__":
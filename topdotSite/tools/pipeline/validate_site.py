@@ -1,16 +1,30 @@
 """
-Site validator: read-only pre-deploy checks.
+Site validator: pre-deploy checks.
 
 Checks:
 - Every listing item has a detail JSON
 - Every detail JSON references existing images (featured + gallery)
 - Specs conform to schema
 - Orphan JSONs/folders (optional warnings)
+- sw.js matches what build_service_worker.py would generate (a stale precache manifest is an error)
+- Page weight budgets (see PAGE_BUDGETS): listing JSON, detail JSON, the initial load of a
+  project page (detail JSON + hero + first-viewport gallery images), total gallery bytes and
+  image count, and single-image size are errors when over budget. Images with too many bytes
+  per megapixel, or pixels beyond the largest display size, are warnings. Dimensions are read
+  from the image headers (JPEG/PNG/GIF/WebP), so no image library is needed, and kept in the
+  project store (data/_project-store.sqlite) so unchanged images are not re-read.
+
+The only files written are data/_page-weights.json (weights at the last validation), a
+"Page Weights" section of data/_change-report.txt with the deltas against it, and the image
+rows of the project store.
+
+Budgets can be overridden per key in data/_page-budgets.json, e.g. {"gallery_mb": 120}.
 
 Exit code: 0 if all OK, 1 if errors found.
 
 Run:
-  python topdotSite/tools/pipeline/validate_site.py
+  python topdotSite/tools/pipeline/validate_site.py [--timings] [--trace PATH] [--profile]
+  (see pipeline_trace.py)
 """
 
 from __future__ import annotations
@@ -18,16 +32,40 @@ from __future__ import annotations
 import json
 import sys
 from pathlib import Path
-from typing import List, Tuple
+from typing import Any, Dict, List, Optional, Tuple
+
+import pipeline_trace as trace
+from build_service_worker import drift as sw_drift
+from change_report import has_section, write_section
+from project_store import ProjectStore, image_dimensions, open_store
 
 
 SITE_ROOT = Path(__file__).resolve().parents[2]
 DATA_DIR = SITE_ROOT / "data"
 PROJECTS_JSON = DATA_DIR / "projects.json"
 PROJECTS_DIR = DATA_DIR / "projects"
+WEIGHTS_PATH = DATA_DIR / "_page-weights.json"
+BUDGETS_PATH = DATA_DIR / "_page-budgets.json"
 
 ALLOWED_EXTENSIONS = {".jpg", ".jpeg", ".png", ".gif", ".webp"}
 
+PAGE_BUDGETS: Dict[str, float] = {
+    "listing_json_kb": 150,
+    "detail_json_kb": 40,
+    # Detail JSON + hero + first-viewport gallery images.
+    "initial_kb": 6000,
+    "gallery_mb": 80,
+    "gallery_images": 150,
+    "image_kb": 4000,
+    # Warnings only.
+    "image_kb_per_mp": 600,
+    # Lightbox at full screen on a 4K / 2x display.
+    "image_max_edge_px": 3840,
+}
+# Gallery images visible without scrolling: two rows of the three-column desktop grid.
+FIRST_VIEWPORT_GALLERY = 6
+REPORT_TITLE = "Page Weights"
+
 
 def is_image(p: Path) -> bool:
     return p.suffix.lower() in ALLOWED_EXTENSIONS
@@ -96,61 +134,254 @@ def validate_details() -> Tuple[int, int]:
     for detail_path in detail_files:
         pid = detail_path.stem
 
-        try:
-            detail = json.loads(detail_path.read_text(encoding="utf-8"))
-        except Exception as e:
-            print(f"[ERROR] {pid}: parse error: {e}")
-            errors += 1
-            continue
-
-        # Check featuredImage exists
-        featured = detail.get("featuredImage", "")
-        if featured:
-            featured_path = SITE_ROOT / featured
-            if not featured_path.exists():
-                print(f"[ERROR] {pid}: featuredImage not found: {featured}")
+        with trace.span(pid, cat="project"):
+            try:
+                detail = json.loads(detail_path.read_text(encoding="utf-8"))
+            except Exception as e:
+                print(f"[ERROR] {pid}: parse error: {e}")
                 errors += 1
-        else:
-            print(f"[WARN] {pid}: no featuredImage")
-            warnings += 1
+                continue
 
-        # Check gallery images exist
-        gallery = detail.get("gallery", [])
-        for g in gallery:
-            g_path = SITE_ROOT / g
-            if not g_path.exists():
-                print(f"[ERROR] {pid}: gallery image not found: {g}")
-                errors += 1
+            # Check featuredImage exists
+            featured = detail.get("featuredImage", "")
+            if featured:
+                featured_path = SITE_ROOT / featured
+                if not featured_path.exists():
+                    print(f"[ERROR] {pid}: featuredImage not found: {featured}")
+                    errors += 1
+            else:
+                print(f"[WARN] {pid}: no featuredImage")
+                warnings += 1
+
+            # Check gallery images exist
+            gallery = detail.get("gallery", [])
+            for g in gallery:
+                g_path = SITE_ROOT / g
+                if not g_path.exists():
+                    print(f"[ERROR] {pid}: gallery image not found: {g}")
+                    errors += 1
+
+            # Validate specs schema
+            specs = detail.get("specs", [])
+            for spec in specs:
+                if not isinstance(spec, dict):
+                    print(f"[ERROR] {pid}: spec is not a dict")
+                    errors += 1
+                    continue
+                if not spec.get("key"):
+                    print(f"[ERROR] {pid}: spec missing key")
+                    errors += 1
+                if "showOn" in spec and not isinstance(spec["showOn"], list):
+                    print(f"[ERROR] {pid}: spec showOn must be array")
+                    errors += 1
 
-        # Validate specs schema
-        specs = detail.get("specs", [])
-        for spec in specs:
-            if not isinstance(spec, dict):
-                print(f"[ERROR] {pid}: spec is not a dict")
-                errors += 1
-                continue
-            if not spec.get("key"):
-                print(f"[ERROR] {pid}: spec missing key")
-                errors += 1
-            if "showOn" in spec and not isinstance(spec["showOn"], list):
-                print(f"[ERROR] {pid}: spec showOn must be array")
-                errors += 1
+    return errors, warnings
 
+
+def load_budgets() -> Dict[str, float]:
+    budgets = dict(PAGE_BUDGETS)
+    if BUDGETS_PATH.exists():
+        overrides = json.loads(BUDGETS_PATH.read_text(encoding="utf-8"))
+        unknown = set(overrides) - set(PAGE_BUDGETS)
+        if unknown:
+            print(f"[WARN] {BUDGETS_PATH.name}: unknown budgets ignored: {', '.join(sorted(unknown))}")
+        budgets.update({k: v for k, v in overrides.items() if k in PAGE_BUDGETS})
+    return budgets
+
+
+def check_image(pid: str, rel: str, budgets: Dict[str, float], store: Optional[ProjectStore] = None) -> Tuple[int, int, int]:
+    """(bytes, errors, warnings) for one existing image."""
+    path = SITE_ROOT / rel
+    size = path.stat().st_size
+    errors = warnings = 0
+    if size > budgets["image_kb"] * 1024:
+        print(f"[ERROR] {pid}: {rel} is {size / 1024:,.0f} KB (budget {budgets['image_kb']:,.0f} KB)")
+        errors += 1
+
+    dims = store.dimensions(path) if store else image_dimensions(path)
+    if not dims or not dims[0] or not dims[1]:
+        return size, errors, warnings
+    w, h = dims
+    kb_per_mp = size / 1024 / (w * h / 1_000_000)
+    if kb_per_mp > budgets["image_kb_per_mp"]:
+        print(f"[WARN] {pid}: {rel} is {kb_per_mp:,.0f} KB per megapixel (budget {budgets['image_kb_per_mp']:,.0f})")
+        warnings += 1
+    if max(w, h) > budgets["image_max_edge_px"]:
+        print(f"[WARN] {pid}: {rel} is {w}x{h}, larger than displayed ({budgets['image_max_edge_px']:,.0f}px)")
+        warnings += 1
+    return size, errors, warnings
+
+
+def over_budget(pid: str, label: str, value: float, budget: float, unit: str) -> int:
+    if value <= budget:
+        return 0
+    print(f"[ERROR] {pid}: {label} {value:,.1f} {unit} (budget {budget:,.0f} {unit})")
+    return 1
+
+
+def project_weight(
+    pid: str, detail: Dict[str, Any], detail_bytes: int, budgets: Dict[str, float], store: Optional[ProjectStore] = None
+) -> Tuple[Dict[str, int], int, int]:
+    """Weights for one project page, plus (errors, warnings) against the budgets."""
+    errors = warnings = 0
+    hero = 0
+    featured = detail.get("featuredImage", "")
+    if featured and (SITE_ROOT / featured).is_file() and is_image(SITE_ROOT / featured):
+        hero, e, w = check_image(pid, featured, budgets, store)
+        errors += e
+        warnings += w
+
+    gallery_sizes = []
+    gallery_meta = detail.get("galleryMeta", {})
+    for g in detail.get("gallery", []):
+        if (SITE_ROOT / g).is_file() and is_image(SITE_ROOT / g):
+            size, e, w = check_image(pid, g, budgets, store)
+            # Animated images are shown as their poster in the grid (the animation loads in the lightbox).
+            poster = (gallery_meta.get(g, {}).get("animation") or {}).get("poster", "")
+            if poster and (SITE_ROOT / poster).is_file():
+                size = (SITE_ROOT / poster).stat().st_size
+            gallery_sizes.append(size)
+            errors += e
+            warnings += w
+
+    weight = {
+        "detailJson": detail_bytes,
+        "hero": hero,
+        "firstViewport": sum(gallery_sizes[:FIRST_VIEWPORT_GALLERY]),
+        "gallery": sum(gallery_sizes),
+        "galleryImages": len(gallery_sizes),
+    }
+    weight["initial"] = weight["detailJson"] + weight["hero"] + weight["firstViewport"]
+
+    errors += over_budget(pid, "detail JSON", detail_bytes / 1024, budgets["detail_json_kb"], "KB")
+    errors += over_budget(pid, "initial page weight", weight["initial"] / 1024, budgets["initial_kb"], "KB")
+    errors += over_budget(pid, "gallery", weight["gallery"] / 1024 / 1024, budgets["gallery_mb"], "MB")
+    errors += over_budget(pid, "gallery images", len(gallery_sizes), budgets["gallery_images"], "images")
+    return weight, errors, warnings
+
+
+def fmt_bytes(n: float) -> str:
+    sign = "-" if n < 0 else ""
+    n = abs(n)
+    if n >= 1024 * 1024:
+        return f"{sign}{n / 1024 / 1024:.1f} MB"
+    return f"{sign}{n / 1024:.1f} KB"
+
+
+def fmt_delta(n: float) -> str:
+    return ("+" if n >= 0 else "") + fmt_bytes(n)
+
+
+def weight_report_lines(old: Dict[str, Any], new: Dict[str, Any]) -> List[str]:
+    """Change-report lines: page weights that changed since the previous validation."""
+    if not old:
+        return [f"Recorded page weights for {len(new['projects'])} projects (no previous build to compare)."]
+
+    lines = []
+    old_listing, new_listing = old.get("listingJson", 0), new["listingJson"]
+    if old_listing != new_listing:
+        lines.append(f"Listing JSON: {fmt_bytes(new_listing)} ({fmt_delta(new_listing - old_listing)})")
+
+    old_projects, new_projects = old.get("projects", {}), new["projects"]
+    for pid in sorted(set(old_projects) | set(new_projects)):
+        if pid not in old_projects:
+            w = new_projects[pid]
+            lines.append(f"  + {pid}: initial {fmt_bytes(w['initial'])}, gallery {fmt_bytes(w['gallery'])} ({w['galleryImages']} images)")
+            continue
+        if pid not in new_projects:
+            lines.append(f"  - {pid}")
+            continue
+        a, b = old_projects[pid], new_projects[pid]
+        if a == b:
+            continue
+        parts = []
+        for key, label in (("initial", "initial"), ("detailJson", "detail JSON"), ("gallery", "gallery")):
+            if a.get(key, 0) != b[key]:
+                parts.append(f"{label} {fmt_bytes(b[key])} ({fmt_delta(b[key] - a.get(key, 0))})")
+        if a.get("galleryImages", 0) != b["galleryImages"]:
+            parts.append(f"{b['galleryImages'] - a.get('galleryImages', 0):+d} images")
+        lines.append(f"  ~ {pid}: " + ", ".join(parts))
+
+    if not lines:
+        return ["No page weight changes."]
+    total_old = sum(w["initial"] for w in old_projects.values())
+    total_new = sum(w["initial"] for w in new_projects.values())
+    lines.append(f"Initial weight, all project pages: {fmt_bytes(total_new)} ({fmt_delta(total_new - total_old)})")
+    return lines
+
+
+def validate_page_weights() -> Tuple[int, int]:
+    """Check page weights against the budgets and report deltas against the previous build."""
+    errors = 0
+    warnings = 0
+    budgets = load_budgets()
+
+    if not PROJECTS_JSON.exists():
+        return 0, 0
+    listing_bytes = PROJECTS_JSON.stat().st_size
+    errors += over_budget("projects.json", "listing JSON", listing_bytes / 1024, budgets["listing_json_kb"], "KB")
+
+    weights: Dict[str, Any] = {"listingJson": listing_bytes, "projects": {}}
+    with open_store(stage="validate_site") as store:
+        for detail_path in sorted(PROJECTS_DIR.glob("*.json")):
+            pid = detail_path.stem
+            with trace.span(pid, cat="project"):
+                raw = detail_path.read_bytes()
+                try:
+                    detail = json.loads(raw)
+                except ValueError:
+                    continue  # Reported by validate_details().
+                weight, e, w = project_weight(pid, detail, len(raw), budgets, store)
+            weights["projects"][pid] = weight
+            errors += e
+            warnings += w
+
+    total = sum(w["initial"] for w in weights["projects"].values())
+    print(f"Page weights: {len(weights['projects'])} project pages, {fmt_bytes(total)} initial in total")
+
+    old: Dict[str, Any] = {}
+    if WEIGHTS_PATH.exists():
+        try:
+            old = json.loads(WEIGHTS_PATH.read_text(encoding="utf-8"))
+        except ValueError:
+            old = {}
+    # A rerun without changes keeps the deltas already reported for this build.
+    if old != weights or not has_section(REPORT_TITLE):
+        write_section(REPORT_TITLE, weight_report_lines(old, weights))
+    WEIGHTS_PATH.write_text(json.dumps(weights, indent=2, sort_keys=True) + "\n", encoding="utf-8")
     return errors, warnings
 
 
+def validate_service_worker() -> Tuple[int, int]:
+    """sw.js must be regenerated after anything it precaches changes."""
+    reasons = sw_drift()
+    for reason in reasons:
+        print(f"[ERROR] sw.js is out of date: {reason}")
+    if reasons:
+        print("  Run tools/pipeline/build_service_worker.py to regenerate it.")
+    return len(reasons), 0
+
+
 def main() -> None:
     print("=== Site Validation ===\n")
+    trace.start("validate_site")
 
-    list_errors, list_warnings = validate_listing()
-    detail_errors, detail_warnings = validate_details()
+    with trace.span("validate listing"):
+        list_errors, list_warnings = validate_listing()
+    with trace.span("validate details"):
+        detail_errors, detail_warnings = validate_details()
+    with trace.span("page weights"):
+        weight_errors, weight_warnings = validate_page_weights()
+    with trace.span("service worker"):
+        sw_errors, sw_warnings = validate_service_worker()
 
-    total_errors = list_errors + detail_errors
-    total_warnings = list_warnings + detail_warnings
+    total_errors = list_errors + detail_errors + weight_errors + sw_errors
+    total_warnings = list_warnings + detail_warnings + weight_warnings + sw_warnings
 
     print(f"\n=== Summary ===")
     print(f"Errors: {total_errors}")
     print(f"Warnings: {total_warnings}")
+    trace.finish()
 
     if total_errors > 0:
         print("\nValidation FAILED. Fix errors before deploying.")